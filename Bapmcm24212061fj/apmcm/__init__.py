@@ -0,0 +1,4 @@
+"""
+2024 APMCM B题 公共计算模块
+各问题脚本(question1 ~ question4)共用的影响场、扩散求解等代码放在这里
+"""
@@ -0,0 +1,5 @@
+import sys
+
+from apmcm.cli import main
+
+sys.exit(main())
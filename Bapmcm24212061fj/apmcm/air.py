@@ -0,0 +1,12 @@
+"""
+空气物性参数
+"""
+
+
+# 湿度扩散系数计算 (T 为摄氏温度, 可以是标量或整个温度场数组)
+def humidity_diffusion_coefficient(T):
+    # 基于温度计算扩散系数
+    D0 = 2.4e-5  # 参考扩散系数 (m²/s) at 25°C
+    T0 = 298.15  # 参考温度 (K) (25°C)
+    T_kelvin = T + 273.15  # 转换为开尔文
+    return D0 * (T_kelvin / T0) ** 1.75
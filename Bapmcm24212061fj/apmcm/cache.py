@@ -0,0 +1,136 @@
+"""
+计算结果的内容寻址缓存
+各问脚本每次运行都从头模拟或优化, 即使参数没有任何变化 (例如只是调整图的样式、重新生成论文插图);
+ResultCache 以全部参数 (房间尺寸、网格、dt、步数、设备设计、随机数种子等) 和代码版本的哈希为键,
+把结果 (场、logbook、最优个体等任意可 pickle 的对象) 保存在磁盘上, 参数和代码都没变时直接读取;
+缓存总大小超过上限时按最近最少使用 (LRU) 的顺序删除旧条目
+"""
+import glob
+import hashlib
+import inspect
+import json
+import os
+import pickle
+
+from apmcm.checkpoint import describe
+from apmcm.fileio import atomic_write
+
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def code_version(*functions):
+    """
+    代码版本: apmcm 包全部源码与 functions (脚本中定义的模型函数, 如适应度函数) 源码的哈希
+    只改动脚本中的绘图代码不会使缓存失效, 改动计算代码会
+    """
+    digest = hashlib.sha1()
+    for path in sorted(glob.glob(os.path.join(PACKAGE_DIR, "*.py"))):
+        with open(path, "rb") as f:
+            digest.update(f.read())
+    for function in functions:
+        digest.update(inspect.getsource(function).encode("utf-8"))
+    return digest.hexdigest()[:16]
+
+
+class ResultCache:
+    """
+    directory: 缓存目录; max_bytes: 缓存总大小上限 (字节); version: 代码版本, 默认为 code_version()
+    每个条目为 <键>.pkl (结果) 和 <键>.json (参数说明, 便于查看); 命中时更新文件修改时间, 淘汰时先删最久未使用的
+    """
+
+    def __init__(self, directory, max_bytes=2 ** 30, version=None):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.version = version or code_version()
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, params):
+        text = json.dumps({"params": describe(params), "version": self.version}, sort_keys=True, default=str)
+        return hashlib.sha1(text.encode("utf-8")).hexdigest()[:20]
+
+    def _path(self, key, suffix=".pkl"):
+        return os.path.join(self.directory, key + suffix)
+
+    def __contains__(self, params):
+        return os.path.exists(self._path(self.key(params)))
+
+    # 读取结果, 返回 (是否命中, 结果); 文件损坏或无法反序列化 (如类定义已改变) 时删除该条目, 按未命中处理
+    def _load(self, key):
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                result = pickle.load(f)
+        except FileNotFoundError:
+            return False, None
+        except Exception:
+            self._remove(key)
+            return False, None
+        os.utime(path)  # 记录最近一次使用
+        return True, result
+
+    def get(self, params, default=None):
+        found, result = self._load(self.key(params))
+        if found:
+            self.hits += 1
+            return result
+        self.misses += 1
+        return default
+
+    def put(self, params, result):
+        key = self.key(params)
+        path = self._path(key)
+        atomic_write(path, lambda f: pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL))
+        meta = {"params": describe(params), "version": self.version}
+        atomic_write(self._path(key, ".json"), lambda f: json.dump(meta, f, ensure_ascii=False, default=str), mode="w")
+        self._evict(key)
+
+    # 命中时直接返回缓存的结果, 否则调用 compute() 计算并存入缓存
+    def cached(self, params, compute):
+        key = self.key(params)
+        found, result = self._load(key)
+        if found:
+            self.hits += 1
+            return result
+        self.misses += 1
+        result = compute()
+        self.put(params, result)
+        return result
+
+    def _remove(self, key):
+        for suffix in (".pkl", ".json"):
+            if os.path.exists(self._path(key, suffix)):
+                os.remove(self._path(key, suffix))
+
+    # (最近使用时间, 大小, 键), 按最近使用时间升序
+    def entries(self):
+        found = []
+        for path in glob.glob(os.path.join(self.directory, "*.pkl")):
+            stat = os.stat(path)
+            found.append((stat.st_mtime, stat.st_size, os.path.basename(path)[:-4]))
+        return sorted(found)
+
+    # 总大小超过上限时从最久未使用的条目开始删除, 刚写入的 keep 保留
+    def _evict(self, keep):
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        for _, size, key in entries:
+            if total <= self.max_bytes:
+                break
+            if key != keep:
+                self._remove(key)
+                total -= size
+
+    def report(self):
+        entries = self.entries()
+        size = sum(size for _, size, _ in entries)
+        return (f"结果缓存: 命中 {self.hits} 次, 未命中 {self.misses} 次, "
+                f"共 {len(entries)} 个条目 {size / 2 ** 20:.1f} MB (上限 {self.max_bytes / 2 ** 20:.0f} MB)")
+
+
+# cache 为 None 时直接计算, 便于脚本用开关启用缓存
+def cached(cache, params, compute):
+    if cache is None:
+        return compute()
+    return cache.cached(params, compute)
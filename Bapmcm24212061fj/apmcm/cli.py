@@ -0,0 +1,377 @@
+"""
+命令行入口 (python -m apmcm, 在 Bapmcm24212061fj 目录下运行)
+- list: 列出各问脚本对应的子命令及其选项
+- run <子命令> [选项]: 运行一个脚本, 选项覆盖脚本开头的参数, 例如
+  python -m apmcm run q1-diffusion --season winter --steps 3000 --no-show
+  其余任意顶层变量用 --set 名称=值 覆盖 (值按 Python 字面量解析, 解析失败时作为字符串), 例如 --set nx=60
+- run ... --profile [前缀]: 同时用 cProfile 和 apmcm.profiling 的分阶段计时运行, 写出 <前缀>.prof (pstats,
+  可用 snakeviz 查看) 和 <前缀>.folded (折叠栈, 可用 flamegraph.pl / speedscope 查看), 并打印扁平汇总表;
+  前缀默认为 profiles/<子命令>; 加 --profile-memory 时还记录各阶段内临时分配的内存 (tracemalloc, 运行更慢)
+- batch <文件>: 在同一个解释器中依次运行文件中的多条 run 命令 (每行一条, # 开头为注释),
+  numpy / deap / matplotlib 只导入一次, 省去每次启动解释器和导入的时间
+脚本本身不需要改动: 运行前用 ast 把对应的顶层赋值替换为给定的值, 再在脚本所在目录下执行 (相对路径与直接运行时一致)
+本模块只使用标准库, numpy、matplotlib、deap、pyswarm 都由被运行的脚本按需导入,
+只算雷诺数、扩散系数等小计算时几十毫秒即可完成
+"""
+import argparse
+import ast
+import contextlib
+import os
+import shlex
+import sys
+import time
+import types
+import warnings
+
+from apmcm import profiling
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))  # Bapmcm24212061fj 目录
+
+SEASONS = ("summer", "winter")
+SCHEMES = ("explicit", "cn", "adi")
+BACKENDS = ("serial", "thread", "process")
+
+
+# 命令行选项: 覆盖的脚本变量名和 argparse 参数
+def option(variable, help, **kwargs):
+    return variable, dict(help=help, **kwargs)
+
+
+def _season(variable="season"):
+    return option(variable, "季节", choices=SEASONS)
+
+
+def _steps(variable):
+    return option(variable, "时间步数", type=int)
+
+
+def _dt(variable):
+    return option(variable, "时间步长 (秒)", type=float)
+
+
+def _scheme(variable):
+    return option(variable, "扩散项时间积分格式", choices=SCHEMES)
+
+
+def _times(variable):
+    return option(variable, "输出时刻 (秒), 可给多个", type=float, nargs="+", metavar="T")
+
+
+def _path(variable, help):
+    return option(variable, help, metavar="PATH")
+
+
+# 遗传算法 / 粒子群脚本共用的选项
+def _optimizer():
+    return {
+        "--seed": option("seed", "随机数种子", type=int),
+        "--backend": option("backend", "适应度评估的执行后端", choices=BACKENDS),
+        "--workers": option("workers", "线程或进程数", type=int),
+        "--cache-dir": _path("cache_dir", "结果缓存目录 (需同时给出 --seed)"),
+    }
+
+
+# 子命令: (脚本路径 (相对 Bapmcm24212061fj), 说明, {选项: (变量名, argparse 参数)})
+SCRIPTS = {
+    "q1-initial": ("question1/q1_Initial_state_code.py", "第一问初始温度场与空调影响场", {}),
+    "q1-reynolds": ("question1/q1_Re_num.py", "第一问出口风的雷诺数", {}),
+    "q1-diffusivity": ("question1/q1_air_diffusivity.py", "第一问空气热扩散率", {}),
+    "q1-diffusion": ("question1/q1_diffusion_times.py", "第一问温度场扩散模拟", {
+        "--season": _season(),
+        "--steps": _steps("timesteps"),
+        "--dt": _dt("dt"),
+        "--scheme": _scheme("scheme"),
+        "--times": _times("snapshot_times"),
+        "--cache-dir": _path("cache_dir", "结果缓存目录"),
+        "--fields": _path("fields_path", "保存各输出时刻的场 (NPZ), 供 render 出图"),
+    }),
+    "q1-lines": ("question1/q1_lines.py", "第一问集总模型的平均温度曲线", {
+        "--season": _season(),
+    }),
+    "q1-ga": ("question1/q1_position_ga.py", "第一问空调设计的遗传算法", _optimizer()),
+    "q1-nsga2": ("question1/q1_position_nsga2.py", "第一问空调设计的 NSGA-II 多目标优化", {
+        "--seed": option("seed", "随机数种子", type=int),
+        "--archive": _path("archive_path", "Pareto 存档文件, 存在时热启动"),
+    }),
+    "q2-cadr": ("question2/q2_cadr_design.py", "第二问净化器设计的遗传算法", _optimizer()),
+    "q2-nsga2": ("question2/q2_cadr_nsga2.py", "第二问净化器设计的 NSGA-II 多目标优化", {
+        "--seed": option("seed", "随机数种子", type=int),
+        "--archive": _path("archive_path", "Pareto 存档文件, 存在时热启动"),
+    }),
+    "q2-design-space": ("question2/q2_design_space.py", "第二问净化器设计空间的穷举", {}),
+    "q2-picture": ("question2/q2_picture_design.py", "第二问净化器外形示意图", {}),
+    "q2-situation": ("question2/q2_situation.py", "第二问 PM2.5 浓度场模拟", {
+        "--steps": _steps("T_SIM"),
+        "--dt": _dt("DT"),
+        "--scheme": _scheme("SCHEME"),
+        "--times": _times("SNAPSHOT_TIMES"),
+        "--cache-dir": _path("CACHE_DIR", "结果缓存目录"),
+        "--fields": _path("FIELDS_PATH", "保存各输出时刻的场 (NPZ), 供 render 出图"),
+    }),
+    "q3-alpha": ("question3/q3_airhum_alpha.py", "第三问湿度扩散系数", {}),
+    "q3-humidity": ("question3/q3_hum_situation.py", "第三问湿度场模拟", {
+        "--steps": _steps("time_steps"),
+        "--dt": _dt("dt"),
+        "--scheme": _scheme("scheme"),
+        "--times": _times("snapshot_times"),
+        "--cache-dir": _path("cache_dir", "结果缓存目录"),
+        "--fields": _path("fields_path", "保存各输出时刻的场 (NPZ), 供 render 出图"),
+    }),
+    "q3-pso": ("question3/q3_weet_pso.py", "第三问加湿器参数的粒子群优化", {
+        **_optimizer(),
+        "--swarmsize": option("swarmsize", "粒子数", type=int),
+        "--maxiter": option("maxiter", "最大迭代次数", type=int),
+    }),
+    "q4-design": ("question4/q4_design.py", "第四问设备高度的遗传算法", _optimizer()),
+    "q4-situation": ("question4/q4_situation.py", "第四问温度、湿度、PM2.5 耦合模拟", {
+        "--season": _season(),
+        "--steps": _steps("timesteps"),
+        "--dt": _dt("dt"),
+        "--cache-dir": _path("cache_dir", "结果缓存目录"),
+    }),
+    "q4-sweep": ("question4/q4_sweep.py", "第四问设备布置的场景扫描", {
+        "--seconds": option("seconds", "每个场景的模拟时长 (秒)", type=float),
+        "--dt": _dt("dt"),
+        "--csv": _path("csv_path", "结果表另存为 CSV"),
+        "--cache-dir": _path("cache_dir", "结果缓存目录"),
+    }),
+    "render": ("render_figures.py", "根据保存的场批量生成论文插图", {
+        "--workers": option("workers", "渲染进程数", type=int),
+        "--output-dir": _path("output_dir", "输出目录"),
+    }),
+}
+
+
+# 覆盖了脚本中不存在的顶层变量
+class UnknownVariable(KeyError):
+    pass
+
+
+# 命令行中的值: 按 Python 字面量解析, 解析失败时作为字符串 (如 --set season=winter)
+def parse_value(text):
+    try:
+        return ast.literal_eval(text)
+    except (ValueError, SyntaxError):
+        return text
+
+
+def _constant(value):
+    return ast.parse(repr(value), mode="eval").body
+
+
+class _Override(ast.NodeTransformer):
+    """
+    把脚本中变量的第一次顶层赋值替换为给定的值, 例如 timesteps, dt = 6000, 0.1 只替换其中的 timesteps;
+    之后由它计算出的变量 (如 times = timesteps * dt) 随之改变
+    """
+
+    def __init__(self, overrides):
+        self.overrides = overrides
+        self.applied = set()
+
+    def _replace(self, name):
+        if name in self.overrides and name not in self.applied:
+            self.applied.add(name)
+            return _constant(self.overrides[name])
+        return None
+
+    def visit_Module(self, node):
+        for statement in node.body:
+            if isinstance(statement, ast.Assign) and len(statement.targets) == 1:
+                self._assign(statement)
+            elif isinstance(statement, ast.AnnAssign) and statement.value is not None:
+                if isinstance(statement.target, ast.Name):
+                    statement.value = self._replace(statement.target.id) or statement.value
+        return node
+
+    def _assign(self, statement):
+        target = statement.targets[0]
+        if isinstance(target, ast.Name):
+            statement.value = self._replace(target.id) or statement.value
+        elif (isinstance(target, ast.Tuple) and isinstance(statement.value, ast.Tuple)
+              and len(target.elts) == len(statement.value.elts)):
+            for i, element in enumerate(target.elts):
+                if isinstance(element, ast.Name):
+                    statement.value.elts[i] = self._replace(element.id) or statement.value.elts[i]
+
+
+def compile_script(path, overrides=None):
+    """读取并编译脚本, overrides 为 {变量名: 值}, 替换对应的顶层赋值; 脚本中没有的变量报错"""
+    with open(path, encoding="utf-8") as f:
+        tree = ast.parse(f.read(), filename=path)
+    overrides = overrides or {}
+    transformer = _Override(overrides)
+    tree = ast.fix_missing_locations(transformer.visit(tree))
+    missing = sorted(set(overrides) - transformer.applied)
+    if missing:
+        raise UnknownVariable(f"{os.path.relpath(path, ROOT)} 中没有顶层变量 {', '.join(missing)}")
+    return compile(tree, path, "exec")
+
+
+# 本次运行不弹出窗口: 切换到 Agg 后端 (环境变量同时作用于 spawn 启动的子进程),
+# 结束后恢复原来的环境变量和后端, batch 中后续未指定 --no-show 的运行仍然正常显示
+@contextlib.contextmanager
+def _headless():
+    import matplotlib
+    from matplotlib import rcsetup
+    saved_env = os.environ.get("MPLBACKEND")
+    saved_backend = matplotlib.rcParams._get_backend_or_none() or rcsetup._auto_backend_sentinel  # 不触发自动选择
+    os.environ["MPLBACKEND"] = "Agg"
+    matplotlib.use("Agg")
+    try:
+        yield
+    finally:
+        if saved_env is None:
+            os.environ.pop("MPLBACKEND", None)
+        else:
+            os.environ["MPLBACKEND"] = saved_env
+        if "matplotlib.pyplot" in sys.modules:
+            sys.modules["matplotlib.pyplot"].switch_backend(saved_backend)
+        else:
+            matplotlib.rcParams["backend"] = saved_backend
+
+
+def _close_figures():
+    if "matplotlib.pyplot" in sys.modules:
+        sys.modules["matplotlib.pyplot"].close("all")
+
+
+# 写出 cProfile 结果和折叠栈, 打印分阶段汇总表和自身耗时最多的函数
+def _write_profile(prefix, name, profiler, stats):
+    import pstats
+    os.makedirs(os.path.dirname(prefix) or ".", exist_ok=True)
+    stats.dump_stats(prefix + ".prof")
+    profiler.write_folded(prefix + ".folded", root=name)
+    print(f"\n分阶段计时 ({name}):")
+    print(profiler.report())
+    print("\n自身耗时最多的函数:")
+    pstats.Stats(stats).sort_stats("tottime").print_stats(15)
+    print(f"已写出 {prefix}.prof (snakeviz / pstats) 和 {prefix}.folded (flamegraph.pl / speedscope)")
+
+
+def run_script(name, overrides=None, show=True, profile=None, profile_memory=False):
+    """
+    运行子命令 name 对应的脚本, 返回脚本运行结束时的全局变量 (便于在同一个解释器中继续使用结果)
+    脚本作为 __main__ 模块、在其所在目录下执行, 与 python question1/xxx.py 直接运行时的行为一致;
+    show=False 时本次运行使用 Agg 后端, plt.show() 不弹出窗口 (结束后恢复原来的后端); 运行结束后关闭全部 figure, 多次运行不会累积
+    profile: 输出文件的前缀 (相对当前目录), 给出时用 cProfile 和分阶段计时运行 (见模块说明), 脚本出错时也会写出
+    """
+    path = os.path.join(ROOT, SCRIPTS[name][0])
+    code = compile_script(path, overrides)
+    stats = None
+    if profile is not None:
+        import cProfile
+        profile = os.path.abspath(profile)
+        profiling.enable(profile_memory)
+        stats = cProfile.Profile()
+    module = types.ModuleType("__main__")
+    module.__file__ = path
+    saved = sys.modules.get("__main__"), sys.argv, os.getcwd()
+    sys.modules["__main__"] = module  # 进程后端 (fork) 按 __main__ 查找脚本中定义的函数
+    sys.argv = [path]
+    os.chdir(os.path.dirname(path))
+    try:
+        with contextlib.nullcontext() if show else _headless(), warnings.catch_warnings():
+            if not show:
+                warnings.filterwarnings("ignore", message=".*non-interactive.*")
+            if stats is not None:
+                stats.enable()
+            try:
+                exec(code, module.__dict__)
+            finally:
+                if stats is not None:
+                    stats.disable()
+    finally:
+        sys.modules["__main__"], sys.argv = saved[0], saved[1]
+        os.chdir(saved[2])
+        _close_figures()
+        if stats is not None:
+            _write_profile(profile, name, profiling.disable(), stats)
+    return module.__dict__
+
+
+def _parse_set(text):
+    name, sep, value = text.partition("=")
+    if not sep or not name.strip().isidentifier():
+        raise argparse.ArgumentTypeError(f"应为 名称=值, 而不是 {text!r}")
+    return name.strip(), parse_value(value)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m apmcm", description="运行 2024 APMCM B 题各问的脚本")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("list", help="列出全部子命令及其选项")
+    run = commands.add_parser("run", help="运行一个脚本")
+    scripts = run.add_subparsers(dest="script", required=True, metavar="script")
+    for name, (path, description, options) in SCRIPTS.items():
+        sub = scripts.add_parser(name, help=description, description=f"{description} ({path})")
+        for flag, (variable, kwargs) in options.items():
+            if "choices" not in kwargs:
+                kwargs = dict({"metavar": variable.upper()}, **kwargs)
+            sub.add_argument(flag, dest=f"override:{variable}", default=argparse.SUPPRESS, **kwargs)
+        sub.add_argument("--set", dest="assignments", type=_parse_set, action="append", default=[],
+                         metavar="NAME=VALUE", help="覆盖脚本中任意的顶层变量, 可重复")
+        sub.add_argument("--no-show", dest="show", action="store_false", help="不弹出图窗口 (Agg 后端)")
+        sub.add_argument("--profile", nargs="?", const=os.path.join("profiles", name), metavar="PREFIX",
+                         help=f"分阶段计时并用 cProfile 运行, 写出 PREFIX.prof 和 PREFIX.folded (默认 profiles/{name})")
+        sub.add_argument("--profile-memory", action="store_true", help="与 --profile 一起使用, 记录各阶段的临时分配")
+    batch = commands.add_parser("batch", help="在同一个解释器中依次运行文件中的多条 run 命令")
+    batch.add_argument("file", help="每行一条命令, 如 run q1-reynolds; # 开头为注释")
+    batch.add_argument("--keep-going", action="store_true", help="某条命令出错时继续运行后面的命令")
+    return parser
+
+
+def _overrides(args):
+    overrides = {key.split(":", 1)[1]: value for key, value in vars(args).items() if key.startswith("override:")}
+    overrides.update(args.assignments)
+    return overrides
+
+
+def _run(args):
+    profile = args.profile
+    if args.profile_memory and profile is None:
+        profile = os.path.join("profiles", args.script)
+    return run_script(args.script, _overrides(args), args.show, profile, args.profile_memory)
+
+
+def _list():
+    for name, (path, description, options) in SCRIPTS.items():
+        flags = " ".join(options)
+        print(f"{name:<16} {description} ({path})" + (f"\n{'':<16} {flags}" if flags else ""))
+
+
+def _batch(parser, path, keep_going=False):
+    with open(path, encoding="utf-8") as f:
+        lines = [line.strip() for line in f]
+    commands = [line for line in lines if line and not line.startswith("#")]
+    failed = 0
+    for i, line in enumerate(commands, 1):
+        args = parser.parse_args(shlex.split(line))
+        if args.command != "run":
+            parser.error(f"batch 文件中只能包含 run 命令: {line}")
+        print(f"[{i}/{len(commands)}] {line}")
+        start = time.perf_counter()
+        try:
+            _run(args)
+        except Exception as error:
+            if not keep_going:
+                raise
+            failed += 1
+            print(f"出错: {type(error).__name__}: {error}")
+        print(f"[{i}/{len(commands)}] 用时 {time.perf_counter() - start:.2f} 秒")
+    return 1 if failed else 0
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.command == "list":
+        _list()
+        return 0
+    if args.command == "batch":
+        return _batch(parser, args.file, args.keep_going)
+    try:
+        _run(args)
+    except UnknownVariable as error:
+        parser.error(error.args[0])
+    return 0
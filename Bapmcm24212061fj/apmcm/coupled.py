@@ -0,0 +1,114 @@
+"""
+温度、PM2.5 浓度、湿度三个物理量的耦合模拟 (第四问三合一设备)
+三个场堆叠在同一个 (3, nx, ny, nz) 数组中, 每个时间步只做一次拉普拉斯扫描,
+湿度扩散系数按当前温度场逐点计算 (apmcm.air.humidity_diffusion_coefficient)
+"""
+import numpy as np
+
+from apmcm import profiling
+from apmcm.air import humidity_diffusion_coefficient
+from apmcm.solver import apply_dirichlet
+from apmcm.stencil import laplacian_3d, laplacian_workspace
+
+
+class Species:
+    """
+    参与耦合模拟的一个物理量
+    diffusivity 可以是常数, 也可以是函数 f(fields, out), 把逐点扩散系数写入 out (fields 为堆叠后的全部场);
+    其余参数与 FieldSolver 相同。逐点扩散系数按 D(x) * ∇²u 处理, 与各问脚本的显式格式一致
+    """
+
+    def __init__(self, name, diffusivity, initial, boundary=None, sources=(), clamp=None):
+        self.name = name
+        self.diffusivity = diffusivity
+        self.initial = initial
+        self.boundary = boundary
+        self.sources = list(sources)
+        self.clamp = clamp
+
+
+# 湿度扩散系数随温度场(第 0 个物理量)变化, 结果写入 out
+# 与 humidity_diffusion_coefficient 相同, 只是把 x ** 1.75 拆成 x * sqrt(x) * sqrt(sqrt(x)),
+# 开方比非整数次幂快得多, 且全程原地计算
+def humidity_diffusivity_from_temperature(fields, out):
+    D0 = humidity_diffusion_coefficient(25)  # 25°C 时的参考扩散系数
+    np.add(fields[0], 273.15, out=out)
+    out /= 298.15
+    root = np.sqrt(out)
+    out *= root
+    np.sqrt(root, out=root)
+    out *= root
+    out *= D0
+    return out
+
+
+class CoupledSolver:
+    """
+    多物理量的显式欧拉扩散求解器, 每步的顺序与 FieldSolver 相同:
+    源项 -> 扩散(一次堆叠扫描) -> 汇项 -> 限幅 -> 墙面边界
+    batch: 批量维度的大小, 给出时每个物理量的场为 (batch, nx, ny, nz), 一次推进 batch 个场景;
+    此时各场景不同的参数以数组给出: 初值、源项的目标值/强度/系数和限幅为 (batch, 1, 1, 1),
+    墙面固定值为 (batch, 1, 1), 影响场为 (batch, nx, ny, nz)
+    """
+
+    def __init__(self, grid, species, dt=0.1, batch=None):
+        self.grid = grid
+        self.species = list(species)
+        self.names = [s.name for s in self.species]
+        self.dt = dt
+        self.batch = batch
+        shape = (len(self.species),) + ((batch,) if batch is not None else ()) + tuple(grid.shape)
+        self.fields = np.empty(shape, dtype=grid.dtype)
+        for field, s in zip(self.fields, self.species):
+            field[...] = s.initial
+        self.steps = 0
+        self.profiler = profiling.active()  # 启用了 --profile 时分阶段计时, 否则为 None
+        self._laplacian = np.zeros_like(self.fields)
+        self._work = laplacian_workspace(self.fields.shape, self.fields.dtype)
+        self._coefficient = np.empty(shape[1:], dtype=grid.dtype)  # 逐点扩散系数的缓冲区
+
+    @property
+    def time(self):
+        return self.steps * self.dt
+
+    # 按名称取出某个物理量的场 (视图)
+    def __getitem__(self, name):
+        return self.fields[self.names.index(name)]
+
+    def step(self):
+        fields, dt, grid, profile = self.fields, self.dt, self.grid, self.profiler
+        if profile is not None:
+            profile.start()
+        for field, s in zip(fields, self.species):
+            for source in s.sources:
+                if source.stage == "before":
+                    source.apply(field, dt)
+        if profile is not None:
+            profile.lap("CoupledSolver.step;sources")
+        laplacian_3d(fields, self._laplacian, grid.dx, grid.dy, grid.dz, self._work)
+        for laplacian, s in zip(self._laplacian, self.species):
+            if callable(s.diffusivity):
+                laplacian *= s.diffusivity(fields, self._coefficient)
+                laplacian *= dt
+            else:
+                laplacian *= s.diffusivity * dt
+        fields += self._laplacian
+        if profile is not None:
+            profile.lap("CoupledSolver.step;diffusion")
+        for field, s in zip(fields, self.species):
+            for source in s.sources:
+                if source.stage == "after":
+                    source.apply(field, dt)
+            if s.clamp is not None:
+                np.clip(field, s.clamp[0], s.clamp[1], out=field)
+            if s.boundary is not None:
+                apply_dirichlet(field, s.boundary)
+        if profile is not None:
+            profile.lap("CoupledSolver.step;sinks+clamp+boundary")
+            profile.count("steps")
+        self.steps += 1
+
+    def run(self, steps):
+        for _ in range(steps):
+            self.step()
+        return self.fields
@@ -0,0 +1,94 @@
+"""
+第二问净化器设计空间的穷举评估
+air_purifier_design 是 (D, H, N_filter, N_in, N_out) 的解析函数, 计算代价极低;
+PurifierDesignSpace 对整数基因逐一枚举、对 (D, H) 取稠密网格, 一次广播计算全部设计的 CADR、功耗和体积,
+给出每个 (D, H) 上的最优 CADR (热力图) 和满足约束的 Pareto 前沿 (CADR 越大越好, 功耗和体积越小越好),
+结果是精确的, 不依赖遗传算法的随机搜索, 整数基因也不会像 mutGaussian 那样变成小数
+"""
+import numpy as np
+
+from apmcm.designs import purifier_model
+
+
+def _front_2d(volume, cadr):
+    """二维 Pareto 前沿 (体积越小越好, CADR 越大越好) 的下标, 按体积升序"""
+    order = np.lexsort((-cadr, volume))  # 体积升序, 同体积时 CADR 降序
+    running = np.maximum.accumulate(cadr[order])
+    keep = np.empty(len(order), dtype=bool)
+    keep[0] = True
+    keep[1:] = cadr[order][1:] > running[:-1]  # 比所有体积更小的点都严格更好才保留
+    return order[keep]
+
+
+def pareto_mask(cadr, power, volume):
+    """
+    一维数组 cadr (越大越好)、power、volume (越小越好) 中非支配点的布尔掩码, 完全相同的点只保留一个
+    按功耗从低到高分组: 组内做二维 (体积, CADR) 前沿, 再去掉被更低功耗前沿支配的点;
+    第二问的功耗只取少数几个离散值, 总代价约为 O(n log n)
+    """
+    mask = np.zeros(len(cadr), dtype=bool)
+    front_volume = np.empty(0)
+    front_cadr = np.empty(0)
+    for level in np.unique(power):
+        index = np.flatnonzero(power == level)
+        index = index[_front_2d(volume[index], cadr[index])]
+        if len(front_volume):
+            # 更低功耗的前沿中体积不超过 v 的点的最大 CADR 不低于 c 时, 该点被支配
+            position = np.searchsorted(front_volume, volume[index], side="right") - 1
+            best = np.where(position >= 0, front_cadr[np.maximum(position, 0)], -np.inf)
+            index = index[best < cadr[index]]
+        mask[index] = True
+        if len(index):
+            merged_volume = np.concatenate([front_volume, volume[index]])
+            merged_cadr = np.concatenate([front_cadr, cadr[index]])
+            order = np.argsort(merged_volume, kind="stable")
+            front_volume = merged_volume[order]
+            front_cadr = np.maximum.accumulate(merged_cadr[order])  # 体积不超过 v 的最大 CADR
+    return mask
+
+
+class PurifierDesignSpace:
+    """
+    D, H: 直径和高度的一维取值; n_filter, n_in, n_out: 整数基因的全部取值;
+    其余参数与 q2_cadr_design.py 相同。各数组形状为 (D, H, N_filter, N_in, N_out)
+    """
+
+    def __init__(self, D, H, n_filter, n_in, n_out, room_volume, device_volume, max_flow, max_power, k_filter):
+        self.D, self.H = np.asarray(D, dtype=float), np.asarray(H, dtype=float)
+        self.n_filter, self.n_in, self.n_out = (np.asarray(n, dtype=int) for n in (n_filter, n_in, n_out))
+        axes = np.ix_(self.D, self.H, self.n_filter, self.n_in, self.n_out)
+        cadr, power, volume = purifier_model(*axes, room_volume, max_flow, k_filter)
+        self.shape = tuple(len(axis) for axis in (self.D, self.H, self.n_filter, self.n_in, self.n_out))
+        self.cadr = np.broadcast_to(cadr, self.shape)
+        self.power = np.broadcast_to(power, self.shape)
+        self.volume = np.broadcast_to(volume, self.shape)
+        self.feasible = (self.volume <= device_volume) & (self.power <= max_power)
+
+    # 第 index 个设计 (展平后的下标) 的全部参数和指标
+    def design(self, index):
+        i, j, f, a, b = np.unravel_index(index, self.shape)
+        return {"D": float(self.D[i]), "H": float(self.H[j]), "N_filter": int(self.n_filter[f]),
+                "N_in": int(self.n_in[a]), "N_out": int(self.n_out[b]), "CADR": float(self.cadr[i, j, f, a, b]),
+                "power": float(self.power[i, j, f, a, b]), "volume": float(self.volume[i, j, f, a, b])}
+
+    # CADR 最大的可行设计; 同 CADR 时取功耗更低、体积更小的
+    def best(self):
+        feasible = np.flatnonzero(self.feasible)
+        order = np.lexsort((self.volume.ravel()[feasible], self.power.ravel()[feasible], -self.cadr.ravel()[feasible]))
+        return self.design(feasible[order[0]])
+
+    # 每个 (D, H) 上枚举整数基因后的最优 CADR, 形状 (D, H), 没有可行设计的位置为 nan
+    def best_cadr_map(self):
+        cadr = np.where(self.feasible, self.cadr, -np.inf).max(axis=(2, 3, 4))
+        return np.where(np.isfinite(cadr), cadr, np.nan)
+
+    # 可行设计的 Pareto 前沿, 返回各参数和指标的一维数组 (按功耗、体积升序)
+    def pareto(self):
+        feasible = np.flatnonzero(self.feasible)
+        cadr, power, volume = (a.ravel()[feasible] for a in (self.cadr, self.power, self.volume))
+        index = feasible[pareto_mask(cadr, power, volume)]
+        index = index[np.lexsort((self.volume.ravel()[index], self.power.ravel()[index]))]
+        i, j, f, a, b = np.unravel_index(index, self.shape)
+        return {"D": self.D[i], "H": self.H[j], "N_filter": self.n_filter[f], "N_in": self.n_in[a],
+                "N_out": self.n_out[b], "CADR": self.cadr.ravel()[index], "power": self.power.ravel()[index],
+                "volume": self.volume.ravel()[index]}
@@ -0,0 +1,123 @@
+"""
+各问设备设计模型的向量化版本 (一次计算整个种群)
+与各脚本中逐个体的适应度函数逐项对应, 输入为 (个体数, 基因数) 的矩阵, 参数由脚本显式传入
+"""
+import numpy as np
+
+
+# 第一问: 对应 q1_position_ga.py 的 repair_individual
+def repair_ac_genes(genes, room_size):
+    genes = genes.copy()
+    genes[:, 0] = np.clip(genes[:, 0], 0.1, 0.5)  # 半径范围
+    genes[:, 1] = np.clip(genes[:, 1], 0.5, 1.5)  # 高度范围
+    genes[:, 2:4] = np.clip(np.trunc(genes[:, 2:4]), 1, 5)  # 进、出风口数量
+    genes[:, 4:7] = np.clip(genes[:, 4:7], 0, room_size)  # 位置范围
+    return genes
+
+
+# 第一问: 空调的体积和功耗
+def ac_volume_power(genes):
+    r, h, n_in, n_out = genes[:, 0], genes[:, 1], genes[:, 2], genes[:, 3]
+    return np.pi * r ** 2 * h, 50 * h + 30 * r + 10 * n_in + 10 * n_out
+
+
+# 第一问: 每个设计的温度偏差之和 (基因需已修复), 不检查约束
+# x, y, z 为一维坐标轴, indexing 与生成 T 网格时 np.meshgrid 的参数一致;
+# 高斯影响 exp(-d²/2r²) 可分解为三个方向一维指数的乘积, 只需对 (个体, 轴长) 求指数,
+# 再在 (个体, nx, ny, nz) 上广播相乘, 按 chunk_bytes 分块以限制内存
+def ac_temperature_deviation(genes, x, y, z, T, t_ac_out, t_target, indexing="ij", chunk_bytes=16 * 2 ** 20):
+    r = genes[:, 0]
+    deviation = np.empty(len(genes), dtype=float)
+    chunk = max(1, chunk_bytes // (T.nbytes * 2))
+    for start in range(0, len(genes), chunk):
+        rows = slice(start, start + chunk)
+        two_r2 = (2 * r[rows] ** 2)[:, None]
+        ex = np.exp(-(x - genes[rows, 4:5]) ** 2 / two_r2)
+        ey = np.exp(-(y - genes[rows, 5:6]) ** 2 / two_r2)
+        ez = np.exp(-(z - genes[rows, 6:7]) ** 2 / two_r2)
+        if indexing == "xy":
+            ex, ey = ey, ex  # meshgrid 默认网格的第 0 维对应 y
+        influence = ex[:, :, None, None] * ey[:, None, :, None] * ez[:, None, None, :]
+        T_new = T + influence * (t_ac_out - T)
+        deviation[rows] = np.abs(T_new - t_target).sum(axis=(1, 2, 3))
+    return deviation
+
+
+# 第一问: 对应 q1_position_ga.py 的 ac_design_evaluation (基因需已修复), 不满足约束的设计为 penalty
+def ac_design_batch(genes, x, y, z, T, t_ac_out, t_target, max_volume, max_power, indexing="ij",
+                    penalty=1e6, chunk_bytes=16 * 2 ** 20):
+    volume, power = ac_volume_power(genes)
+    feasible = (volume <= max_volume) & (power <= max_power)
+    fitness = np.full(len(genes), penalty, dtype=float)
+    fitness[feasible] = ac_temperature_deviation(genes[feasible], x, y, z, T, t_ac_out, t_target,
+                                                 indexing, chunk_bytes)
+    return fitness
+
+
+# 约束违反量: 超出各上限的相对量之和, 0 表示可行
+def constraint_violation(*pairs):
+    violation = 0.0
+    for value, limit in pairs:
+        violation = violation + np.maximum(value - limit, 0) / limit
+    return violation
+
+
+# 第一问多目标 (NSGA-II): 目标为 (温度偏差, 功耗, 体积), 同时返回约束违反量 (基因需已修复)
+# 不可行设计不计算温度场, 温度偏差记为 inf; 约束支配下不可行解之间只比较违反量
+def ac_design_objectives(genes, x, y, z, T, t_ac_out, t_target, max_volume, max_power, indexing="ij",
+                         chunk_bytes=16 * 2 ** 20):
+    volume, power = ac_volume_power(genes)
+    violation = constraint_violation((volume, max_volume), (power, max_power))
+    feasible = violation == 0
+    deviation = np.full(len(genes), np.inf)
+    deviation[feasible] = ac_temperature_deviation(genes[feasible], x, y, z, T, t_ac_out, t_target,
+                                                   indexing, chunk_bytes)
+    return np.column_stack([deviation, power, volume]), violation
+
+
+# 第二问: air_purifier_design 的净化器模型, 各参数按广播规则可以是任意形状的数组 (整数基因需已取整),
+# 返回 (CADR, 功耗, 体积), 不检查约束
+def purifier_model(D, H, N_filter, N_in, N_out, room_volume, max_flow, k_filter):
+    volume = np.pi * (D / 2) ** 2 * H
+    filter_area = np.pi * D * H * N_filter
+    Q_in = np.minimum(N_in * (max_flow / 2), max_flow)  # 总进风量
+    Q_out = np.minimum(N_out * (max_flow / 2), max_flow)  # 总出风量
+    air_change_rate = Q_in / room_volume
+    eta = 1 - np.exp(-k_filter * filter_area * air_change_rate)
+    cadr = Q_out * eta
+    power_consumption = 50 + 100 * N_filter + 100 * N_in + 100 * N_out
+    return cadr, power_consumption, volume
+
+
+# 第二问: 对应 q2_cadr_design.py 的 air_purifier_design, 返回每个设计的 CADR (不满足约束为 0)
+def purifier_cadr_batch(genes, room_volume, device_volume, max_flow, max_power, k_filter):
+    N_filter, N_in, N_out = (genes[:, 2:5].astype(int)).T
+    cadr, power_consumption, volume = purifier_model(genes[:, 0], genes[:, 1], N_filter, N_in, N_out,
+                                                     room_volume, max_flow, k_filter)
+    return np.where((volume > device_volume) | (power_consumption > max_power), 0.0, cadr)
+
+
+# 第二问多目标模式的修复: 整数基因取整, 全部基因限制在 bounds (每个基因一对 (下限, 上限)) 内
+def repair_purifier_genes(genes, bounds):
+    genes = genes.copy()
+    genes[:, 2:5] = np.trunc(genes[:, 2:5])
+    low, high = np.asarray(bounds, dtype=float).T
+    return np.clip(genes, low, high)
+
+
+# 第二问多目标 (NSGA-II): 目标为 (CADR, 功耗, 体积), 同时返回约束违反量 (基因需已修复)
+def purifier_design_objectives(genes, room_volume, device_volume, max_flow, max_power, k_filter):
+    N_filter, N_in, N_out = (genes[:, 2:5].astype(int)).T
+    cadr, power_consumption, volume = purifier_model(genes[:, 0], genes[:, 1], N_filter, N_in, N_out,
+                                                     room_volume, max_flow, k_filter)
+    violation = constraint_violation((volume, device_volume), (power_consumption, max_power))
+    return np.column_stack([cadr, power_consumption, volume]), violation
+
+
+# 第四问: 对应 q4_design.py 的 evaluate_heights, 返回与目标占比的偏差平方和 (体积超限为 penalty)
+def height_deviation_batch(genes, cross_section, volume_limit, target_ratios, penalty=1e6):
+    total_height = genes[:, 0] + genes[:, 1] + genes[:, 2]
+    total_volume = cross_section * total_height
+    ratios = genes / total_height[:, None]
+    deviation = ((ratios - np.asarray(target_ratios)) ** 2).sum(axis=1)
+    return np.where(total_volume > volume_limit, penalty, deviation)
@@ -0,0 +1,247 @@
+"""
+各问遗传算法共用的 DEAP 主循环与运行器
+- ea_simple: 与 deap.algorithms.eaSimple 的流程完全相同 (选择 -> varAnd 交叉变异 -> 评估无效个体 -> 名人堂 -> 统计),
+  可选按种群整体评估: 每一代把所有待评估个体组成 (个体数, 基因数) 的 NumPy 矩阵, 一次调用批量适应度函数
+- EarlyStopping: 停滞 k 代、墙钟时间预算、评估次数预算, 任一满足即提前结束, 不必总是跑满 ngen 代
+- GARunner: q1/q2/q4 中重复的工具箱注册、算子、统计和名人堂设置
+- create_type: 可重复调用的 creator.create, 同一个解释器中多次运行脚本 (python -m apmcm batch) 时复用已创建的类
+多目标 (NSGA-II) 版本见 apmcm.multiobjective
+"""
+import time
+
+import numpy as np
+from deap import algorithms, base, creator, tools
+
+from apmcm import profiling
+
+
+def evaluate_batch(individuals, batch_evaluate, repair=None):
+    """
+    批量评估 individuals, 返回评估的个体数
+    batch_evaluate(genes) -> 适应度数组, 形状 (n,) 或 (n, 目标数);
+    repair(genes) -> 修复后的基因矩阵, 修复结果会写回个体 (与逐个评估时就地修复个体的行为一致)
+    """
+    if not individuals:
+        return 0
+    genes = np.array([list(ind) for ind in individuals], dtype=float)
+    if repair is not None:
+        genes = repair(genes)
+        for ind, row in zip(individuals, genes):
+            ind[:] = row.tolist()
+    fitnesses = np.asarray(batch_evaluate(genes), dtype=float).reshape(len(individuals), -1)
+    for ind, fit in zip(individuals, fitnesses):
+        ind.fitness.values = tuple(fit)
+    return len(individuals)
+
+
+# 评估适应度无效的个体: 给了 batch_evaluate 时整体评估, 否则与 eaSimple 一样用 toolbox.map 逐个评估
+def _evaluate_invalid(individuals, toolbox, batch_evaluate, repair):
+    invalid_ind = [ind for ind in individuals if not ind.fitness.valid]
+    if batch_evaluate is not None:
+        return evaluate_batch(invalid_ind, batch_evaluate, repair)
+    fitnesses = toolbox.map(toolbox.evaluate, invalid_ind)
+    for ind, fit in zip(invalid_ind, fitnesses):
+        ind.fitness.values = fit
+    return len(invalid_ind)
+
+
+class EarlyStopping:
+    """
+    stall: 最优值和平均值连续 stall 代都没有改进时停止, 改进指超过 tol * |原值| + atol;
+    time_budget: 墙钟时间预算 (秒); max_evaluations: 适应度评估次数预算
+    各条件为 None 时不启用; 预算在每代结束时检查, 因此最多超出一代
+    """
+
+    def __init__(self, stall=None, tol=1e-4, atol=1e-10, time_budget=None, max_evaluations=None):
+        self.stall = stall
+        self.tol = tol
+        self.atol = atol
+        self.time_budget = time_budget
+        self.max_evaluations = max_evaluations
+        self.start()
+
+    def start(self):
+        self._start = time.perf_counter()
+        self._best = self._avg = None
+        self.stalled = 0
+        self.evaluations = 0
+        self.reason = None
+
+    def _improved(self, value, reference):
+        return reference is None or value - reference > self.tol * abs(reference) + self.atol
+
+    # 每代结束后调用, 返回是否停止; 按加权适应度 (wvalues, 越大越好) 判断改进, 最小化和最大化统一处理
+    def update(self, population, nevals):
+        self.evaluations += nevals
+        values = np.array([ind.fitness.wvalues[0] for ind in population])
+        best, avg = values.max(), values.mean()
+        if self._improved(best, self._best) or self._improved(avg, self._avg):
+            self.stalled = 0
+        else:
+            self.stalled += 1
+        self._best = best if self._best is None else max(best, self._best)
+        self._avg = avg if self._avg is None else max(avg, self._avg)
+        if self.stall is not None and self.stalled >= self.stall:
+            self.reason = f"最优值和平均值连续 {self.stall} 代没有改进"
+        elif self.time_budget is not None and time.perf_counter() - self._start >= self.time_budget:
+            self.reason = f"达到时间预算 {self.time_budget} 秒"
+        elif self.max_evaluations is not None and self.evaluations >= self.max_evaluations:
+            self.reason = f"达到评估次数预算 {self.max_evaluations} 次"
+        return self.reason is not None
+
+
+def ea_simple(population, toolbox, cxpb, mutpb, ngen, batch_evaluate=None, repair=None,
+              stats=None, halloffame=None, verbose=__debug__, stopping=None):
+    logbook = tools.Logbook()
+    logbook.header = ['gen', 'nevals'] + (stats.fields if stats else [])
+    profile = profiling.active()  # 启用了 --profile 时每代分阶段计时
+    if stopping is not None:
+        stopping.start()
+
+    # 评估初始种群中适应度无效的个体
+    if profile is not None:
+        profile.start()
+    nevals = _evaluate_invalid(population, toolbox, batch_evaluate, repair)
+    if profile is not None:
+        profile.lap("ea_simple;evaluate")
+        profile.count("evaluations", nevals)
+
+    if halloffame is not None:
+        halloffame.update(population)
+
+    record = stats.compile(population) if stats else {}
+    logbook.record(gen=0, nevals=nevals, **record)
+    if verbose:
+        print(logbook.stream)
+    if stopping is not None and stopping.update(population, nevals):
+        return population, logbook
+
+    for gen in range(1, ngen + 1):
+        # 选择、交叉变异
+        if profile is not None:
+            profile.start()
+        offspring = toolbox.select(population, len(population))
+        offspring = algorithms.varAnd(offspring, toolbox, cxpb, mutpb)
+        if profile is not None:
+            profile.lap("ea_simple;select+vary")
+
+        # 评估适应度无效的后代
+        nevals = _evaluate_invalid(offspring, toolbox, batch_evaluate, repair)
+        if profile is not None:
+            profile.lap("ea_simple;evaluate")
+            profile.count("evaluations", nevals)
+
+        if halloffame is not None:
+            halloffame.update(offspring)
+
+        population[:] = offspring
+
+        record = stats.compile(population) if stats else {}
+        logbook.record(gen=gen, nevals=nevals, **record)
+        if profile is not None:
+            profile.lap("ea_simple;statistics")
+        if verbose:
+            print(logbook.stream)
+        if stopping is not None and stopping.update(population, nevals):
+            break
+
+    return population, logbook
+
+
+def create_type(name, base_class, **attributes):
+    """
+    与 creator.create(name, base_class, **attributes) 相同, 返回创建的类;
+    同名的类已用相同的参数创建过时直接返回它 (不再重复创建、不触发覆盖警告), 参数不同时 (如 q1 的 Individual 继承
+    FitnessMin, q2 的继承 FitnessMax) 先删除旧类再重新创建
+    """
+    existing = getattr(creator, name, None)
+    if existing is not None:
+        if getattr(existing, "_created_with", None) == (base_class, attributes):
+            return existing
+        delattr(creator, name)
+    creator.create(name, base_class, **attributes)
+    created = getattr(creator, name)
+    created._created_with = (base_class, attributes)
+    return created
+
+
+# 各问共用的个体初始化和交叉变异算子: cxBlend(0.5) 交叉, mutGaussian(0, 0.05, 0.2) 变异
+def make_toolbox(individual_class, attributes, evaluate=None, map_function=None):
+    toolbox = base.Toolbox()
+    toolbox.register("individual", tools.initCycle, individual_class, tuple(attributes), n=1)
+    toolbox.register("population", tools.initRepeat, list, toolbox.individual)
+    toolbox.register("mate", tools.cxBlend, alpha=0.5)
+    toolbox.register("mutate", tools.mutGaussian, mu=0, sigma=0.05, indpb=0.2)
+    if evaluate is not None:
+        toolbox.register("evaluate", evaluate)
+    if map_function is not None:
+        toolbox.register("map", map_function)
+    return toolbox
+
+
+class GARunner:
+    """
+    单目标遗传算法运行器, 默认参数与各问脚本一致 (种群 100, cxpb=0.7, mutpb=0.2, 最多 50 代,
+    cxBlend(0.5) 交叉, mutGaussian(0, 0.05, 0.2) 变异, 3 元锦标赛选择)
+    individual_class: creator 创建的个体类; attributes: 各基因的初始化函数;
+    evaluate: 逐个体适应度函数; batch_evaluate / repair: 按种群整体评估 (给出时优先使用);
+    map_function: 注册为 toolbox.map (如 Executor.map); stopping: EarlyStopping, None 时跑满 ngen 代
+    """
+
+    def __init__(self, individual_class, attributes, evaluate=None, batch_evaluate=None, repair=None,
+                 pop_size=100, cxpb=0.7, mutpb=0.2, ngen=50, map_function=None, stopping=None):
+        self.attributes = tuple(attributes)
+        self.toolbox = make_toolbox(individual_class, self.attributes, evaluate, map_function)
+        self.toolbox.register("select", tools.selTournament, tournsize=3)
+
+        self.stats = tools.Statistics(lambda ind: ind.fitness.values)
+        self.stats.register("avg", np.mean)
+        self.stats.register("std", np.std)
+        self.stats.register("min", np.min)
+        self.stats.register("max", np.max)
+
+        self.batch_evaluate = batch_evaluate
+        self.repair = repair
+        self.pop_size = pop_size
+        self.cxpb = cxpb
+        self.mutpb = mutpb
+        self.ngen = ngen
+        self.stopping = stopping
+        self.halloffame = tools.HallOfFame(1)  # 存储最佳个体
+        self.logbook = None
+
+    def run(self, population=None, verbose=True):
+        if population is None:
+            population = self.toolbox.population(n=self.pop_size)
+        population, self.logbook = ea_simple(population, self.toolbox, self.cxpb, self.mutpb, self.ngen,
+                                             batch_evaluate=self.batch_evaluate, repair=self.repair,
+                                             stats=self.stats, halloffame=self.halloffame,
+                                             verbose=verbose, stopping=self.stopping)
+        return population, self.logbook
+
+    # 决定运行结果的设置 (如作为结果缓存的参数); 各基因的初始化函数按 (函数名, 参数) 记录
+    def settings(self):
+        stopping = None
+        if self.stopping is not None:
+            stopping = {name: getattr(self.stopping, name)
+                        for name in ("stall", "tol", "atol", "time_budget", "max_evaluations")}
+        attributes = [(getattr(a, "func", a).__name__, list(getattr(a, "args", ()))) for a in self.attributes]
+        return {"attributes": attributes, "pop_size": self.pop_size, "cxpb": self.cxpb, "mutpb": self.mutpb,
+                "ngen": self.ngen, "stopping": stopping}
+
+    @property
+    def generations(self):
+        return len(self.logbook) - 1
+
+    @property
+    def evaluations(self):
+        return sum(self.logbook.select("nevals"))
+
+    def report(self):
+        text = f"共运行 {self.generations} 代 (上限 {self.ngen} 代), 适应度评估 {self.evaluations} 次"
+        if self.stopping is None or self.stopping.reason is None:
+            return text
+        saved = self.ngen - self.generations
+        per_generation = np.mean(self.logbook.select("nevals")[1:] or [self.pop_size])  # 每代平均评估次数
+        return (text + f"; 提前停止: {self.stopping.reason}, 节省 {saved} 代, "
+                       f"约 {saved * per_generation:.0f} 次评估")
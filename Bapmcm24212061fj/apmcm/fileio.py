@@ -0,0 +1,22 @@
+"""
+结果文件的原子写入
+检查点、场文件、Pareto 存档、结果缓存和基准历史记录都先写到 path + ".tmp", 写完再用 os.replace 改名;
+改名是原子操作, 中途中断 (Ctrl+C、进程被杀) 时只会留下旧文件或没有文件, 不会留下写了一半的文件
+"""
+import os
+
+
+def atomic_write(path, writer, mode="wb"):
+    """
+    writer(f): 把内容写入已打开的临时文件 f; mode: "wb" 二进制 / "w" 文本 (UTF-8)
+    写入失败时删除临时文件并重新抛出异常, 原有的 path 保持不变
+    """
+    tmp = path + ".tmp"
+    try:
+        with open(tmp, mode, encoding=None if "b" in mode else "utf-8") as f:
+            writer(f)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
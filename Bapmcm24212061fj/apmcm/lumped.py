@@ -0,0 +1,50 @@
+"""
+第一问集中参数 (零维) 能量平衡模型的解析解
+q1_lines.py 的模型 dT/dt = -alpha (T - T_ac_out) - beta (T - T_outdoor) 是常系数一阶线性方程:
+T(t) = T_eq + (T0 - T_eq) exp(-k t), 其中 k = alpha + beta, T_eq = (alpha T_ac_out + beta T_outdoor) / k,
+达到目标温度的时间也有解析式, 不必逐秒迭代再查找越过目标值的时刻。
+全部函数按 NumPy 广播规则对参数向量化, 风量、出风口温度、房间体积等都可以是数组, 一次计算大量工况;
+给出 dt 时改用与脚本相同的显式欧拉递推 T_n = T_eq + (T0 - T_eq) (1 - k dt)^n 的解析形式, 结果与逐步迭代一致
+"""
+import numpy as np
+
+RHO = 1.2  # 空气密度（kg/m^3）
+C_P = 1005  # 比热容（J/(kg·K)）
+
+
+# 由进、出风量 (m³/s) 和房间体积 (m³) 计算方程系数 alpha (质量流速系数) 和 beta (热传递系数), 单位 1/s
+def coefficients(V_dot_in, V_dot_out, volume, rho=RHO, c_p=C_P):
+    m_air = rho * np.asarray(volume, dtype=float)  # 房间空气质量（kg）
+    m_dot_ac = rho * (np.asarray(V_dot_in, dtype=float) + V_dot_out) / 2  # 平均风量（kg/s）
+    return m_dot_ac / m_air, 1 / (m_air * c_p)
+
+
+# 平衡温度 (t → ∞ 时的室温)
+def equilibrium(T_ac_out, T_outdoor, alpha, beta):
+    return (alpha * np.asarray(T_ac_out, dtype=float) + beta * np.asarray(T_outdoor, dtype=float)) / (alpha + beta)
+
+
+# t 时刻的室温, T0 为初始室温
+def temperature(t, T0, T_ac_out, T_outdoor, alpha, beta, dt=None):
+    k = alpha + beta
+    T_eq = equilibrium(T_ac_out, T_outdoor, alpha, beta)
+    t = np.asarray(t, dtype=float)
+    decay = np.exp(-k * t) if dt is None else (1 - k * dt) ** (t / dt)
+    return T_eq + (T0 - T_eq) * decay
+
+
+def time_to_target(T_target, T0, T_ac_out, T_outdoor, alpha, beta, dt=None):
+    """
+    室温第一次达到 T_target 的时间 (秒); T_target 不在 T0 与平衡温度之间 (永远达不到) 时为 inf
+    dt 给出时为显式欧拉递推第一次越过目标值的步数 × dt, 与 q1_lines.py 逐步迭代的结果相同
+    """
+    k = alpha + beta
+    T_eq = equilibrium(T_ac_out, T_outdoor, alpha, beta)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        remaining = (T_target - T_eq) / (T0 - T_eq)  # 达到目标时剩余的温差比例
+        if dt is None:
+            t = -np.log(remaining) / k
+        else:
+            t = np.maximum(np.ceil(np.log(remaining) / np.log1p(-k * dt)), 1) * dt
+    reachable = (remaining > 0) & (remaining <= 1)
+    return np.where(reachable, t, np.inf)
@@ -0,0 +1,68 @@
+"""
+各问扩散脚本的运行方式分派
+q1_diffusion_times.py / q2_situation.py / q3_hum_situation.py 用同一组开关选择如何得到各输出时刻的场:
+- spectral: DST 谱方法直接求解 (可缓存)
+- series_every: 流式输出, 逐帧更新统计量 (可写入分块存储)
+- stop_check_every: 逐步推进并定期检查停止条件, 满足即提前结束
+- 都不设置时: 逐步推进并依次输出各时刻的场 (可写检查点、可缓存)
+三种方式互斥; 只属于某一种方式的参数 (检查点目录、缓存目录、分块存储目录) 在其他方式下设置时同样报错, 而不是被静默忽略
+"""
+from apmcm.cache import ResultCache, cached
+from apmcm.checkpoint import CheckpointStore, run_snapshots, solver_signature
+from apmcm.render import save_fields
+from apmcm.stopping import EarlyTermination
+from apmcm.stream import RunningStats, SnapshotStore, output_times, stream
+
+# 各运行方式用到的可选目录参数
+_OPTIONS = {
+    "spectral": ("cache_dir",),
+    "series_every": ("series_dir",),
+    "stop_check_every": (),
+    "steps": ("checkpoint_dir", "cache_dir"),
+}
+
+
+def run_configured(solver, times, spectral=False, series_every=None, series=None, series_dir=None,
+                   stop_check_every=None, criteria=(), checkpoint_dir=None, checkpoint_every=1000, resume=True,
+                   cache_dir=None, fields_path=None, arrays=None):
+    """
+    按开关推进 solver, 返回各输出时刻的场 [(t, 场), ...]
+    times: 输出时刻 (秒); series: series_every 时更新的 RunningStats (None 时新建, 调用方传入以便之后读取统计量);
+    criteria: stop_check_every 时的停止条件列表, 返回停止时刻的场并打印 EarlyTermination 的报告;
+    fields_path: 保存各时刻的场, arrays 为一同保存的静态数组 (如 {"influence": 影响场})
+    设置了互相冲突的开关, 或当前方式用不到的目录参数时抛出 ValueError
+    """
+    chosen = [name for name, value in (("spectral", spectral), ("series_every", series_every),
+                                       ("stop_check_every", stop_check_every)) if value]
+    if len(chosen) > 1:
+        raise ValueError(f"{' 与 '.join(chosen)} 不能同时设置, 只能选择一种运行方式")
+    mode = chosen[0] if chosen else "steps"
+    given = {"checkpoint_dir": checkpoint_dir, "cache_dir": cache_dir, "series_dir": series_dir}
+    unused = [name for name, value in given.items() if value and name not in _OPTIONS[mode]]
+    if unused:
+        raise ValueError(f"{', '.join(unused)} 在运行方式 {mode} 下不起作用")
+
+    result_cache = ResultCache(cache_dir) if cache_dir else None
+    cache_params = {"solver": solver_signature(solver), "times": list(times), "method": mode}
+    if mode == "spectral":
+        snapshots = cached(result_cache, cache_params, lambda: solver.solve_at(times))
+    elif mode == "series_every":
+        # 每隔 series_every 秒更新统计量 (和分块存储), 途中复制 times 时刻的场 (按步数匹配, 不比较浮点时刻)
+        series = RunningStats() if series is None else series
+        store = SnapshotStore(series_dir, solver.grid.shape, solver.field.dtype) if series_dir else None
+        requested = {int(round(t / solver.dt)) for t in times}
+        frames = stream(solver, output_times(series_every, max(times), times, solver.dt), store, series)
+        snapshots = [(t, field.copy()) for t, field in frames if int(round(t / solver.dt)) in requested]
+    elif mode == "stop_check_every":
+        # 最多推进 max(times) 秒, 输出停止时刻的场
+        termination = EarlyTermination(list(criteria), stop_check_every)
+        termination.run(solver, int(round(max(times) / solver.dt)))
+        print(termination.report())
+        snapshots = [(solver.time, solver.field.copy())]
+    else:
+        store = CheckpointStore(checkpoint_dir, solver) if checkpoint_dir else None
+        snapshots = cached(result_cache, cache_params,
+                           lambda: run_snapshots(solver, times, store, checkpoint_every, resume))
+    if fields_path:
+        save_fields(fields_path, solver.grid, snapshots, **(arrays or {}))
+    return snapshots
@@ -0,0 +1,264 @@
+"""
+设备设计的多目标优化 (NSGA-II)
+单目标脚本把体积、功耗约束折算成惩罚常数 (q2 返回 (0,), q1 返回 1e6), 违反约束的评估白白浪费, 也看不到各目标之间的权衡;
+这里把性能 (CADR / 温度偏差)、功耗和体积同时作为目标:
+- ConstrainedFitness / select_constrained: 用约束支配代替惩罚常数: 可行解优于不可行解, 不可行解之间违反量小者优,
+  可行解之间按 Pareto 支配和拥挤距离选择 (tools.selNSGA2)
+- CachedObjectives: 以修复后的基因为键的评估缓存, 跨代共享, 同一设计只评估一次
+- ParetoArchive: 历代可行非支配解的存档, 保存为 JSON, 下次运行时载入作为初始种群热启动
+- NSGA2Runner: 交叉变异算子与 GARunner 相同, 选择换成 NSGA-II
+"""
+import copy
+import json
+import os
+
+import numpy as np
+from deap import algorithms, base, tools
+
+from apmcm import profiling
+from apmcm.evolution import make_toolbox
+from apmcm.fileio import atomic_write
+from apmcm.surrogate import FitnessCache
+
+
+class ConstrainedFitness(base.Fitness):
+    """
+    带约束违反量 violation (0 为可行) 的适应度, 用 creator.create 指定 weights 后使用;
+    dominates 按约束支配规则比较, 供 selTournamentDCD 和 sortNondominated 使用
+    """
+
+    def __init__(self, values=(), violation=0.0):
+        super().__init__(values)
+        self.violation = violation
+
+    def dominates(self, other, obj=slice(None)):
+        if self.violation > 0 or other.violation > 0:
+            return self.violation < other.violation
+        return super().dominates(other, obj)
+
+    def __deepcopy__(self, memo):
+        copy_ = super().__deepcopy__(memo)
+        copy_.violation = self.violation
+        return copy_
+
+
+# 约束支配下的 NSGA-II 环境选择: 可行解按 selNSGA2 (非支配排序 + 拥挤距离), 不足 k 个时按违反量从小到大补充不可行解
+def select_constrained(individuals, k):
+    feasible = [ind for ind in individuals if ind.fitness.violation == 0]
+    if len(feasible) >= k:
+        return tools.selNSGA2(feasible, k)
+    infeasible = sorted((ind for ind in individuals if ind.fitness.violation > 0), key=lambda ind: ind.fitness.violation)
+    for ind in infeasible:
+        ind.fitness.crowding_dist = 0.0  # selTournamentDCD 需要该属性
+    return tools.selNSGA2(feasible, len(feasible)) + infeasible[:k - len(feasible)]
+
+
+class CachedObjectives:
+    """
+    objectives(genes) -> (目标矩阵 (n, 目标数), 约束违反量 (n,)); quantum: 缓存键的量化步长;
+    repair(genes) -> 修复后的基因矩阵, 修复结果写回个体 (先修复再取键, 整数基因取整后才能作为键)
+    调用时批量评估个体, 缓存中已有的设计和同一批中重复的设计不再评估, 返回真实评估的个数
+    """
+
+    def __init__(self, objectives, quantum, repair=None):
+        self.objectives = objectives
+        self.repair = repair
+        self.cache = FitnessCache(quantum)
+        self.evaluations = 0
+
+    def __call__(self, individuals):
+        if not individuals:
+            return 0
+        genes = np.array([list(ind) for ind in individuals], dtype=float)
+        if self.repair is not None:
+            genes = self.repair(genes)
+            for ind, row in zip(individuals, genes):
+                ind[:] = row.tolist()
+        results = [self.cache.get(row) for row in genes]
+        pending = {}  # 缓存键 -> 需要评估的个体序号 (第一个之后的都算缓存命中)
+        for i, result in enumerate(results):
+            if result is None:
+                pending.setdefault(self.cache.key(genes[i]), []).append(i)
+        groups = list(pending.values())
+        if groups:
+            values, violation = self.objectives(genes[[group[0] for group in groups]])
+            values = np.asarray(values, dtype=float).reshape(len(groups), -1)
+            for group, value, excess in zip(groups, values, np.asarray(violation, dtype=float)):
+                result = (tuple(value), float(excess))
+                self.cache.put(genes[group[0]], result)
+                self.cache.hits += len(group) - 1
+                for i in group:
+                    results[i] = result
+        for ind, (value, excess) in zip(individuals, results):
+            ind.fitness.values = value
+            ind.fitness.violation = excess
+        self.evaluations += len(groups)
+        return len(groups)
+
+    # 已知目标值的可行设计 (如载入的存档) 直接放入缓存
+    def prime(self, individuals):
+        for ind in individuals:
+            self.cache.put(np.asarray(ind, dtype=float), (ind.fitness.values, 0.0))
+
+    def report(self):
+        calls = self.evaluations + self.cache.hits
+        return (f"评估调用 {calls} 次: 真实评估 {self.evaluations} 次, 缓存命中 {self.cache.hits} 次 "
+                f"({self.cache.hits / max(calls, 1):.1%})")
+
+
+def _normalize(params):
+    return json.loads(json.dumps(params, sort_keys=True, default=str))
+
+
+class ParetoArchive:
+    """
+    历代可行非支配解的存档
+    max_size: 超过时按拥挤距离保留分布最均匀的 max_size 个 (None 时不限);
+    params: 模型参数 (房间、约束上限等, 字典), 与存档一起保存; 载入时参数不同 (compatible 为 False)
+    则只把基因用作热启动的初始个体, 目标值重新评估
+    """
+
+    def __init__(self, max_size=200, params=None):
+        self.max_size = max_size
+        self.params = _normalize(params or {})
+        self.members = []
+        self.compatible = True
+
+    def __len__(self):
+        return len(self.members)
+
+    def update(self, population):
+        seen = {tuple(ind) for ind in self.members}
+        candidates = list(self.members)
+        for ind in population:
+            if ind.fitness.valid and ind.fitness.violation == 0 and tuple(ind) not in seen:
+                seen.add(tuple(ind))
+                candidates.append(copy.deepcopy(ind))
+        if not candidates:
+            return
+        front = tools.sortNondominated(candidates, len(candidates), first_front_only=True)[0]
+        if self.max_size is not None and len(front) > self.max_size:
+            front = tools.selNSGA2(front, self.max_size)
+        self.members = front
+
+    # 热启动用的初始个体 (副本), 多于 n 个时按拥挤距离选取; 参数不一致时清除目标值以便重新评估
+    def warm_start(self, n):
+        members = self.members if len(self.members) <= n else tools.selNSGA2(self.members, n)
+        members = [copy.deepcopy(ind) for ind in members]
+        if not self.compatible:
+            for ind in members:
+                del ind.fitness.values
+        return members
+
+    # 目标值矩阵和基因矩阵
+    def arrays(self):
+        return (np.array([ind.fitness.values for ind in self.members]).reshape(len(self.members), -1),
+                np.array([list(ind) for ind in self.members], dtype=float))
+
+    def save(self, path):
+        values, genes = self.arrays()
+        weights = list(self.members[0].fitness.weights) if self.members else []
+        data = {"params": self.params, "weights": weights, "genes": genes.tolist(), "values": values.tolist()}
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        atomic_write(path, lambda f: json.dump(data, f, ensure_ascii=False), mode="w")
+
+    @classmethod
+    def load(cls, path, individual_class, max_size=200, params=None):
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        weights = tuple(individual_class().fitness.weights)
+        if data["weights"] and tuple(data["weights"]) != weights:
+            raise ValueError(f"存档的目标权重 {tuple(data['weights'])} 与个体类的 {weights} 不一致")
+        archive = cls(max_size, params)
+        archive.compatible = data["params"] == archive.params
+        for genes, values in zip(data["genes"], data["values"]):
+            ind = individual_class(genes)
+            ind.fitness.values = tuple(values)
+            archive.members.append(ind)
+        return archive
+
+
+def ea_nsga2(population, toolbox, cxpb, mutpb, ngen, evaluate, archive=None, verbose=__debug__):
+    """
+    NSGA-II 主循环 (同 DEAP 的 NSGA-II 示例): 拥挤距离锦标赛 -> varAnd 交叉变异 -> 评估 -> 父代与子代合并后环境选择
+    evaluate(individuals) -> 真实评估次数 (如 CachedObjectives); archive: ParetoArchive, 每代更新
+    """
+    logbook = tools.Logbook()
+    logbook.header = ["gen", "nevals", "feasible", "front"]
+
+    def record(gen, nevals):
+        if archive is not None:
+            archive.update(population)
+        feasible = sum(ind.fitness.violation == 0 for ind in population)
+        front = len(archive) if archive is not None else len(tools.sortNondominated(population, len(population), True)[0])
+        logbook.record(gen=gen, nevals=nevals, feasible=feasible, front=front)
+        if verbose:
+            print(logbook.stream)
+
+    profile = profiling.active()  # 启用了 --profile 时每代分阶段计时
+    if profile is not None:
+        profile.start()
+    nevals = evaluate([ind for ind in population if not ind.fitness.valid])
+    if profile is not None:
+        profile.lap("ea_nsga2;evaluate")
+        profile.count("evaluations", nevals)
+    population[:] = toolbox.select(population, len(population))  # 计算拥挤距离
+    record(0, nevals)
+
+    for gen in range(1, ngen + 1):
+        if profile is not None:
+            profile.start()
+        offspring = tools.selTournamentDCD(population, len(population))
+        offspring = algorithms.varAnd(offspring, toolbox, cxpb, mutpb)
+        if profile is not None:
+            profile.lap("ea_nsga2;select+vary")
+        nevals = evaluate([ind for ind in offspring if not ind.fitness.valid])
+        if profile is not None:
+            profile.lap("ea_nsga2;evaluate")
+            profile.count("evaluations", nevals)
+        population[:] = toolbox.select(population + offspring, len(population))
+        if profile is not None:
+            profile.lap("ea_nsga2;survival")
+        record(gen, nevals)
+        if profile is not None:
+            profile.lap("ea_nsga2;archive+logbook")
+
+    return population, logbook
+
+
+class NSGA2Runner:
+    """
+    多目标遗传算法运行器, 参数含义与 GARunner 相同; individual_class 的适应度需为 ConstrainedFitness 的子类
+    objectives(genes) -> (目标矩阵, 约束违反量); quantum / repair: 见 CachedObjectives;
+    archive: ParetoArchive (如 ParetoArchive.load 载入的旧存档), 其中的个体作为初始种群的一部分 (热启动),
+    参数一致时其目标值直接放入缓存; pop_size 需为 4 的倍数 (selTournamentDCD 的要求)
+    """
+
+    def __init__(self, individual_class, attributes, objectives, quantum, repair=None,
+                 pop_size=100, cxpb=0.7, mutpb=0.2, ngen=50, archive=None):
+        if pop_size % 4:
+            raise ValueError(f"pop_size 需为 4 的倍数, 当前为 {pop_size}")
+        self.toolbox = make_toolbox(individual_class, attributes)
+        self.toolbox.register("select", select_constrained)
+        self.evaluation = CachedObjectives(objectives, quantum, repair)
+        self.archive = archive if archive is not None else ParetoArchive()
+        if self.archive.compatible:
+            self.evaluation.prime(self.archive.members)
+        self.pop_size = pop_size
+        self.cxpb = cxpb
+        self.mutpb = mutpb
+        self.ngen = ngen
+        self.logbook = None
+
+    def run(self, population=None, verbose=True):
+        if population is None:
+            population = self.archive.warm_start(self.pop_size)
+            population += self.toolbox.population(n=self.pop_size - len(population))
+        population, self.logbook = ea_nsga2(population, self.toolbox, self.cxpb, self.mutpb, self.ngen,
+                                            self.evaluation, self.archive, verbose)
+        return population, self.logbook
+
+    def report(self):
+        return (f"共运行 {len(self.logbook) - 1} 代, Pareto 存档 {len(self.archive)} 个设计; "
+                + self.evaluation.report())
@@ -0,0 +1,253 @@
+"""
+两层嵌套网格: 设备周围的细网格块 + 整个房间的粗网格
+设备影响场只在设备附近有陡峭的梯度, 均匀网格要么设备附近分辨率不够, 要么整个房间都被过度加密。
+NestedSolver 在覆盖设备的长方体区域内放一块 ratio 倍加密的细网格, 粗网格按大步长 dt 推进,
+细网格在每个粗步内推进 substeps 个小步 (Berger-Oliger 子循环):
+- 细网格外围半个粗网格间距宽的一层为虚拟层, 每个小步开始时由粗网格在空间 (三线性) 和时间 (线性) 上插值得到
+- 细网格覆盖的粗网格点取对应粗控制体内细网格点的平均值 (限制)
+- 交界面守恒: 与细网格相邻的粗网格点, 把粗网格在交界面上的扩散通量替换为细网格通量的时间、面积平均 (回流修正),
+  粗细两侧穿过交界面的量严格相等
+ratio 为奇数时粗控制体的面恰好与细网格的面重合, 因此要求 ratio 为奇数
+"""
+import numpy as np
+
+from apmcm.solver import FieldSolver, apply_dirichlet
+from apmcm.source_field import influence_field
+
+
+class DeviceSource:
+    """
+    设备源/汇项的描述: kind 为源项类 (RelaxationSource / ConstantSource / DecaySink),
+    position / radius 为设备位置和作用半径, args 为源项的其余参数 (目标值、强度、衰减系数)
+    build(grid) 在给定网格 (Grid 或 Patch) 上生成源项, 粗细两层各自按本层坐标计算影响场
+    """
+
+    def __init__(self, kind, position, radius, *args):
+        self.kind = kind
+        self.position = tuple(position)
+        self.radius = radius
+        self.args = args
+
+    def build(self, grid):
+        return self.kind(grid.influence(self.position, self.radius), *self.args)
+
+
+class Patch:
+    """
+    粗网格 grid 上的加密块, box 为 ((i0, i1), (j0, j1), (k0, k1)) 粗网格点的闭区间, ratio 为加密倍数
+    提供与 Grid 相同的 x, y, z, dx, dy, dz, shape, dtype 和 influence, 可直接交给 FieldSolver
+    """
+
+    def __init__(self, grid, box, ratio):
+        self.box = tuple(tuple(int(i) for i in bounds) for bounds in box)
+        self.ratio = ratio
+        self.indexing = "ij"
+        self.dtype = grid.dtype
+        self.slices = tuple(slice(lo, hi + 1) for lo, hi in self.box)  # 粗网格中对应的区域
+        spacing = (grid.dx, grid.dy, grid.dz)
+        self.dx, self.dy, self.dz = (h / ratio for h in spacing)
+        axes = [lo * h + np.arange((hi - lo) * ratio + 1) * (h / ratio) for (lo, hi), h in zip(self.box, spacing)]
+        self.x, self.y, self.z = (axis.astype(self.dtype) for axis in axes)
+        self.shape = tuple(len(axis) for axis in axes)
+        self.size = tuple(float(axis[-1] - axis[0]) for axis in axes)
+
+    def influence(self, position, radius):
+        return influence_field(self.x, self.y, self.z, position, radius, dtype=self.dtype)
+
+
+# 覆盖各设备 position ± extent (米, None 时为 3 倍作用半径) 的粗网格点范围, 每个方向至少包含一个被覆盖的粗网格点
+def patch_box(grid, devices, extent=None):
+    box = []
+    for axis, (n, h) in enumerate(zip(grid.shape, (grid.dx, grid.dy, grid.dz))):
+        lo = min(d.position[axis] - (3 * d.radius if extent is None else extent) for d in devices)
+        hi = max(d.position[axis] + (3 * d.radius if extent is None else extent) for d in devices)
+        i0 = max(0, int(np.floor(lo / h)))
+        i1 = min(n - 1, int(np.ceil(hi / h)))
+        if i1 - i0 < 2:
+            i0, i1 = max(0, min(i0, n - 3)), min(n - 1, max(i1, 2))
+        box.append((i0, i1))
+    return tuple(box)
+
+
+def _interpolation_matrix(coarse_shape, ratio, index, dtype):
+    """
+    细网格点由粗网格块三线性插值的稀疏矩阵 (点数 × 粗网格块点数), index 为细网格点的下标 (np.nonzero 的结果)
+    乘以粗网格块展平后的向量即得到这些点的插值; 需要 scipy, 只在构造嵌套网格时导入
+    """
+    from scipy import sparse
+
+    count = len(index[0])
+    corners = np.zeros((count, 1), dtype=np.intp)
+    weights = np.ones((count, 1))
+    for m, n in zip(index, coarse_shape):
+        lo = np.minimum(m // ratio, n - 2)
+        w = (m - lo * ratio) / ratio
+        corners = (corners[:, :, None] * n + (lo[:, None] + np.arange(2))[:, None, :]).reshape(count, -1)
+        weights = (weights[:, :, None] * np.stack([1 - w, w], axis=1)[:, None, :]).reshape(count, -1)
+    rows = np.repeat(np.arange(count), corners.shape[1])
+    return sparse.csr_matrix((weights.ravel().astype(dtype), (rows, corners.ravel())),
+                             shape=(count, int(np.prod(coarse_shape))))
+
+
+class NestedSolver:
+    """
+    两层嵌套网格扩散求解器 (显式欧拉)
+    grid: 粗网格 (indexing="ij"); diffusivity / initial / boundary / clamp 与 FieldSolver 相同;
+    devices: DeviceSource 列表; dt: 粗网格时间步长; ratio: 空间加密倍数 (奇数);
+    substeps: 每个粗步内细网格的小步数, 默认等于 ratio; extent: 加密块在设备位置两侧的范围 (米),
+    None 时取各设备作用半径的 3 倍 (3 倍半径以外影响场已不到 1.2%); box: 直接指定加密块的粗网格点范围 (给出时忽略 extent)
+    field 为粗网格场 (被覆盖的点已取细网格的平均值), fine 为细网格场
+    """
+
+    def __init__(self, grid, diffusivity, initial, devices, boundary=None, clamp=None, dt=0.1, ratio=3,
+                 substeps=None, extent=None, box=None):
+        if grid.indexing != "ij":
+            raise ValueError("嵌套网格要求粗网格 indexing='ij'")
+        if ratio < 3 or ratio % 2 == 0:
+            raise ValueError(f"加密倍数 ratio 须为不小于 3 的奇数, 实际为 {ratio}")
+        self.grid = grid
+        self.devices = list(devices)
+        self.dt = dt
+        self.ratio = ratio
+        self.substeps = ratio if substeps is None else substeps
+        self.patch = Patch(grid, box if box is not None else patch_box(grid, self.devices, extent), ratio)
+        self.coarse = FieldSolver(grid, diffusivity, initial, boundary=boundary,
+                                  sources=[d.build(grid) for d in self.devices], clamp=clamp, dt=dt)
+        self._block_shape = tuple(hi - lo + 1 for lo, hi in self.patch.box)  # 与加密块对应的粗网格点数
+        full = _interpolation_matrix(self._block_shape, ratio, np.indices(self.patch.shape).reshape(3, -1),
+                                     grid.dtype)
+        initial_fine = (full @ self.coarse.field[self.patch.slices].ravel()).reshape(self.patch.shape)
+        self.fine_solver = FieldSolver(self.patch, diffusivity, initial_fine,
+                                       sources=[d.build(self.patch) for d in self.devices], clamp=clamp,
+                                       dt=dt / self.substeps)
+        self.diffusivity = diffusivity
+        self.steps = 0
+
+        # 细网格的虚拟层: 各方向上距加密块边界不足半个粗网格间距的点, 只对这些点做插值
+        half = (ratio + 1) // 2
+        owned = tuple(slice(half, n - half) for n in self.patch.shape)
+        ghost = np.ones(self.patch.shape, dtype=bool)
+        ghost[owned] = False
+        self._ghost = np.flatnonzero(ghost)
+        self._prolong = _interpolation_matrix(self._block_shape, ratio, np.nonzero(ghost), grid.dtype)
+        self._owned = owned
+        self._half = half
+        self._restrict()
+
+    @property
+    def field(self):
+        return self.coarse.field
+
+    @property
+    def fine(self):
+        return self.fine_solver.field
+
+    @property
+    def time(self):
+        return self.steps * self.dt
+
+    # 粗网格块 (与加密块对应的粗网格点) 三线性插值到细网格的虚拟层
+    def _interpolate(self, block):
+        return self._prolong @ block.ravel()
+
+    # 被覆盖的粗网格点取其控制体内 ratio³ 个细网格点的平均值
+    def _restrict(self):
+        r = self.ratio
+        inner = self.fine[self._owned]
+        n = tuple(s // r for s in inner.shape)
+        average = inner.reshape(n[0], r, n[1], r, n[2], r).mean(axis=(1, 3, 5))
+        (i0, i1), (j0, j1), (k0, k1) = self.patch.box
+        self.coarse.field[i0 + 1:i1, j0 + 1:j1, k0 + 1:k1] = average
+
+    # 粗网格交界面 (与被覆盖区域相邻的六个面) 上的法向扩散通量 D * du/dn, 指向 +x/+y/+z
+    def _coarse_fluxes(self, field):
+        (i0, i1), (j0, j1), (k0, k1) = self.patch.box
+        D, g = self.diffusivity, self.grid
+        inner_j, inner_k, inner_i = slice(j0 + 1, j1), slice(k0 + 1, k1), slice(i0 + 1, i1)
+        return [
+            D * (field[i0 + 1, inner_j, inner_k] - field[i0, inner_j, inner_k]) / g.dx,
+            D * (field[i1, inner_j, inner_k] - field[i1 - 1, inner_j, inner_k]) / g.dx,
+            D * (field[inner_i, j0 + 1, inner_k] - field[inner_i, j0, inner_k]) / g.dy,
+            D * (field[inner_i, j1, inner_k] - field[inner_i, j1 - 1, inner_k]) / g.dy,
+            D * (field[inner_i, inner_j, k0 + 1] - field[inner_i, inner_j, k0]) / g.dz,
+            D * (field[inner_i, inner_j, k1] - field[inner_i, inner_j, k1 - 1]) / g.dz,
+        ]
+
+    # 细网格穿过同一组交界面的通量, 在每个粗网格面覆盖的 ratio² 个细网格面上取平均
+    def _fine_fluxes(self, fine):
+        h, r, D, p = self._half, self.ratio, self.diffusivity, self.patch
+        nx, ny, nz = p.shape
+        o = self._owned
+
+        def face_average(values):
+            a, b = values.shape
+            return values.reshape(a // r, r, b // r, r).mean(axis=(1, 3))
+
+        return [
+            face_average(D * (fine[h, o[1], o[2]] - fine[h - 1, o[1], o[2]]) / p.dx),
+            face_average(D * (fine[nx - h, o[1], o[2]] - fine[nx - h - 1, o[1], o[2]]) / p.dx),
+            face_average(D * (fine[o[0], h, o[2]] - fine[o[0], h - 1, o[2]]) / p.dy),
+            face_average(D * (fine[o[0], ny - h, o[2]] - fine[o[0], ny - h - 1, o[2]]) / p.dy),
+            face_average(D * (fine[o[0], o[1], h] - fine[o[0], o[1], h - 1]) / p.dz),
+            face_average(D * (fine[o[0], o[1], nz - h] - fine[o[0], o[1], nz - h - 1]) / p.dz),
+        ]
+
+    # 回流修正: 与被覆盖区域相邻的粗网格点按 (细网格通量 - 粗网格通量) 补偿, 使穿过交界面的量与细网格一致
+    def _reflux(self, coarse_fluxes, fine_fluxes):
+        (i0, i1), (j0, j1), (k0, k1) = self.patch.box
+        g, dt, u = self.grid, self.dt, self.coarse.field
+        inner_j, inner_k, inner_i = slice(j0 + 1, j1), slice(k0 + 1, k1), slice(i0 + 1, i1)
+        faces = [
+            ((i0, inner_j, inner_k), 1, g.dx), ((i1, inner_j, inner_k), -1, g.dx),
+            ((inner_i, j0, inner_k), 1, g.dy), ((inner_i, j1, inner_k), -1, g.dy),
+            ((inner_i, inner_j, k0), 1, g.dz), ((inner_i, inner_j, k1), -1, g.dz),
+        ]
+        for (index, sign, h), coarse, fine in zip(faces, coarse_fluxes, fine_fluxes):
+            u[index] += sign * dt * (fine - coarse) / h
+
+    # 推进一个粗网格时间步 (细网格推进 substeps 个小步)
+    def step(self):
+        coarse, fine_solver = self.coarse, self.fine_solver
+        old = coarse.field[self.patch.slices].copy()
+        coarse_fluxes = self._coarse_fluxes(coarse.field)
+        coarse.step()
+        start, end = self._interpolate(old), self._interpolate(coarse.field[self.patch.slices])
+
+        fine_fluxes = None
+        for s in range(self.substeps):
+            theta = s / self.substeps
+            fine_solver.field.ravel()[self._ghost] = (1 - theta) * start + theta * end
+            fluxes = self._fine_fluxes(fine_solver.field)
+            fine_fluxes = fluxes if fine_fluxes is None else [a + b for a, b in zip(fine_fluxes, fluxes)]
+            fine_solver.step()
+        fine_solver.field.ravel()[self._ghost] = end
+
+        self._reflux(coarse_fluxes, [f / self.substeps for f in fine_fluxes])
+        self._restrict()
+        if coarse.clamp is not None:
+            np.clip(coarse.field, coarse.clamp[0], coarse.clamp[1], out=coarse.field)
+        if coarse.boundary is not None:
+            apply_dirichlet(coarse.field, coarse.boundary)
+        self.steps += 1
+
+    # 推进 steps 个粗网格时间步, 返回粗网格场
+    def run(self, steps):
+        for _ in range(steps):
+            self.step()
+        return self.field
+
+    def sample(self, x, y, z):
+        """
+        在一维坐标轴 x, y, z 组成的网格 (indexing="ij") 上取值: 加密块内取细网格, 其余取粗网格, 均为三线性插值
+        用于与均匀细网格的结果逐点比较
+        """
+        from scipy.interpolate import RegularGridInterpolator
+
+        points = np.stack(np.meshgrid(x, y, z, indexing="ij"), axis=-1)
+        g, p = self.grid, self.patch
+        values = RegularGridInterpolator((g.x, g.y, g.z), self.field)(points)
+        inside = np.ones(points.shape[:-1], dtype=bool)
+        for axis, coordinate in enumerate((p.x, p.y, p.z)):
+            inside &= (points[..., axis] >= coordinate[0]) & (points[..., axis] <= coordinate[-1])
+        values[inside] = RegularGridInterpolator((p.x, p.y, p.z), self.fine)(points[inside])
+        return values
@@ -0,0 +1,166 @@
+"""
+适应度评估的执行后端: serial (串行) / thread (线程池) / process (进程池)
+- Executor.map(func, items) 结果顺序与输入一致, 可直接注册为 DEAP 的 toolbox.map
+- Executor.map_rows(func, genes, *args) 把 (个体数, 基因数) 矩阵按行分块交给批量适应度函数, 再按原顺序拼接
+- Executor.share(array) 把网格数组放进共享内存, 子进程按名字挂载, 不必每个任务都重新 pickle 整个网格
+- 给定 seed 时, 每个任务的随机数种子由 (seed, 第几次 map, 任务序号) 派生, 与进程数和任务分配方式无关;
+  需要随机数的适应度函数应使用 task_rng() 而不是全局的 random / np.random (线程池中全局状态是共享的)
+进程池在支持 fork 的平台上用 fork 启动, 子进程直接继承脚本中的全局变量和适应度函数;
+其他平台 (Windows) 用 spawn 启动, 此时适应度函数需定义在可导入的模块中, 脚本主体需放在 if __name__ == "__main__" 下
+"""
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+BACKENDS = ("serial", "thread", "process")
+
+_local = threading.local()  # 当前任务的随机数生成器 (线程池中各线程互不干扰)
+_attached = {}  # 子进程中已挂载的共享内存, 按名字缓存
+
+
+# 由 seed 和任务编号派生的确定性种子 (SeedSequence 保证不同编号的随机数流相互独立)
+def task_seed(seed, *key):
+    return int(np.random.SeedSequence(seed, spawn_key=key).generate_state(1)[0])
+
+
+# 当前任务的 numpy 随机数生成器; 不在 Executor 任务中调用时返回全局生成器
+def task_rng():
+    return getattr(_local, "rng", None) or np.random.default_rng()
+
+
+class SharedArray:
+    """
+    numpy 数组的共享内存副本, pickle 时只传共享内存的名字、形状和类型
+    主进程中 array 就是共享内存上的数组; 子进程反序列化时按名字挂载 (每个进程只挂载一次)
+    """
+
+    def __init__(self, array):
+        array = np.asarray(array)
+        self._shm = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+        self.array = np.ndarray(array.shape, dtype=array.dtype, buffer=self._shm.buf)
+        self.array[...] = array
+        self._owner = True
+
+    def __getstate__(self):
+        return self._shm.name, self.array.shape, self.array.dtype.str
+
+    def __setstate__(self, state):
+        name, shape, dtype = state
+        if name not in _attached:
+            _attached[name] = shared_memory.SharedMemory(name=name)
+        self._shm = _attached[name]
+        self.array = np.ndarray(shape, dtype=dtype, buffer=self._shm.buf)
+        self._owner = False
+
+    def close(self):
+        if self._owner:
+            self.array = None
+            self._shm.close()
+            self._shm.unlink()
+            self._owner = False
+
+
+# 参数中的 SharedArray 换成它指向的数组
+def _resolve(args):
+    return [arg.array if isinstance(arg, SharedArray) else arg for arg in args]
+
+
+class _SeededTask:
+    """在调用 func 之前按任务序号设置随机数种子 (任务以 (序号, 参数) 的形式传入)"""
+
+    def __init__(self, func, seed, call):
+        self.func = func
+        self.seed = seed
+        self.call = call
+
+    def __call__(self, indexed):
+        index, item = indexed
+        _local.rng = np.random.default_rng(task_seed(self.seed, self.call, index))
+        try:
+            return self.func(item)
+        finally:
+            _local.rng = None
+
+
+class _RowTask:
+    """对一块基因矩阵调用批量适应度函数, 额外参数中的 SharedArray 在执行时才换成数组"""
+
+    def __init__(self, func, args):
+        self.func = func
+        self.args = args
+
+    def __call__(self, genes):
+        return np.asarray(self.func(genes, *_resolve(self.args)), dtype=float)
+
+
+class Executor:
+    """
+    backend: "serial" / "thread" / "process"; workers: 线程或进程数, 默认取 CPU 核数;
+    seed: 任务随机数种子的根, None 时不设置
+    线程池/进程池在第一次 map 时才创建, 用完调用 close() (或用 with 语句) 释放进程和共享内存
+    """
+
+    def __init__(self, backend="serial", workers=None, seed=None):
+        if backend not in BACKENDS:
+            raise ValueError(f"未知的执行后端: {backend}, 可选 {BACKENDS}")
+        self.backend = backend
+        self.workers = 1 if backend == "serial" else (workers or os.cpu_count() or 1)
+        self.seed = seed
+        self.calls = 0
+        self._pool = None
+        self._shared = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _get_pool(self):
+        if self._pool is None:
+            if self.backend == "thread":
+                self._pool = ThreadPoolExecutor(self.workers)
+            else:
+                method = "fork" if "fork" in multiprocessing.get_all_start_methods() else "spawn"
+                self._pool = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context(method))
+        return self._pool
+
+    # 进程池后端时把数组放进共享内存 (返回 SharedArray), 其他后端原样返回
+    def share(self, array):
+        if self.backend != "process":
+            return array
+        shared = SharedArray(array)
+        self._shared.append(shared)
+        return shared
+
+    def map(self, func, iterable):
+        items = list(iterable)
+        self.calls += 1
+        if self.seed is not None:
+            func = _SeededTask(func, self.seed, self.calls)
+            items = list(enumerate(items))
+        if self.backend == "serial" or len(items) <= 1:
+            return [func(item) for item in items]
+        chunksize = 1
+        if self.backend == "process":
+            chunksize = max(1, len(items) // (4 * self.workers))  # 每个进程分到约 4 块, 减少进程间通信次数
+        return list(self._get_pool().map(func, items, chunksize=chunksize))
+
+    # 按行分成 workers 块并行调用 func(genes_block, *args), 拼接成 (个体数,) 或 (个体数, 目标数) 的适应度
+    def map_rows(self, func, genes, *args):
+        genes = np.asarray(genes, dtype=float)
+        blocks = np.array_split(genes, min(self.workers, max(len(genes), 1)))
+        results = self.map(_RowTask(func, args), blocks)
+        return np.concatenate(results)
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+        for shared in self._shared:
+            shared.close()
+        self._shared = []
@@ -0,0 +1,147 @@
+"""
+求解器和优化器热点路径的轻量计时 (python -m apmcm run <子命令> --profile)
+模拟变慢时需要知道时间花在源项、拉普拉斯、限幅、墙面边界还是适应度评估上:
+- Profiler: 按阶段累计调用次数、耗时和 (可选, tracemalloc) 阶段内临时分配的峰值字节数, 另有计数器 (步数、评估次数)
+- FieldSolver / CoupledSolver 的每一步按 源项 -> 扩散 -> 汇项 -> 限幅 -> 边界 分段计时;
+  ea_simple / ea_nsga2 每一代按 选择与交叉变异 -> 评估 -> 统计 分段计时; instrument 包装单独的目标函数 (如 PSO)
+- enable / disable / active: 全局的当前 Profiler, 求解器和运行器在创建时读取;
+  未启用时求解器每一步只多几次 None 判断, 目标函数不做任何包装
+- report: 扁平汇总表; write_folded: 折叠栈格式 (与 py-spy record --format raw 相同), 可用 flamegraph.pl / speedscope 查看
+本模块只使用标准库
+"""
+import contextlib
+import time
+import tracemalloc
+
+_active = None
+_started_tracing = False
+
+
+class Profiler:
+    """
+    track_memory: 为 True 时用 tracemalloc 记录各阶段内临时分配的峰值字节数 (需先 tracemalloc.start(), enable 会处理)
+    阶段名用 ";" 分隔层级, 如 "FieldSolver.step;diffusion", 与折叠栈格式一致
+    """
+
+    def __init__(self, track_memory=False):
+        self.track_memory = track_memory
+        self.phases = {}  # 阶段名 -> [调用次数, 秒, 字节]
+        self.counters = {}
+        self.started = time.perf_counter()
+        self._last = self.started
+        self._memory = 0
+
+    def add(self, name, seconds, nbytes=0):
+        record = self.phases.get(name)
+        if record is None:
+            record = self.phases[name] = [0, 0.0, 0]
+        record[0] += 1
+        record[1] += seconds
+        record[2] += nbytes
+
+    def count(self, name, n=1):
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    # 分段计时: start() 之后每次 lap(name) 把距上一次 start / lap 的时间记到阶段 name 上
+    def start(self):
+        if self.track_memory:
+            self._memory = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+        self._last = time.perf_counter()
+
+    def lap(self, name):
+        now = time.perf_counter()
+        nbytes = 0
+        if self.track_memory:
+            current, peak = tracemalloc.get_traced_memory()
+            nbytes = max(peak - self._memory, 0)
+            self._memory = current
+            tracemalloc.reset_peak()
+        self.add(name, now - self._last, nbytes)
+        self._last = time.perf_counter()  # 不把记录本身的开销算进下一个阶段
+
+    # 较粗的阶段 (如设备影响场的计算), 用 with profiler.phase(name): ...
+    @contextlib.contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - start)
+
+    def elapsed(self):
+        return time.perf_counter() - self.started
+
+    # 扁平汇总表, 按总耗时降序; 占比相对于启用以来的总时长, 计数器的速率按各阶段的合计耗时计算 (不含导入、出图等)
+    def report(self):
+        elapsed = self.elapsed()
+        timed = sum(seconds for _, seconds, _ in self.phases.values()) or elapsed
+        lines = [f"{'阶段':<44}{'调用次数':>10}{'总耗时 (秒)':>12}{'每次 (毫秒)':>12}{'占比':>8}"
+                 + (f"{'临时分配 (MB)':>14}" if self.track_memory else "")]
+        for name, (calls, seconds, nbytes) in sorted(self.phases.items(), key=lambda item: -item[1][1]):
+            line = (f"{name:<44}{calls:>10}{seconds:>12.3f}{seconds / calls * 1e3:>12.3f}"
+                    f"{seconds / elapsed:>8.1%}")
+            if self.track_memory:
+                line += f"{nbytes / 2 ** 20:>14.1f}"
+            lines.append(line)
+        for name, n in self.counters.items():
+            lines.append(f"{name}: {n} 次, {n / timed:.1f} 次/秒")
+        lines.append(f"各阶段合计 {timed:.3f} 秒, 总时长 {elapsed:.3f} 秒")
+        return "\n".join(lines)
+
+    # 折叠栈格式: 每行 "root;阶段;子阶段 微秒数"
+    def write_folded(self, path, root=None):
+        with open(path, "w", encoding="utf-8") as f:
+            for name, (_, seconds, _) in self.phases.items():
+                stack = name if root is None else f"{root};{name}"
+                f.write(f"{stack} {max(int(seconds * 1e6), 1)}\n")
+
+
+# 启用新的全局 Profiler; track_memory 时如果 tracemalloc 还没有启动则启动它, disable 时再停止
+def enable(track_memory=False):
+    global _active, _started_tracing
+    _started_tracing = track_memory and not tracemalloc.is_tracing()
+    if _started_tracing:
+        tracemalloc.start()
+    _active = Profiler(track_memory)
+    return _active
+
+
+def disable():
+    global _active, _started_tracing
+    profiler, _active = _active, None
+    if _started_tracing:
+        tracemalloc.stop()
+        _started_tracing = False
+    return profiler
+
+
+def active():
+    return _active
+
+
+# 未启用时不计时
+def phase(name):
+    return contextlib.nullcontext() if _active is None else _active.phase(name)
+
+
+class _Timed:
+    """instrument 的包装 (类而不是闭包, 可以 pickle; 在进程池的子进程中调用时计时留在子进程里, 不计入)"""
+
+    def __init__(self, func, name, counter, profiler):
+        self.func, self.name, self.counter, self.profiler = func, name, counter, profiler
+
+    def __call__(self, *args, **kwargs):
+        start = time.perf_counter()
+        result = self.func(*args, **kwargs)
+        self.profiler.add(self.name, time.perf_counter() - start)
+        if self.counter is not None:
+            self.profiler.count(self.counter)
+        return result
+
+
+def instrument(func, name, counter=None):
+    """启用时返回按调用计时 (并在计数器 counter 上加一) 的 func, 未启用时原样返回 func"""
+    if _active is None:
+        return func
+    return _Timed(func, name, counter, _active)
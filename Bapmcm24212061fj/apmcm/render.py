@@ -0,0 +1,165 @@
+"""
+模拟结果的无界面批量出图
+各问脚本在模拟结束后直接用 pyplot 出图并阻塞在 plt.show(), 三维散点图把全部 3.2 万 ~ 12 万个格点都画出来,
+求解器变快之后出图反而占了大部分时间。这里把出图拆成单独的阶段:
+- save_fields / load_fields: 脚本把各时刻的场 (以及影响场等静态数组) 保存为 NPZ, 出图时只读文件, 不重新模拟
+- scatter_stride: 按点数上限自适应确定三维散点的抽稀步长 (代替 q1_Initial_state_code.py 中手动设置的 slice_density)
+- SliceFigure / ScatterFigure: 同一组图的各个时刻复用同一个 figure 和 colorbar, 只替换数据
+- render: 使用 Agg 后端, 在多个进程中并行渲染整组图
+matplotlib 只在出图时导入
+"""
+import os
+
+import numpy as np
+
+from apmcm.fileio import atomic_write
+from apmcm.parallel import Executor
+
+
+# 保存各时刻的场: snapshots 为 [(t, field), ...], arrays 为额外的静态数组 (如 influence=影响场)
+def save_fields(path, grid, snapshots, **arrays):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    atomic_write(path, lambda f: np.savez_compressed(
+        f, x=grid.x, y=grid.y, z=grid.z, indexing=np.array(grid.indexing),
+        times=np.array([t for t, _ in snapshots], dtype=float),
+        fields=np.stack([field for _, field in snapshots]), **arrays))
+
+
+def load_fields(path):
+    with np.load(path) as data:
+        fields = {name: data[name] for name in data.files}
+    fields["indexing"] = str(fields["indexing"])
+    return fields
+
+
+# 使抽稀后的格点数不超过 max_points 的最小步长 (三个方向相同)
+def scatter_stride(shape, max_points):
+    stride = 1
+    while np.prod([-(-n // stride) for n in shape]) > max_points:
+        stride += 1
+    return stride
+
+
+class SliceFigure:
+    """
+    中间高度横截面的等高线图; x, y 为坐标轴, indexing 为场的网格索引方式 ("ij" 时按 .T 转置作图)
+    draw 可对不同时刻的场反复调用, 只替换等高线并更新 colorbar
+    """
+
+    def __init__(self, x, y, indexing="ij", levels=50, cmap="coolwarm", vmin=None, vmax=None, label=None,
+                 figsize=None):
+        import matplotlib.pyplot as plt
+        self.x, self.y, self.indexing = x, y, indexing
+        self.style = {"levels": levels, "cmap": cmap, "vmin": vmin, "vmax": vmax}
+        self.label = label
+        self.fig, self.ax = plt.subplots(figsize=figsize)
+        self.ax.set_xlabel("Width/m")
+        self.ax.set_ylabel("Length/m")
+        self.contour = None
+        self.colorbar = None
+
+    def draw(self, field, title):
+        section = field[:, :, field.shape[2] // 2]
+        if self.indexing == "ij":
+            section = section.T
+        self.ax.set_title(title)
+        if self.contour is not None:
+            self.contour.remove()
+        self.contour = self.ax.contourf(self.x, self.y, section, **self.style)
+        if self.colorbar is None:
+            self.colorbar = self.fig.colorbar(self.contour, ax=self.ax, label=self.label)
+            self.fig.tight_layout()
+        else:
+            self.colorbar.update_normal(self.contour)
+
+
+class ScatterFigure:
+    """
+    三维散点图, 格点按 scatter_stride 抽稀到不超过 max_points 个, 点的面积按步长的平方放大, 整体观感与画全部格点时接近;
+    坐标只在第一次作图时生成, 之后的时刻只替换颜色数组 (set_array); label 为 None 时不画 colorbar
+    """
+
+    def __init__(self, x, y, z, indexing="ij", max_points=8000, cmap="coolwarm", alpha=0.5, s=1.5,
+                 vmin=None, vmax=None, label=None, figsize=None):
+        import matplotlib.pyplot as plt
+        self.stride = scatter_stride((len(x), len(y), len(z)), max_points)
+        step = slice(None, None, self.stride)
+        self.coords = [axis.ravel() for axis in np.meshgrid(x[step], y[step], z[step], indexing=indexing)]
+        self.style = {"cmap": cmap, "alpha": alpha, "s": s * self.stride ** 2}
+        self.vmin, self.vmax = vmin, vmax
+        self.label = label
+        self.fig = plt.figure(figsize=figsize)
+        self.ax = self.fig.add_subplot(projection="3d")
+        self.ax.set_xlabel("Width/m")
+        self.ax.set_ylabel("Length/m")
+        self.ax.set_zlabel("Height/m")
+        self.points = None
+
+    def draw(self, field, title):
+        step = slice(None, None, self.stride)
+        values = field[step, step, step].ravel()
+        vmin = values.min() if self.vmin is None else self.vmin
+        vmax = values.max() if self.vmax is None else self.vmax
+        self.ax.set_title(title)
+        if self.points is None:
+            self.points = self.ax.scatter(*self.coords, c=values, vmin=vmin, vmax=vmax, **self.style)
+            if self.label is not None:
+                self.fig.colorbar(self.points, ax=self.ax, shrink=0.5, pad=0.1, label=self.label)
+            self.fig.tight_layout()
+        else:
+            self.points.set_array(values)
+            self.points.set_clim(vmin, vmax)  # colorbar 随之更新
+
+
+def render_job(job, output_dir, dpi=None):
+    """
+    渲染一组图, 返回写出的文件路径; job 为字典:
+    fields: save_fields 保存的文件; kind: "slice" 或 "scatter"; name / title: 文件名和标题, 可含 {t} (时刻, 秒);
+    array: 作图的数组, 默认 "fields" (逐时刻), 也可以是保存时给出的静态数组名 (如 "influence", 只画一次, 按各时刻的文件名保存);
+    clip: (下限, 上限), 作图前截断; 其余键作为 SliceFigure / ScatterFigure 的参数
+    """
+    import matplotlib
+    matplotlib.use("Agg")  # 在导入 pyplot 之前切换, spawn 启动的工作进程不继承主进程的后端设置
+    import matplotlib.pyplot as plt
+    job = dict(job)
+    data = load_fields(job.pop("fields"))
+    kind, name, title = job.pop("kind"), job.pop("name"), job.pop("title", "")
+    array, clip = job.pop("array", "fields"), job.pop("clip", None)
+    if kind == "slice":
+        figure = SliceFigure(data["x"], data["y"], data["indexing"], **job)
+    elif kind == "scatter":
+        figure = ScatterFigure(data["x"], data["y"], data["z"], data["indexing"], **job)
+    else:
+        raise ValueError(f"未知的图类型: {kind}, 可选 ('slice', 'scatter')")
+    written = []
+    for i, t in enumerate(data["times"]):
+        t = float(np.round(t, 6))  # 与脚本中 f"{times}s" 的写法一致, 如 30.0s
+        if array == "fields" or i == 0:
+            field = data["fields"][i] if array == "fields" else data[array]
+            figure.draw(field if clip is None else np.clip(field, *clip), title.format(t=t))
+        path = os.path.join(output_dir, name.format(t=t))
+        figure.fig.savefig(path, dpi=dpi)
+        written.append(path)
+    plt.close(figure.fig)
+    return written
+
+
+def _render_task(task):
+    return render_job(*task)
+
+
+def render(jobs, output_dir, workers=None, dpi=None):
+    """
+    用 Agg 后端渲染全部 jobs (见 render_job), 每组图交给一个工作进程; fields 文件不存在的组跳过并提示
+    workers: 进程数, 默认取 CPU 核数, 1 时在当前进程中串行渲染; 返回写出的文件路径
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    tasks = []
+    for job in jobs:
+        if os.path.exists(job["fields"]):
+            tasks.append((job, output_dir, dpi))
+        else:
+            print(f"跳过 {job['name']}: 找不到 {job['fields']}")
+    with Executor("serial" if workers == 1 else "process", workers) as executor:
+        results = executor.map(_render_task, tasks)
+    return [path for written in results for path in written]
@@ -0,0 +1,242 @@
+"""
+三维标量场(温度、PM2.5 浓度、湿度)的显式欧拉扩散求解器
+第一、二、三问的模拟都是 "源项 -> 扩散 -> 汇项 -> 限幅 -> 墙面边界" 的同一套循环,
+这里把它整理为 FieldSolver, 各问脚本只需给出网格、扩散系数、源/汇项和边界即可
+"""
+import numpy as np
+
+from apmcm import profiling
+from apmcm.integrators import check_cfl, make_integrator
+from apmcm.source_field import influence_field
+from apmcm.spectral import SpectralDiffusion
+from apmcm.stencil import laplacian_3d, laplacian_workspace
+
+
+class Grid:
+    """
+    长方体房间的均匀网格
+    size 为房间尺寸 (宽, 长, 高), shape 为网格点数 (nx, ny, nz);
+    indexing 与 np.meshgrid 的含义相同, 只影响设备影响场的坐标排列
+    ("xy" 只用于与第一问原脚本的默认网格保持一致, 要求 nx == ny, 否则场和影响场的形状对不上);
+    dtype 为坐标轴、影响场和求解器中场的浮点类型, np.float32 时全程单精度 (内存和带宽减半);
+    各问场景中单精度相对双精度的偏差和加速比见 benchmarks/bench_precision.py
+    """
+
+    def __init__(self, size, shape, indexing="ij", dtype=float):
+        if indexing == "xy" and shape[0] != shape[1]:
+            raise ValueError(f"indexing='xy' 时影响场的前两维为 (ny, nx), 要求 nx == ny, 实际为 {shape}")
+        self.size = tuple(size)
+        self.shape = tuple(shape)
+        self.indexing = indexing
+        self.dtype = np.dtype(dtype)
+        x = np.linspace(0, size[0], shape[0])
+        y = np.linspace(0, size[1], shape[1])
+        z = np.linspace(0, size[2], shape[2])
+        # 网格间距按双精度计算并保存为 Python 浮点数, 参与单精度运算时不会把数组提升为双精度
+        self.dx = float(x[1] - x[0])
+        self.dy = float(y[1] - y[0])
+        self.dz = float(z[1] - z[0])
+        self.x, self.y, self.z = x.astype(self.dtype), y.astype(self.dtype), z.astype(self.dtype)
+
+    # sparse=True 时返回可广播的一维坐标 (形状如 (nx, 1, 1)), 不生成完整的三维坐标网格
+    def meshgrid(self, sparse=False):
+        return np.meshgrid(self.x, self.y, self.z, indexing=self.indexing, sparse=sparse)
+
+    # 位于 position、作用半径为 radius 的设备影响场(带缓存)
+    def influence(self, position, radius):
+        with profiling.phase("Grid.influence"):
+            return influence_field(self.x, self.y, self.z, position, radius, indexing=self.indexing, dtype=self.dtype)
+
+
+class RelaxationSource:
+    """
+    向目标值弛豫的源项 (空调): field += I * (target - field) * dt, 在扩散之前作用
+    """
+    stage = "before"
+
+    def __init__(self, influence, target):
+        self.influence = influence
+        self.target = target
+        self._dt = None
+        self._buffer = None
+
+    def apply(self, field, dt):
+        if dt != self._dt:
+            self._weight = self.influence * dt
+            self._dt = dt
+        if self._buffer is None or self._buffer.shape != field.shape:
+            self._buffer = np.empty_like(field)
+        np.subtract(self.target, field, out=self._buffer)
+        self._buffer *= self._weight
+        field += self._buffer
+
+    # 不含扩散时源项方程的精确解, 供 solve_at 的算子分裂使用
+    def integrate(self, field, h):
+        field -= self.target
+        field *= np.exp(-self.influence * h)
+        field += self.target
+
+
+class ConstantSource:
+    """
+    恒定强度的源项 (加湿器): field += I * strength * dt, 在扩散之前作用
+    """
+    stage = "before"
+
+    def __init__(self, influence, strength):
+        self.influence = influence
+        self.strength = strength
+        self._dt = None
+
+    def apply(self, field, dt):
+        if dt != self._dt:
+            self._increment = self.influence * self.strength * dt
+            self._dt = dt
+        field += self._increment
+
+    def integrate(self, field, h):
+        self.apply(field, h)
+
+
+class DecaySink:
+    """
+    按比例衰减的汇项 (净化器): field *= 1 - k * I * dt, 在扩散之后作用
+    """
+    stage = "after"
+
+    def __init__(self, influence, k):
+        self.influence = influence
+        self.k = k
+        self._dt = None
+
+    def apply(self, field, dt):
+        if dt != self._dt:
+            self._decay = 1 - self.k * self.influence * dt
+            self._dt = dt
+        field *= self._decay
+
+    def integrate(self, field, h):
+        field *= np.exp(-self.k * self.influence * h)
+
+
+# 墙面(六个外表面)设为固定值
+def apply_dirichlet(field, value):
+    field[..., 0, :, :] = field[..., -1, :, :] = value
+    field[..., :, 0, :] = field[..., :, -1, :] = value
+    field[..., :, :, 0] = field[..., :, :, -1] = value
+
+
+# 去掉墙面的内部格点: 墙面固定为边界值时永远达不到目标值, 统计达标占比时应排除
+def interior(field):
+    return field[..., 1:-1, 1:-1, 1:-1]
+
+
+class FieldSolver:
+    """
+    扩散求解器
+    grid: Grid 网格; diffusivity: 扩散系数 (平方米/秒); initial: 初始值(标量或数组);
+    boundary: 墙面固定值, None 表示不处理边界; sources: 源/汇项列表;
+    clamp: (下限, 上限) 限幅, None 表示不限幅; dt: 时间步长 (秒);
+    scheme: 扩散项的时间积分格式, "explicit"(显式欧拉, 会检查 CFL 条件) / "cn" / "adi" (隐式, 无条件稳定)
+    源/汇项始终显式处理, 隐式格式下大步长的精度还受源项时间尺度 (I * dt) 限制
+    """
+
+    def __init__(self, grid, diffusivity, initial, boundary=None, sources=(), clamp=None, dt=0.1,
+                 scheme="explicit"):
+        self.grid = grid
+        self.diffusivity = diffusivity
+        self.boundary = boundary
+        self.sources = list(sources)
+        self.clamp = clamp
+        self.dt = dt
+        self.scheme = scheme
+        self.initial = initial
+        self.field = np.array(np.broadcast_to(initial, grid.shape), dtype=grid.dtype)
+        self.steps = 0  # 已经推进的步数
+        self._jumped = 0.0  # solve_at 直接跳过的时间 (秒)
+        self.profiler = profiling.active()  # 启用了 --profile 时分阶段计时, 否则为 None
+        if scheme == "explicit":
+            check_cfl(diffusivity, dt, grid.dx, grid.dy, grid.dz)
+            # 预先分配拉普拉斯项和工作缓冲区, 迭代过程中不再申请内存
+            self._laplacian = np.zeros_like(self.field)
+            self._work = laplacian_workspace(self.field.shape, self.field.dtype)
+        else:
+            walls = self.field.copy()
+            if boundary is not None:
+                apply_dirichlet(walls, boundary)
+            self._integrator = make_integrator(scheme, walls, diffusivity, dt, grid.dx, grid.dy, grid.dz)
+
+    @property
+    def time(self):
+        return self.steps * self.dt + self._jumped
+
+    # 推进一个时间步
+    def step(self):
+        field, dt, grid, profile = self.field, self.dt, self.grid, self.profiler
+        if profile is not None:
+            profile.start()
+        for source in self.sources:
+            if source.stage == "before":
+                source.apply(field, dt)
+        if profile is not None:
+            profile.lap("FieldSolver.step;sources")
+        if self.scheme == "explicit":
+            laplacian_3d(field, self._laplacian, grid.dx, grid.dy, grid.dz, self._work)
+            self._laplacian *= self.diffusivity * dt
+            field += self._laplacian
+        else:
+            self._integrator.step(field)
+        if profile is not None:
+            profile.lap("FieldSolver.step;diffusion")
+        for source in self.sources:
+            if source.stage == "after":
+                source.apply(field, dt)
+        if profile is not None:
+            profile.lap("FieldSolver.step;sinks")
+        if self.clamp is not None:
+            np.clip(field, self.clamp[0], self.clamp[1], out=field)
+        if profile is not None:
+            profile.lap("FieldSolver.step;clamp")
+        if self.boundary is not None:
+            apply_dirichlet(field, self.boundary)
+        if profile is not None:
+            profile.lap("FieldSolver.step;boundary")
+            profile.count("steps")
+        self.steps += 1
+
+    # 从检查点恢复: 场、已推进的步数和 solve_at 跳过的时间
+    def restore(self, field, steps, jumped=0.0):
+        self.field[...] = field
+        self.steps = steps
+        self._jumped = jumped
+
+    # 推进 steps 个时间步, 返回当前场
+    def run(self, steps):
+        for _ in range(steps):
+            self.step()
+        return self.field
+
+    def solve_at(self, times, split_dt=1.0):
+        """
+        用 DST 谱方法直接求出各输出时刻 (秒, 模拟开始起算) 的场, 返回 [(t, 场的副本), ...]
+        没有源/汇项时每个时刻只需一次变换; 有源/汇项时按 split_dt 做 Strang 算子分裂:
+        源/汇项精确积分半步 -> 精确扩散一步 -> 源/汇项精确积分半步 -> 限幅 -> 墙面边界
+        要求扩散系数为常数、boundary 为标量
+        """
+        grid = self.grid
+        spectral = SpectralDiffusion(grid.shape, self.diffusivity, grid.dx, grid.dy, grid.dz, self.boundary)
+        snapshots = []
+        for target in sorted(times):
+            while self.time < target - 1e-9:
+                h = target - self.time if not self.sources else min(split_dt, target - self.time)
+                for source in self.sources:
+                    source.integrate(self.field, h / 2)
+                spectral.propagate(self.field, h)
+                for source in self.sources:
+                    source.integrate(self.field, h / 2)
+                if self.clamp is not None:
+                    np.clip(self.field, self.clamp[0], self.clamp[1], out=self.field)
+                apply_dirichlet(self.field, self.boundary)
+                self._jumped += h
+            snapshots.append((target, self.field.copy()))
+        return snapshots
@@ -0,0 +1,63 @@
+"""
+设备影响场(高斯核)的计算与缓存
+空调、净化器、加湿器在模拟过程中位置和作用半径都不变, 影响场只需要按
+(网格, 位置, 半径) 计算一次, 结果保存在有容量上限的 LRU 缓存里, 供各问的扩散模拟共用
+高斯核 exp(-d²/2r²) 可分解为三个方向一维指数的乘积, 影响场由三个一维因子广播相乘得到,
+不再生成完整的 X, Y, Z 三维坐标网格, 计算过程中的额外内存只与 nx + ny + nz 成正比
+"""
+from functools import lru_cache
+
+import numpy as np
+
+CACHE_SIZE = 32  # 最多缓存的影响场个数
+
+
+# 设备影响区域函数 (基于高斯分布); x, y, z 可以是完整网格, 也可以是 np.ogrid / sparse meshgrid 的可广播坐标
+def gaussian_influence(x, y, z, position, radius):
+    dist = np.sqrt((x - position[0]) ** 2 + (y - position[1]) ** 2 + (z - position[2]) ** 2)
+    return np.exp(-dist ** 2 / (2 * radius ** 2))
+
+
+def influence_factors(x, y, z, position, radius, indexing="ij"):
+    """
+    影响场的三个一维因子, 已按 indexing 整形为可相互广播的 (n, 1, 1) / (1, n, 1) / (1, 1, n),
+    三者相乘即为完整影响场; 计算类型与坐标轴相同
+    """
+    two_r2 = 2 * radius ** 2
+    ex, ey, ez = (np.exp(-(axis - p) ** 2 / two_r2) for axis, p in zip((x, y, z), position))
+    if indexing == "xy":
+        ex, ey = ey, ex  # meshgrid 默认网格的第 0 维对应 y
+    return ex[:, None, None], ey[None, :, None], ez[None, None, :]
+
+
+# 网格坐标轴转换为可哈希的缓存键
+def _axis_key(axis):
+    return np.ascontiguousarray(axis, dtype=float).tobytes()
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _cached_field(x_key, y_key, z_key, position, radius, indexing, dtype):
+    x, y, z = (np.frombuffer(key).astype(dtype) for key in (x_key, y_key, z_key))
+    ex, ey, ez = influence_factors(x, y, z, position, radius, indexing)
+    field = ex * ey * ez  # 先得到 (n0, n1, 1) 的平面再沿第 2 维扩展, 只生成一个完整大小的数组
+    field.setflags(write=False)  # 缓存中的数组被多处共用, 禁止原地修改
+    return field
+
+
+def influence_field(x, y, z, position, radius, indexing="ij", dtype=float):
+    """
+    返回一维坐标轴 x, y, z 组成的网格上, 位于 position、作用半径为 radius 的设备影响场
+    indexing 与 np.meshgrid 的含义相同; dtype 为计算和返回的浮点类型 (float32 时全程单精度);
+    相同参数的重复调用直接命中缓存, 返回只读数组
+    """
+    position = tuple(float(p) for p in position)
+    return _cached_field(_axis_key(x), _axis_key(y), _axis_key(z), position, float(radius), indexing,
+                         np.dtype(dtype).str)
+
+
+def cache_info():
+    return _cached_field.cache_info()
+
+
+def clear_cache():
+    _cached_field.cache_clear()
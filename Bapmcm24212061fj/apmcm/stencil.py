@@ -0,0 +1,113 @@
+"""
+三维七点拉普拉斯算子
+原脚本每一步用 6 次 np.roll 生成整场副本再求和, 随后又把边界覆盖掉;
+这里只在内部点上用切片计算, 结果写入预先分配的 out 和工作缓冲区, 迭代过程中不再申请内存。
+安装了 numba 或 numexpr 时自动使用加速版本, 否则使用纯 NumPy 实现。
+"""
+import numpy as np
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+try:
+    import numexpr
+except ImportError:
+    numexpr = None
+
+# 默认后端: numba > numexpr > numpy
+if numba is not None:
+    BACKEND = "numba"
+elif numexpr is not None:
+    BACKEND = "numexpr"
+else:
+    BACKEND = "numpy"
+
+
+# 为 laplacian_3d 分配工作缓冲区 (2 个内部点大小的数组)
+def laplacian_workspace(shape, dtype=float):
+    inner = tuple(shape[:-3]) + tuple(n - 2 for n in shape[-3:])
+    return np.empty((2,) + inner, dtype=dtype)
+
+
+def _laplacian_numpy(field, out, dx, dy, dz, work):
+    if work is None:
+        work = laplacian_workspace(field.shape, field.dtype)
+    if field.ndim > 3:
+        # 带批量维度时逐个三维场计算, 每次的工作集更小, 缓存命中率更高
+        for index in np.ndindex(field.shape[:-3]):
+            _laplacian_numpy(field[index], out[index], dx, dy, dz, work[(slice(None),) + index])
+        return
+    two_c, tmp = work[0], work[1]
+    inner = (Ellipsis, slice(1, -1), slice(1, -1), slice(1, -1))
+    o = out[inner]
+    np.multiply(field[inner], 2, out=two_c)
+    # x 方向的变化
+    np.add(field[..., :-2, 1:-1, 1:-1], field[..., 2:, 1:-1, 1:-1], out=o)
+    o -= two_c
+    o /= dx ** 2
+    # y 方向的变化
+    np.add(field[..., 1:-1, :-2, 1:-1], field[..., 1:-1, 2:, 1:-1], out=tmp)
+    tmp -= two_c
+    tmp /= dy ** 2
+    o += tmp
+    # z 方向的变化
+    np.add(field[..., 1:-1, 1:-1, :-2], field[..., 1:-1, 1:-1, 2:], out=tmp)
+    tmp -= two_c
+    tmp /= dz ** 2
+    o += tmp
+
+
+def _laplacian_numexpr(field, out, dx, dy, dz, work):
+    if work is None:
+        work = laplacian_workspace(field.shape, field.dtype)
+    tmp = work[0]
+    numexpr.evaluate(
+        "(xm + xp - 2 * c) / dx2 + (ym + yp - 2 * c) / dy2 + (zm + zp - 2 * c) / dz2",
+        local_dict={
+            "c": field[..., 1:-1, 1:-1, 1:-1],
+            "xm": field[..., :-2, 1:-1, 1:-1], "xp": field[..., 2:, 1:-1, 1:-1],
+            "ym": field[..., 1:-1, :-2, 1:-1], "yp": field[..., 1:-1, 2:, 1:-1],
+            "zm": field[..., 1:-1, 1:-1, :-2], "zp": field[..., 1:-1, 1:-1, 2:],
+            "dx2": field.dtype.type(dx ** 2), "dy2": field.dtype.type(dy ** 2), "dz2": field.dtype.type(dz ** 2),
+        },
+        out=tmp, casting="same_kind",
+    )
+    out[..., 1:-1, 1:-1, 1:-1] = tmp
+
+
+if numba is not None:
+    @numba.njit(cache=True)
+    def _laplacian_kernel(f, o, dx2, dy2, dz2):
+        nb, nx, ny, nz = f.shape
+        for b in range(nb):
+            for i in range(1, nx - 1):
+                for j in range(1, ny - 1):
+                    for k in range(1, nz - 1):
+                        c2 = 2 * f[b, i, j, k]
+                        o[b, i, j, k] = ((f[b, i - 1, j, k] + f[b, i + 1, j, k] - c2) / dx2
+                                         + (f[b, i, j - 1, k] + f[b, i, j + 1, k] - c2) / dy2
+                                         + (f[b, i, j, k - 1] + f[b, i, j, k + 1] - c2) / dz2)
+
+
+def _laplacian_numba(field, out, dx, dy, dz, work):
+    if not (field.flags.c_contiguous and out.flags.c_contiguous):
+        return _laplacian_numpy(field, out, dx, dy, dz, work)
+    shape4 = (-1,) + field.shape[-3:]
+    scalar = field.dtype.type  # 系数与场同类型, 单精度场不会在核函数里提升为双精度
+    _laplacian_kernel(field.reshape(shape4), out.reshape(shape4), scalar(dx ** 2), scalar(dy ** 2), scalar(dz ** 2))
+
+
+_BACKENDS = {"numpy": _laplacian_numpy, "numexpr": _laplacian_numexpr, "numba": _laplacian_numba}
+
+
+def laplacian_3d(field, out, dx, dy, dz, work=None, backend=None):
+    """
+    计算 field 最后三个维度上的七点拉普拉斯, 结果写入 out 并返回 out
+    只更新内部点, out 的边界保持原值(模拟中边界每步都会被边界条件覆盖);
+    field 可以带前导的批量维度, 例如 (3, nx, ny, nz)。
+    work 为 laplacian_workspace 分配的缓冲区, 不传入时每次调用临时分配。
+    """
+    _BACKENDS[backend or BACKEND](field, out, dx, dy, dz, work)
+    return out
@@ -0,0 +1,140 @@
+"""
+三维扩散模拟的提前终止
+q1_lines.py 的零维模型在温度越过目标值时立即停止, 而三维模拟总是跑满全部时间步;
+EarlyTermination 每隔 check_every 步检查一次停止条件, 满足即结束, 并记录达标时间和跳过的步数
+- MeanReached: 场的平均值达到目标值
+- FractionReached: 达到目标值 (在容差内) 的格点占比不低于 fraction; 墙面固定为边界值时只统计内部格点
+- SteadyState: 两次检查之间场的最大变化率低于 eps (单位/秒), 即已接近稳态
+各条件的 name 用于 CoupledSolver (按名称取物理量的场), FieldSolver 时为 None
+"""
+import numpy as np
+
+from apmcm.solver import interior
+
+
+def _field(solver, name):
+    return solver.field if name is None else solver[name]
+
+
+# 墙面是否固定为边界值 (FieldSolver 的 boundary, CoupledSolver 中对应物理量的 boundary)
+def _fixed_walls(solver, name):
+    if name is None:
+        return solver.boundary is not None
+    return solver.species[solver.names.index(name)].boundary is not None
+
+
+# above=True 表示 value >= target - tol 算达标 (如升温、加湿), False 表示 value <= target + tol (如降温、净化),
+# None 表示与目标值相差不超过 tol
+def _reached(value, target, tol, above):
+    if above is None:
+        return np.abs(value - target) <= tol
+    if above:
+        return value >= target - tol
+    return value <= target + tol
+
+
+class MeanReached:
+    def __init__(self, target, tol=0.0, above=True, name=None):
+        self.target = target
+        self.tol = tol
+        self.above = above
+        self.name = name
+
+    def reset(self):
+        pass
+
+    def update(self, solver):
+        self.value = float(_field(solver, self.name).mean())
+        return bool(_reached(self.value, self.target, self.tol, self.above))
+
+    def describe(self):
+        return f"平均值 {self.value:.4g} 达到目标值 {self.target}"
+
+
+class FractionReached:
+    def __init__(self, target, fraction, tol=0.0, above=True, name=None):
+        self.target = target
+        self.fraction = fraction
+        self.tol = tol
+        self.above = above
+        self.name = name
+
+    def reset(self):
+        pass
+
+    def update(self, solver):
+        field = _field(solver, self.name)
+        self.interior = _fixed_walls(solver, self.name)
+        if self.interior:
+            field = interior(field)
+        self.value = np.count_nonzero(_reached(field, self.target, self.tol, self.above)) / field.size
+        return self.value >= self.fraction
+
+    def describe(self):
+        cells = "内部格点" if self.interior else "格点"
+        return f"{self.value:.2%} 的{cells}达到目标值 {self.target} (要求 {self.fraction:.0%})"
+
+
+class SteadyState:
+    def __init__(self, eps, name=None):
+        self.eps = eps
+        self.name = name
+        self.reset()
+
+    def reset(self):
+        self._previous = None
+        self._time = None
+        self.value = np.inf
+
+    def update(self, solver):
+        field = _field(solver, self.name)
+        if self._previous is not None and solver.time > self._time:
+            self.value = float(np.abs(field - self._previous).max()) / (solver.time - self._time)
+        self._previous, self._time = field.copy(), solver.time
+        return self.value < self.eps
+
+    def describe(self):
+        return f"最大变化率 {self.value:.3g}/s 低于 {self.eps}"
+
+
+class EarlyTermination:
+    """
+    conditions: 停止条件列表; check_every: 每隔多少步检查一次 (达标时间的分辨率为 check_every * dt);
+    require: "any" 任一条件满足即停止, "all" 全部条件同时满足才停止
+    run 结束后 time 为停止时刻 (未提前停止时为 None), reason 为满足的条件说明, skipped 为跳过的步数
+    """
+
+    def __init__(self, conditions, check_every=100, require="any"):
+        if require not in ("any", "all"):
+            raise ValueError(f"未知的 require: {require}, 可选 ('any', 'all')")
+        self.conditions = list(conditions)
+        self.check_every = check_every
+        self.require = require
+        self.time = None
+        self.reason = None
+        self.skipped = 0
+
+    def _check(self, solver):
+        met = [condition for condition in self.conditions if condition.update(solver)]
+        if met and (self.require == "any" or len(met) == len(self.conditions)):
+            self.time = solver.time
+            self.reason = "; ".join(condition.describe() for condition in met)
+        return self.reason is not None
+
+    # 推进求解器最多 steps 步, 满足停止条件时提前结束 (推进前也检查一次), 返回当前场
+    def run(self, solver, steps):
+        for condition in self.conditions:
+            condition.reset()
+        self.time = self.reason = None
+        end = solver.steps + steps
+        stopped = self._check(solver)
+        while not stopped and solver.steps < end:
+            solver.run(min(self.check_every, end - solver.steps))
+            stopped = self._check(solver)
+        self.skipped = end - solver.steps
+        return solver.field if hasattr(solver, "field") else solver.fields
+
+    def report(self):
+        if self.reason is None:
+            return "模拟时间内未满足停止条件"
+        return f"{self.time:g} s 时提前停止: {self.reason}, 跳过 {self.skipped} 步"
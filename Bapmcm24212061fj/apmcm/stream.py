@@ -0,0 +1,154 @@
+"""
+扩散模拟的流式输出
+- iter_snapshots / stream: 生成器, 按给定时刻依次产出 (t, field), 不保存也不重算历史场
+- SnapshotStore: 只追加的分块快照存储, 每 chunk 帧一个 .npy 文件 (预分配后按内存映射写入), 读取时同样按内存映射打开
+- RunningStats: 每个时刻就地计算平均值、最小值、最大值和达到目标值的格点占比, 只保留这些标量的时间序列
+"""
+import json
+import os
+
+import numpy as np
+
+from apmcm.fileio import atomic_write
+from apmcm.solver import interior
+
+
+# 每隔 every 秒直到 until 秒的输出时刻 (按整数倍计算, 避免浮点累加误差), 并入 extra 中的时刻;
+# 给出 dt 时按步数 round(t / dt) 去重 (0.1 * 3 与 0.3 落在同一步), 同一步优先保留 extra 中的时刻
+def output_times(every, until, extra=(), dt=None):
+    count = int(round(until / every))
+    if dt is None:
+        return sorted({every * k for k in range(1, count + 1)} | set(extra))
+    by_step = {int(round(every * k / dt)): every * k for k in range(1, count + 1)}
+    by_step.update((int(round(t / dt)), t) for t in extra)
+    return [by_step[step] for step in sorted(by_step)]
+
+
+def iter_snapshots(solver, times):
+    """
+    按升序推进求解器到 times 中的各时刻 (秒, 模拟开始起算), 依次产出 (t, field)
+    field 是求解器内部数组本身, 继续迭代后会被覆盖, 需要保留时请复制
+    """
+    for t in times:
+        target = int(round(t / solver.dt))
+        if target < solver.steps:
+            raise ValueError(f"求解器已推进到 {solver.time} 秒, 无法输出更早的 {t} 秒")
+        solver.run(target - solver.steps)
+        yield t, solver.field
+
+
+# 在 iter_snapshots 的基础上把每个时刻写入 store、更新 stats (均可为 None)
+def stream(solver, times, store=None, stats=None):
+    for t, field in iter_snapshots(solver, times):
+        if store is not None:
+            store.append(t, field)
+        if stats is not None:
+            stats.update(t, field)
+        yield t, field
+    if store is not None:
+        store.flush()
+
+
+class SnapshotStore:
+    """
+    只追加的分块快照存储
+    directory: 存储目录; shape / dtype: 每帧的形状和类型; chunk: 每个分块文件的帧数
+    目录中 chunk_00000.npy ... 为 (chunk, *shape) 的数组, index.json 记录帧数和各帧时刻;
+    SnapshotStore.open(directory) 以只读方式打开已有的存储, store[i] 返回第 i 帧的内存映射
+    """
+
+    def __init__(self, directory, shape, dtype=float, chunk=16):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.shape = tuple(shape)
+        self.dtype = np.dtype(dtype)
+        self.chunk = chunk
+        self.times = []
+        self._writer = None  # 当前正在写入的分块
+        self._readers = {}
+
+    @classmethod
+    def open(cls, directory):
+        with open(os.path.join(directory, "index.json"), encoding="utf-8") as f:
+            index = json.load(f)
+        store = cls(directory, index["shape"], index["dtype"], index["chunk"])
+        store.times = index["times"]
+        return store
+
+    def _chunk_path(self, number):
+        return os.path.join(self.directory, f"chunk_{number:05d}.npy")
+
+    def __len__(self):
+        return len(self.times)
+
+    def append(self, t, field):
+        number, offset = divmod(len(self.times), self.chunk)
+        if offset == 0:
+            if self._writer is not None:
+                self._writer.flush()
+            self._writer = np.lib.format.open_memmap(self._chunk_path(number), mode="w+", dtype=self.dtype,
+                                                     shape=(self.chunk,) + self.shape)
+        self._writer[offset] = field
+        self.times.append(float(t))
+
+    # 把已写入的帧落盘并更新索引 (stream 结束时自动调用)
+    def flush(self):
+        if self._writer is not None:
+            self._writer.flush()
+        index = {"shape": list(self.shape), "dtype": self.dtype.str, "chunk": self.chunk, "times": self.times}
+        atomic_write(os.path.join(self.directory, "index.json"), lambda f: json.dump(index, f), mode="w")
+
+    def __getitem__(self, i):
+        number, offset = divmod(range(len(self))[i], self.chunk)
+        if number not in self._readers:
+            self._readers[number] = np.load(self._chunk_path(number), mmap_mode="r")
+        return self._readers[number][offset]
+
+    def __iter__(self):
+        for i, t in enumerate(self.times):
+            yield t, self[i]
+
+
+class RunningStats:
+    """
+    各时刻场的统计量, 逐帧更新
+    target: 目标值, None 时不统计达标占比; above: True 表示 field >= target - tol 算达标
+    (如加湿到目标湿度), False 表示 field <= target + tol 算达标 (如夏季降温);
+    interior: 为 True 时达标占比只统计内部格点 (墙面固定为边界值、永远达不到目标值时使用)
+    """
+
+    def __init__(self, target=None, above=True, tol=0.0, interior=False):
+        self.target = target
+        self.above = above
+        self.tol = tol
+        self.interior = interior
+        self.times = []
+        self.mean = []
+        self.min = []
+        self.max = []
+        self.reached = []  # 达到目标值的格点占比
+        self.overall_min = np.inf
+        self.overall_max = -np.inf
+
+    def update(self, t, field):
+        self.times.append(t)
+        self.mean.append(float(field.mean()))
+        self.min.append(float(field.min()))
+        self.max.append(float(field.max()))
+        self.overall_min = min(self.overall_min, self.min[-1])
+        self.overall_max = max(self.overall_max, self.max[-1])
+        if self.target is not None:
+            if self.interior:
+                field = interior(field)
+            if self.above:
+                count = np.count_nonzero(field >= self.target - self.tol)
+            else:
+                count = np.count_nonzero(field <= self.target + self.tol)
+            self.reached.append(count / field.size)
+
+    # 达标占比第一次不低于 fraction 的时刻, 没有达到时返回 None
+    def time_to_fraction(self, fraction):
+        for t, reached in zip(self.times, self.reached):
+            if reached >= fraction:
+                return t
+        return None
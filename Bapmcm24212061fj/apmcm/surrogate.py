@@ -0,0 +1,180 @@
+"""
+遗传算法适应度评估的缓存与代理模型预筛选
+- 个体先修复 (repair) 再按量化容差取键, 交叉变异后重复或几乎重复的个体直接命中缓存
+- 可选的 RBF 代理模型用已做过的真实评估拟合适应度, 预测明显较差的后代不再做完整的网格计算
+代理模型需要 scipy (scipy.interpolate.RBFInterpolator), 只在启用时导入
+"""
+import numpy as np
+
+
+class FitnessCache:
+    """
+    以量化后的基因为键的适应度缓存
+    quantum: 每个基因的量化步长 (标量或与基因等长的序列), 落在同一格内的基因视为同一设计
+    """
+
+    def __init__(self, quantum):
+        self.quantum = np.asarray(quantum, dtype=float)
+        self.table = {}
+        self.hits = 0
+
+    def key(self, genome):
+        return tuple(np.round(np.asarray(genome, dtype=float) / self.quantum).astype(np.int64))
+
+    def get(self, genome):
+        value = self.table.get(self.key(genome))
+        if value is not None:
+            self.hits += 1
+        return value
+
+    def put(self, genome, value):
+        self.table[self.key(genome)] = value
+
+
+class RBFSurrogate:
+    """
+    RBF 插值代理模型 (最小化问题)
+    min_samples: 真实评估达到该数量后才启用; refit_every: 每新增多少个真实样本重新拟合一次;
+    quantile: 预测值比已评估适应度的该分位数还差时, 判定为不值得做真实评估;
+    penalty: 不小于该值的适应度视为约束惩罚, 不参与拟合
+    """
+
+    def __init__(self, min_samples=50, refit_every=25, quantile=0.75, neighbors=50, penalty=1e6):
+        self.min_samples = min_samples
+        self.refit_every = refit_every
+        self.quantile = quantile
+        self.neighbors = neighbors
+        self.penalty = penalty
+        self.samples = []
+        self.values = []
+        self._model = None
+        self._pending = 0
+
+    def add(self, genome, value):
+        if value >= self.penalty:
+            return
+        self.samples.append(np.asarray(genome, dtype=float))
+        self.values.append(value)
+        self._pending += 1
+
+    def _fit(self):
+        from scipy.interpolate import RBFInterpolator
+        X = np.array(self.samples)
+        self._scale = X.std(axis=0) + 1e-12  # 各基因量纲不同, 先标准化
+        # multiquadric 核只需要常数多项式项, 局部邻域内某个基因取值全部相同时也不会奇异
+        self._model = RBFInterpolator(X / self._scale, np.array(self.values),
+                                      neighbors=min(self.neighbors, len(X)), smoothing=1e-6,
+                                      kernel="multiquadric", epsilon=1.0, degree=0)
+        self._threshold = np.quantile(self.values, self.quantile)
+        self._pending = 0
+
+    # 返回预测值; 代理模型尚未启用或预测值不差于阈值时返回 None (需要真实评估)
+    def screen(self, genome):
+        if len(self.samples) < self.min_samples:
+            return None
+        if self._model is None or self._pending >= self.refit_every:
+            self._fit()
+        predicted = float(self._model(np.asarray(genome, dtype=float)[None, :] / self._scale)[0])
+        if predicted > self._threshold:
+            return predicted
+        return None
+
+
+class ScreenedEvaluation:
+    """
+    包装单目标适应度函数 evaluate(individual) -> (fitness,), 依次经过: 修复 -> 缓存 -> 代理预筛选 -> 真实评估
+    evaluations / cache.hits / screened 分别记录真实评估、缓存命中和被代理模型筛除的次数
+    """
+
+    def __init__(self, evaluate, quantum, repair=None, surrogate=None):
+        self.evaluate = evaluate
+        self.repair = repair
+        self.cache = FitnessCache(quantum)
+        self.surrogate = surrogate
+        self.evaluations = 0
+        self.screened = 0
+
+    def __call__(self, individual):
+        if self.repair is not None:
+            self.repair(individual)
+        cached = self.cache.get(individual)
+        if cached is not None:
+            return cached
+        if self.surrogate is not None:
+            predicted = self.surrogate.screen(individual)
+            if predicted is not None:
+                self.screened += 1
+                return predicted,
+        fitness = self.evaluate(individual)
+        self.evaluations += 1
+        self.cache.put(individual, fitness)
+        if self.surrogate is not None:
+            self.surrogate.add(individual, fitness[0])
+        return fitness
+
+    # 依次查缓存和代理模型, 结果填入 results; 返回需要真实评估的分组 (同一缓存键的序号, 第一个之后的都算缓存命中)
+    def _lookup(self, genomes, results):
+        pending = {}
+        for i, individual in enumerate(genomes):
+            cached = self.cache.get(individual)
+            if cached is not None:
+                results[i] = cached
+                continue
+            key = self.cache.key(individual)
+            if key in pending:
+                self.cache.hits += 1
+                pending[key].append(i)
+                continue
+            if self.surrogate is not None:
+                predicted = self.surrogate.screen(individual)
+                if predicted is not None:
+                    self.screened += 1
+                    results[i] = predicted,
+                    continue
+            pending[key] = [i]
+        return list(pending.values())
+
+    def _store(self, genomes, groups, fitnesses, results):
+        for group, fitness in zip(groups, fitnesses):
+            self.evaluations += 1
+            self.cache.put(genomes[group[0]], fitness)
+            if self.surrogate is not None:
+                self.surrogate.add(genomes[group[0]], fitness[0])
+            for i in group:
+                results[i] = fitness
+
+    # 作为 DEAP 的 toolbox.map 使用: toolbox.register("map", evaluation.map, executor.map)
+    # 修复、缓存和代理预筛选都在主进程中按顺序完成, 只把需要真实评估的个体交给 map_function 并行计算,
+    # 同一批中重复的个体只评估一次, 因此结果与 map_function 使用多少个线程或进程无关
+    def map(self, map_function, evaluate, individuals):
+        individuals = list(individuals)
+        if self.repair is not None:
+            for individual in individuals:
+                self.repair(individual)
+        results = [None] * len(individuals)
+        groups = self._lookup(individuals, results)
+        fitnesses = map_function(self.evaluate, [individuals[group[0]] for group in groups])
+        self._store(individuals, groups, fitnesses, results)
+        return results
+
+    # 作为按种群整体评估的 batch_evaluate 使用: batch_evaluate=partial(evaluation.batch, population_evaluate)
+    # genes 是 evaluate_batch 修复后的基因矩阵; 缓存命中、同一批中重复和被代理模型筛除的行之外,
+    # 其余行组成一个矩阵一次交给 population_evaluate(genes) -> 适应度数组 (n,)
+    def batch(self, population_evaluate, genes):
+        genes = np.asarray(genes, dtype=float)
+        results = [None] * len(genes)
+        groups = self._lookup(genes, results)
+        if groups:
+            values = np.asarray(population_evaluate(genes[[group[0] for group in groups]]), dtype=float)
+            fitnesses = [tuple(row.tolist()) for row in values.reshape(len(groups), -1)]
+            self._store(genes, groups, fitnesses, results)
+        return np.array(results, dtype=float)
+
+    @property
+    def calls(self):
+        return self.evaluations + self.cache.hits + self.screened
+
+    def report(self):
+        saved = self.calls - self.evaluations
+        return (f"适应度调用 {self.calls} 次: 真实网格评估 {self.evaluations} 次, 缓存命中 {self.cache.hits} 次, "
+                f"代理模型筛除 {self.screened} 次, 共节省 {saved} 次 ({saved / max(self.calls, 1):.1%})")
@@ -0,0 +1,171 @@
+"""
+批量场景扫描
+比较夏季/冬季或不同设备位置时, 原来需要手动修改脚本里的开关逐个重新运行;
+run_sweep 接收一组场景 (每个场景是一个参数字典, 未给出的参数取 DEFAULTS), 把它们作为批量维度
+放进同一个 (物理量, 场景, nx, ny, nz) 数组, 用 CoupledSolver 一次推进, 按内存上限分块;
+返回每个场景一行的结果表: 各物理量的平均值、达标格点占比和达标时间
+"""
+import csv
+
+import numpy as np
+
+from apmcm.coupled import Species, CoupledSolver, humidity_diffusivity_from_temperature
+from apmcm.solver import RelaxationSource, DecaySink, ConstantSource, interior
+
+QUANTITIES = ("temperature", "pm25", "humidity")
+SEASONS = {"summer": 35, "winter": 5}  # 各季节的室外温度 (℃)
+
+# 场景参数的默认值, 与各问脚本一致
+DEFAULTS = {
+    # 温度 (q1_diffusion_times.py), t_outdoor 为 None 时按 season 取室外温度; 达标指与目标温度相差不超过 t_tol
+    "season": "summer", "t_outdoor": None, "t_ac_out": 24, "t_target": 24, "t_tol": 0.5,
+    "ac_position": (2.5, 4, 1.5), "ac_radius": 1, "thermal_diffusivity": 0.0000213,
+    # PM2.5 (q2_situation.py), 达标指浓度不超过 pm_target (GB 3095-2012 一级标准日均值 35 µg/m³)
+    "pm_init": 100, "pm_target": 35, "k_filter": 0.8,
+    "purifier_position": (2.5, 4, 0.8), "purifier_radius": 1, "pm_diffusivity": 5e-4,
+    # 湿度 (q3_hum_situation.py), 达标指湿度不低于 humidity_target;
+    # 同时模拟温度时扩散系数随温度场变化 (与 q4_situation.py 相同), 否则取常数 humidity_diffusivity
+    "humidity_init": 0.2, "humidity_target": 0.6, "humidifier_strength": 0.05,
+    "humidifier_position": (3.10, 3.45, 2.16), "humidifier_radius": 1.18, "humidity_diffusivity": 2.4e-5,
+}
+
+
+# 补全场景参数, 并检查参数名
+def resolve(scenario):
+    unknown = set(scenario) - set(DEFAULTS)
+    if unknown:
+        raise ValueError(f"未知的场景参数: {sorted(unknown)}")
+    params = dict(DEFAULTS, **scenario)
+    if params["t_outdoor"] is None:
+        params["t_outdoor"] = SEASONS[params["season"]]
+    return params
+
+
+# 每个场景占用的内存 (字节) 的估计: 每个物理量的场、拉普拉斯项和工作区 4 份, 影响场及源项缓存 3 份,
+# 另加逐点扩散系数和达标判断的临时数组
+def scenario_bytes(grid, quantities=QUANTITIES):
+    return int(np.prod(grid.shape)) * grid.dtype.itemsize * (7 * len(quantities) + 3)
+
+
+class _Batch:
+    """一个分块内各场景的参数, 标量参数整理为 (场景, 1, 1, 1) 的数组"""
+
+    def __init__(self, grid, params):
+        self.grid = grid
+        self.params = params
+
+    def value(self, key):
+        return np.array([p[key] for p in self.params], dtype=self.grid.dtype).reshape(-1, 1, 1, 1)
+
+    # 墙面固定值, 形状 (场景, 1, 1), 与 field[..., 0, :, :] 等墙面切片对齐
+    def wall(self, key):
+        return self.value(key)[..., 0]
+
+    def influence(self, position, radius):
+        return np.stack([self.grid.influence(p[position], p[radius]) for p in self.params])
+
+    def species(self, quantities):
+        species = []
+        if "temperature" in quantities:
+            species.append(Species("temperature", self.value("thermal_diffusivity"), self.value("t_outdoor"),
+                                   boundary=self.wall("t_outdoor"),
+                                   sources=[RelaxationSource(self.influence("ac_position", "ac_radius"),
+                                                             self.value("t_ac_out"))]))
+        if "pm25" in quantities:
+            species.append(Species("pm25", self.value("pm_diffusivity"), self.value("pm_init"),
+                                   boundary=self.wall("pm_init"),
+                                   sources=[DecaySink(self.influence("purifier_position", "purifier_radius"),
+                                                      self.value("k_filter"))],
+                                   clamp=(0, self.value("pm_init"))))
+        if "humidity" in quantities:
+            diffusivity = (humidity_diffusivity_from_temperature if "temperature" in quantities
+                           else self.value("humidity_diffusivity"))
+            species.append(Species("humidity", diffusivity, self.value("humidity_init"),
+                                   boundary=self.wall("humidity_init"),
+                                   sources=[ConstantSource(self.influence("humidifier_position", "humidifier_radius"),
+                                                           self.value("humidifier_strength"))],
+                                   clamp=(self.value("humidity_init"), self.value("humidity_target"))))
+        return species
+
+    # 各场景达到目标值的内部格点占比, 返回形状 (场景,); 墙面固定为初始值、永远达不到目标值, 不参与统计
+    def coverage(self, name, field):
+        if name == "temperature":
+            target, tol = self.value("t_target"), self.value("t_tol")
+            heating = self.value("t_outdoor") < target
+            reached = np.where(heating, field >= target - tol, field <= target + tol)
+        elif name == "pm25":
+            reached = field <= self.value("pm_target")
+        else:
+            reached = field >= self.value("humidity_target")
+        return interior(reached).mean(axis=(-3, -2, -1))
+
+
+def run_sweep(scenarios, grid, seconds, dt=0.1, quantities=QUANTITIES, check_every=100, goal=0.9,
+              memory_limit=512 * 2 ** 20):
+    """
+    scenarios: 场景参数字典的列表; grid: Grid 网格; seconds: 模拟时长 (秒); quantities: 模拟的物理量;
+    每 check_every 步统计一次各场景的达标内部格点占比, 第一次不低于 goal 的时刻为达标时间 (没有达到为 None);
+    memory_limit: 一次推进的场景所占内存上限 (字节), 超过时分块依次推进
+    返回结果表: 每个场景一行 (字典), 包含场景编号、给出的参数、各物理量的平均值、达标占比和达标时间
+    """
+    quantities = [name for name in QUANTITIES if name in quantities]  # 温度须在湿度之前
+    params = [resolve(scenario) for scenario in scenarios]
+    chunk = max(1, memory_limit // scenario_bytes(grid, quantities))
+    steps = int(round(seconds / dt))
+    rows = []
+    for start in range(0, len(params), chunk):
+        batch = _Batch(grid, params[start:start + chunk])
+        solver = CoupledSolver(grid, batch.species(quantities), dt=dt, batch=len(batch.params))
+        reached_at = np.full((len(quantities), len(batch.params)), np.nan)
+
+        def check():
+            for i, name in enumerate(quantities):
+                newly = np.isnan(reached_at[i]) & (batch.coverage(name, solver[name]) >= goal)
+                reached_at[i][newly] = solver.time
+
+        check()
+        while solver.steps < steps:
+            solver.run(min(check_every, steps - solver.steps))
+            check()
+
+        means = {name: solver[name].mean(axis=(-3, -2, -1)) for name in quantities}
+        coverages = {name: batch.coverage(name, solver[name]) for name in quantities}
+        for b, scenario in enumerate(scenarios[start:start + chunk]):
+            row = {"scenario": start + b, **scenario}
+            for i, name in enumerate(quantities):
+                row[f"{name}_mean"] = float(means[name][b])
+                row[f"{name}_coverage"] = float(coverages[name][b])
+                row[f"{name}_time_to_target"] = None if np.isnan(reached_at[i, b]) else float(reached_at[i, b])
+            rows.append(row)
+    return rows
+
+
+# 结果表的全部列名 (按第一次出现的顺序)
+def _columns(rows):
+    columns = []
+    for row in rows:
+        columns += [key for key in row if key not in columns]
+    return columns
+
+
+def _format(value):
+    if value is None:
+        return "-"
+    if isinstance(value, float):
+        return f"{value:.4g}"
+    return str(value)
+
+
+# 结果表转换为对齐的文本表格, 便于直接打印
+def format_table(rows):
+    columns = _columns(rows)
+    cells = [columns] + [[_format(row.get(column)) for column in columns] for row in rows]
+    widths = [max(len(line[i]) for line in cells) for i in range(len(columns))]
+    return "\n".join("  ".join(cell.rjust(width) for cell, width in zip(line, widths)) for line in cells)
+
+
+def write_csv(rows, path):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=_columns(rows))
+        writer.writeheader()
+        writer.writerows(rows)
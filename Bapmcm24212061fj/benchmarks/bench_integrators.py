@@ -0,0 +1,34 @@
+"""
+此段代码用于比较显式欧拉、ADI、Crank–Nicolson 三种格式在相同模拟时间下的速度和精度
+以 q2_situation.py 的 PM2.5 模型 (纯扩散, 不含净化器) 为例, 参考解取 dt=0.01 s 的显式解
+运行方式(在 Bapmcm24212061fj 目录下): python benchmarks/bench_integrators.py
+"""
+import os
+import sys
+import time
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # 引入公共模块 apmcm
+from apmcm.integrators import explicit_stable_dt
+from apmcm.solver import Grid, FieldSolver
+
+grid = Grid((5, 8, 3), (40, 40, 20))
+D_DIFF, PM_INIT = 5e-4, 100
+sim_time = 60  # 模拟时间 (秒)
+initial = np.random.default_rng(0).uniform(50, 100, grid.shape)  # 非均匀初始浓度
+print(f"显式格式稳定上限 dt = {explicit_stable_dt(D_DIFF, grid.dx, grid.dy, grid.dz):.2f} s")
+
+
+def simulate(scheme, dt):
+    start = time.perf_counter()
+    solver = FieldSolver(grid, D_DIFF, initial, boundary=PM_INIT, dt=dt, scheme=scheme)
+    steps = int(round(sim_time / dt))
+    solver.run(steps)
+    return solver.field, steps, time.perf_counter() - start
+
+
+reference, _, _ = simulate("explicit", 0.01)
+for scheme, dt in [("explicit", 0.1), ("explicit", 1.0), ("adi", 1.0), ("adi", 5.0), ("cn", 1.0), ("cn", 5.0)]:
+    field, steps, cost = simulate(scheme, dt)
+    error = np.abs(field - reference).max()
+    print(f"{scheme:>8} dt={dt:>4}: {steps:>4} 步, 耗时 {cost:.3f} 秒 ({steps / cost:.0f} 步/秒), 最大误差 {error:.2e}")
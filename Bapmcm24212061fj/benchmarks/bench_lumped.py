@@ -0,0 +1,50 @@
+"""
+此段代码用于比较 q1_lines.py 零维能量平衡模型的两种解法:
+原写法对每个工况逐秒迭代 (显式欧拉) 并查找越过目标温度的时刻, 解析解一次向量化计算全部工况
+工况为进风量、出风量、出风口温度和房间体积的全部组合 (冬季), 并抽查解析解与逐秒迭代的达标时间一致
+运行方式(在 Bapmcm24212061fj 目录下): python benchmarks/bench_lumped.py
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # 引入公共模块 apmcm
+from apmcm.lumped import coefficients, time_to_target
+
+T_outdoor, T_target, t_total, dt = 5, 24, 3600, 1
+
+
+# 原写法: 逐秒迭代, 越过目标温度时停止
+def loop_time_to_target(alpha, beta, T_ac_out):
+    T = T_outdoor
+    for i in range(1, int(t_total / dt) + 1):
+        T = T + (- alpha * (T - T_ac_out) - beta * (T - T_outdoor)) * dt
+        if T >= T_target:
+            return i * dt
+    return np.inf
+
+
+# 各参数取值的全部组合, 共 100 × 100 × 10 × 100 = 1e7 个工况
+V_dot_in = np.linspace(0.03, 0.5, 100)[:, None, None, None]
+V_dot_out = np.linspace(0.05, 0.5, 100)[None, :, None, None]
+T_ac_out = np.linspace(25, 30, 10)[None, None, :, None]
+volume = np.linspace(30, 300, 100)[None, None, None, :]
+
+start = time.perf_counter()
+alpha, beta = coefficients(V_dot_in, V_dot_out, volume)
+closed = time_to_target(T_target, T_outdoor, T_ac_out, T_outdoor, alpha, beta, dt=dt)
+closed = np.where(closed <= t_total, closed, np.inf)  # 与逐秒迭代相同, 只看 t_total 秒以内
+closed_seconds = time.perf_counter() - start
+print(f"解析解: {closed.size} 个工况, 耗时 {closed_seconds:.2f} 秒")
+
+rng = np.random.default_rng(0)
+samples = [tuple(rng.integers(n) for n in closed.shape) for _ in range(200)]
+start = time.perf_counter()
+looped = [loop_time_to_target(np.broadcast_to(alpha, closed.shape)[s], np.broadcast_to(beta, closed.shape)[s],
+                              np.broadcast_to(T_ac_out, closed.shape)[s]) for s in samples]
+loop_seconds = (time.perf_counter() - start) / len(samples)
+mismatch = sum(closed[s] != t for s, t in zip(samples, looped))
+print(f"逐秒迭代: 每个工况 {loop_seconds * 1e3:.2f} 毫秒, 全部工况约需 {loop_seconds * closed.size / 3600:.1f} 小时")
+print(f"抽查 {len(samples)} 个工况, 达标时间不一致的有 {mismatch} 个")
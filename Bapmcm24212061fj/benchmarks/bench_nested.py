@@ -0,0 +1,77 @@
+"""
+此段代码用于比较两层嵌套网格与均匀网格在第一问空调场景上的精度和耗时
+参考解为与嵌套网格细层同样间距的均匀细网格; 各方案的结果 (三线性插值) 与参考解在细网格点上比较,
+统计设备附近 (距设备 2 倍半径以内, 不含墙面附近一个粗网格间距内未解析的边界层) 的最大偏差和均方根偏差
+空调半径取 q1_diffusion_times.py 的 1 米和 q1_position_ga.py 最优设计的 0.25 米 (影响场更陡)
+运行方式(在 Bapmcm24212061fj 目录下): python benchmarks/bench_nested.py [模拟秒数]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+from scipy.interpolate import RegularGridInterpolator
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # 引入公共模块 apmcm
+from apmcm.nested import NestedSolver, DeviceSource
+from apmcm.solver import Grid, FieldSolver, RelaxationSource
+
+seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 300
+size = (5, 8, 3)
+coarse_shape = (40, 40, 20)
+ratio = 3
+dt = 0.1
+D, T_outdoor, T_ac_out = 0.0000213, 35, 24  # 夏季
+ac_position = (2.5, 4, 1.5)
+
+
+def uniform(shape, radius):
+    grid = Grid(size, shape)
+    solver = FieldSolver(grid, D, T_outdoor, boundary=T_outdoor,
+                         sources=[RelaxationSource(grid.influence(ac_position, radius), T_ac_out)], dt=dt)
+    start = time.perf_counter()
+    solver.run(int(round(seconds / dt)))
+    elapsed = time.perf_counter() - start
+    sample = lambda x, y, z: RegularGridInterpolator((grid.x, grid.y, grid.z), solver.field)(
+        np.stack(np.meshgrid(x, y, z, indexing="ij"), axis=-1))
+    return sample, elapsed, solver.field.size
+
+
+# 粗网格按 ratio 倍的大步长推进, 细网格的小步长与参考解相同
+def nested(radius):
+    solver = NestedSolver(Grid(size, coarse_shape), D, T_outdoor, [DeviceSource(RelaxationSource, ac_position,
+                                                                                 radius, T_ac_out)],
+                          boundary=T_outdoor, dt=dt * ratio, ratio=ratio)
+    start = time.perf_counter()
+    solver.run(int(round(seconds / solver.dt)))
+    elapsed = time.perf_counter() - start
+    return solver.sample, elapsed, solver.field.size + solver.fine.size, solver.patch
+
+
+fine_shape = tuple((n - 1) * ratio + 1 for n in coarse_shape)
+medium_shape = tuple((n - 1) * 2 + 1 for n in coarse_shape)
+fine_grid = Grid(size, fine_shape)
+coarse_grid = Grid(size, coarse_shape)
+X, Y, Z = fine_grid.meshgrid(sparse=True)
+distance = np.sqrt((X - ac_position[0]) ** 2 + (Y - ac_position[1]) ** 2 + (Z - ac_position[2]) ** 2)
+interior = np.ones(fine_shape, dtype=bool)
+for coordinate, length, h in zip((X, Y, Z), size, (coarse_grid.dx, coarse_grid.dy, coarse_grid.dz)):
+    interior &= (coordinate > h) & (coordinate < length - h)
+for radius in (1, 0.25):
+    reference, reference_time, reference_points = uniform(fine_shape, radius)
+    nested_sample, nested_time, nested_points, patch = nested(radius)
+    exact = reference(fine_grid.x, fine_grid.y, fine_grid.z)
+    near = (distance <= 2 * radius) & interior
+
+    print(f"空调半径 {radius} 米, 模拟 {seconds:.0f} 秒, 加密块 {' × '.join(f'{s:.2f}' for s in patch.size)} 米 "
+          f"({ratio} 倍加密, 粗网格步长 {dt * ratio:g} 秒)")
+    rows = [
+        (f"均匀粗网格 {coarse_shape}",) + uniform(coarse_shape, radius),
+        (f"均匀中网格 {medium_shape}",) + uniform(medium_shape, radius),
+        (f"嵌套网格 {coarse_shape} + {patch.shape}", nested_sample, nested_time, nested_points),
+        (f"均匀细网格 {fine_shape} (参考解)", reference, reference_time, reference_points),
+    ]
+    for name, sample, elapsed, points in rows:
+        error = sample(fine_grid.x, fine_grid.y, fine_grid.z) - exact
+        print(f"  {name}: {points} 个格点, 耗时 {elapsed:.2f} 秒, 设备附近最大偏差 {np.abs(error[near]).max():.3g} ℃, "
+              f"均方根偏差 {np.sqrt(np.mean(error[near] ** 2)):.3g} ℃")
@@ -0,0 +1,54 @@
+"""
+此段代码用于测试第一问空调设计适应度评估在线程池/进程池上从 1 个核到 N 个核的扩展性
+网格取 100×160×60 (比 q1_position_ga.py 的 40×40×20 更细), 单个体评估的开销足以抵消进程间通信;
+每种配置都检查适应度与串行结果完全一致
+运行方式(在 Bapmcm24212061fj 目录下): python benchmarks/bench_parallel.py [最大核数]
+"""
+import os
+import sys
+import time
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # 引入公共模块 apmcm
+from apmcm.designs import repair_ac_genes, ac_design_batch
+from apmcm.parallel import Executor
+
+r_w, r_l, r_h = 5, 8, 3
+nx, ny, nz = 100, 160, 60
+x = np.linspace(0, r_w, nx)
+y = np.linspace(0, r_l, ny)
+z = np.linspace(0, r_h, nz)
+T = np.full((nx, ny, nz), 5, dtype=float)
+t_ac_out, t_target, max_volume, max_power = 24, 24, 0.1, 1800
+population = 64
+max_workers = int(sys.argv[1]) if len(sys.argv) > 1 else (os.cpu_count() or 1)
+
+rng = np.random.default_rng(0)
+genes = np.column_stack([rng.uniform(0.1, 0.25, population), rng.uniform(0.5, 1.0, population),
+                         rng.integers(1, 6, population), rng.integers(1, 6, population),
+                         rng.uniform(0, r_w, population), rng.uniform(0, r_l, population),
+                         rng.uniform(0, r_h, population)])
+genes = repair_ac_genes(genes, (r_w, r_l, r_h))
+
+
+# 按种群分块评估, 返回 (适应度, 秒)
+def run(backend, workers):
+    with Executor(backend, workers, seed=0) as executor:
+        grid = executor.share(T)
+        executor.map_rows(ac_design_batch, genes[:workers], x, y, z, grid,
+                          t_ac_out, t_target, max_volume, max_power)  # 预热: 启动线程/进程
+        start = time.perf_counter()
+        fitness = executor.map_rows(ac_design_batch, genes, x, y, z, grid,
+                                    t_ac_out, t_target, max_volume, max_power)
+        return fitness, time.perf_counter() - start
+
+
+reference, serial = run("serial", 1)
+print(f"网格 {nx}×{ny}×{nz}, 种群 {population}, 最多 {max_workers} 核")
+print(f"serial   1 核: {serial:.2f} 秒, {population / serial:.1f} 次评估/秒")
+for backend in ("thread", "process"):
+    for workers in range(1, max_workers + 1):
+        fitness, elapsed = run(backend, workers)
+        same = "一致" if np.array_equal(fitness, reference) else "不一致"
+        print(f"{backend:8s} {workers} 核: {elapsed:.2f} 秒, {population / elapsed:.1f} 次评估/秒, "
+              f"加速比 {serial / elapsed:.2f}, 结果与串行{same}")
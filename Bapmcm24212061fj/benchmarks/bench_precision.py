@@ -0,0 +1,58 @@
+"""
+此段代码用于比较第一、二、三问和第四问耦合模拟在 float32 与 float64 下的偏差和耗时,
+另外在 100×160×60 的细网格上比较第一问 (网格越大越受内存带宽限制, 单精度的加速越明显)
+运行方式(在 Bapmcm24212061fj 目录下): python benchmarks/bench_precision.py [步数]
+"""
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # 引入公共模块 apmcm
+from apmcm.coupled import Species, CoupledSolver, humidity_diffusivity_from_temperature
+from apmcm.precision import compare_precision, format_report
+from apmcm.solver import Grid, FieldSolver, RelaxationSource, DecaySink, ConstantSource
+
+steps = int(sys.argv[1]) if len(sys.argv) > 1 else 3000
+size = (5, 8, 3)
+
+
+# 与 q1_diffusion_times.py 相同的夏季空调场景
+def q1(dtype, shape=(40, 40, 20)):
+    grid = Grid(size, shape, dtype=dtype)
+    return FieldSolver(grid, 0.0000213, 35, boundary=35,
+                       sources=[RelaxationSource(grid.influence((2.5, 4, 1.5), 1), 24)], dt=0.1)
+
+
+# 与 q2_situation.py 相同的净化器场景
+def q2(dtype):
+    grid = Grid(size, (40, 40, 20), dtype=dtype)
+    return FieldSolver(grid, 5e-4, 100, boundary=100, sources=[DecaySink(grid.influence((2.5, 4, 0.8), 1), 0.8)],
+                       clamp=(0, 100), dt=0.1)
+
+
+# 与 q3_hum_situation.py 相同的加湿器场景
+def q3(dtype):
+    grid = Grid(size, (40, 40, 30), dtype=dtype)
+    return FieldSolver(grid, 2.4e-5, 0.2, boundary=0.2,
+                       sources=[ConstantSource(grid.influence((3.10, 3.45, 2.16), 1.18), 0.05)],
+                       clamp=(0.2, 0.6), dt=0.1)
+
+
+# 与 q4_situation.py 相同的三合一耦合场景
+def q4(dtype):
+    grid = Grid(size, (40, 40, 20), dtype=dtype)
+    species = [
+        Species("temperature", 0.0000213, 5, boundary=5,
+                sources=[RelaxationSource(grid.influence((2.5, 4, 0.39), 1), 24)]),
+        Species("pm25", 5e-4, 100, boundary=100, sources=[DecaySink(grid.influence((2.5, 4, 0.05), 1), 0.8)],
+                clamp=(0, 100)),
+        Species("humidity", humidity_diffusivity_from_temperature, 0.2, boundary=0.2,
+                sources=[ConstantSource(grid.influence((2.5, 4, 0.43), 1.25), 0.05)], clamp=(0.2, 0.6)),
+    ]
+    return CoupledSolver(grid, species, dt=0.1)
+
+
+print(format_report("q1 温度", compare_precision(q1, steps)))
+print(format_report("q2 PM2.5", compare_precision(q2, steps)))
+print(format_report("q3 湿度", compare_precision(q3, steps)))
+print(format_report("q4 耦合", compare_precision(q4, steps, repeat=1)))
+print(format_report("q1 温度 (100×160×60)", compare_precision(lambda dtype: q1(dtype, (100, 160, 60)), steps // 20)))
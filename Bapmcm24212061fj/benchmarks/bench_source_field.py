@@ -0,0 +1,68 @@
+"""
+此段代码用于比较影响场缓存前后, 扩散模拟中"设备源项"部分的单步耗时,
+以及细网格上完整 meshgrid 与一维因子广播两种算法计算影响场的峰值内存
+运行方式(在 Bapmcm24212061fj 目录下): python benchmarks/bench_source_field.py [细网格间距, 默认 0.02 米]
+"""
+import os
+import sys
+import timeit
+import tracemalloc
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # 引入公共模块 apmcm
+from apmcm.source_field import gaussian_influence, influence_field
+
+# 与 q1_diffusion_times.py 相同的房间和网格
+r_w, r_l, r_h = 5, 8, 3
+nx, ny, nz = 40, 40, 20
+x = np.linspace(0, r_w, nx)
+y = np.linspace(0, r_l, ny)
+z = np.linspace(0, r_h, nz)
+X, Y, Z = np.meshgrid(x, y, z)
+ac_position = (2.5, 4, 1.5)
+T_outdoor, T_ac_out, dt = 35, 24, 0.1
+repeat = 200  # 每种方式重复的步数
+
+
+# 原写法: 每个时间步都重新计算影响场
+def step_recompute(T):
+    influence = gaussian_influence(X, Y, Z, ac_position, 1)
+    T += influence * (T_ac_out - T) * dt
+
+
+# 新写法: 影响场从缓存中取出
+def step_cached(T):
+    influence = influence_field(x, y, z, ac_position, 1, indexing="xy")
+    T += influence * (T_ac_out - T) * dt
+
+
+for name, step in (("每步重新计算", step_recompute), ("缓存影响场", step_cached)):
+    T = np.full((nx, ny, nz), T_outdoor, dtype=float)
+    step(T)  # 预热(缓存版本在这里完成唯一一次计算)
+    cost = timeit.timeit(lambda: step(T), number=repeat) / repeat
+    print(f"{name}: 单步耗时 {cost * 1e6:.1f} 微秒")
+
+
+# 细网格: 原写法生成完整的 X, Y, Z 再求距离, 新写法只对三个一维坐标轴求指数再广播相乘
+spacing = float(sys.argv[1]) if len(sys.argv) > 1 else 0.02
+fine = [np.linspace(0, length, int(round(length / spacing)) + 1) for length in (r_w, r_l, r_h)]
+
+
+def influence_meshgrid():
+    return gaussian_influence(*np.meshgrid(*fine, indexing="ij"), ac_position, 1)
+
+
+def influence_separable():
+    return influence_field(*fine, ac_position, 1)
+
+
+print(f"细网格 {spacing} 米: {' × '.join(str(len(axis)) for axis in fine)} 个格点")
+for name, build in (("完整 meshgrid", influence_meshgrid), ("一维因子广播", influence_separable)):
+    tracemalloc.start()
+    start = timeit.default_timer()
+    field = build()
+    seconds = timeit.default_timer() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print(f"{name}: 耗时 {seconds:.2f} 秒, 峰值内存 {peak / 2 ** 20:.0f} MB (结果本身 {field.nbytes / 2 ** 20:.0f} MB)")
+    del field
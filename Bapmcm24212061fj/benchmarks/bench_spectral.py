@@ -0,0 +1,44 @@
+"""
+此段代码用于比较逐步显式迭代与 DST 谱方法 (solve_at) 生成 30 s / 300 s / 600 s 三个时刻场的耗时和误差
+以 q2_situation.py 的 PM2.5 模型为例; 误差相对于 dt=0.1 s 的显式解
+运行方式(在 Bapmcm24212061fj 目录下): python benchmarks/bench_spectral.py
+"""
+import os
+import sys
+import time
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # 引入公共模块 apmcm
+from apmcm.solver import Grid, FieldSolver, DecaySink
+
+grid = Grid((5, 8, 3), (40, 40, 20))
+D_DIFF, PM_INIT, K_FILTER, DT = 5e-4, 100, 0.8, 0.1
+output_times = [30, 300, 600]
+I = grid.influence((2.5, 4, 0.8), 1)
+initial = np.random.default_rng(0).uniform(50, 100, grid.shape)
+
+
+def make_solver(with_purifier):
+    sources = [DecaySink(I, K_FILTER)] if with_purifier else []
+    start = initial if not with_purifier else PM_INIT
+    return FieldSolver(grid, D_DIFF, start, boundary=PM_INIT, sources=sources, clamp=(0, PM_INIT), dt=DT)
+
+
+for with_purifier in (False, True):
+    label = "含净化器(算子分裂)" if with_purifier else "纯扩散"
+    # 逐步迭代, 途经各输出时刻时保存一次
+    solver = make_solver(with_purifier)
+    start = time.perf_counter()
+    reference = []
+    for t in output_times:
+        solver.run(int(round((t - solver.time) / DT)))
+        reference.append(solver.field.copy())
+    explicit_cost = time.perf_counter() - start
+    print(f"[{label}] 显式逐步迭代到 {output_times[-1]} s: {explicit_cost:.2f} 秒")
+    for split_dt in ((1.0, 5.0) if with_purifier else (1.0,)):
+        solver = make_solver(with_purifier)
+        start = time.perf_counter()
+        snapshots = solver.solve_at(output_times, split_dt=split_dt)
+        cost = time.perf_counter() - start
+        error = max(np.abs(field - ref).max() for (_, field), ref in zip(snapshots, reference))
+        print(f"[{label}] solve_at split_dt={split_dt}: {cost:.2f} 秒, 与显式解的最大差 {error:.2e}")
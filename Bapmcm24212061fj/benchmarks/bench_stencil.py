@@ -0,0 +1,42 @@
+"""
+此段代码用于比较 np.roll 拉普拉斯与 apmcm.stencil.laplacian_3d 各后端的单步耗时
+运行方式(在 Bapmcm24212061fj 目录下): python benchmarks/bench_stencil.py
+"""
+import os
+import sys
+import timeit
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # 引入公共模块 apmcm
+from apmcm import stencil
+from apmcm.stencil import laplacian_3d, laplacian_workspace
+
+grids = [(40, 40, 20), (50, 80, 30), (100, 160, 60)]  # 各问脚本中用到的网格及更细的网格
+dx, dy, dz = 0.1, 0.1, 0.1
+repeat = 20
+
+
+# 原脚本中的写法
+def laplacian_roll(T):
+    laplacian_x = (np.roll(T, 1, axis=0) + np.roll(T, -1, axis=0) - 2 * T) / dx ** 2
+    laplacian_y = (np.roll(T, 1, axis=1) + np.roll(T, -1, axis=1) - 2 * T) / dy ** 2
+    laplacian_z = (np.roll(T, 1, axis=2) + np.roll(T, -1, axis=2) - 2 * T) / dz ** 2
+    return laplacian_x + laplacian_y + laplacian_z
+
+
+backends = ["numpy"]
+if stencil.numexpr is not None:
+    backends.append("numexpr")
+if stencil.numba is not None:
+    backends.append("numba")
+
+for shape in grids:
+    T = np.random.default_rng(0).random(shape)
+    out = np.zeros_like(T)
+    work = laplacian_workspace(shape)
+    cost = timeit.timeit(lambda: laplacian_roll(T), number=repeat) / repeat
+    print(f"网格 {shape}: np.roll 单步 {cost * 1e3:.2f} 毫秒")
+    for backend in backends:
+        laplacian_3d(T, out, dx, dy, dz, work, backend=backend)  # 预热(numba 编译)
+        cost = timeit.timeit(lambda: laplacian_3d(T, out, dx, dy, dz, work, backend=backend), number=repeat) / repeat
+        print(f"网格 {shape}: laplacian_3d[{backend}] 单步 {cost * 1e3:.2f} 毫秒")
@@ -0,0 +1,236 @@
+"""
+此段代码是各问求解器和优化器的基准测试集, 结果追加到 JSON 历史记录中, 便于比较不同提交之间的性能变化
+每个用例 (仿照 asv) 由 准备函数 -> 计时的函数 + 工作量 组成:
+- q1/q2/q3 扩散: 与各问脚本相同的源/汇项、限幅和墙面边界, 在 20³ ~ 100×160×60 的网格上推进若干步, 记录 步/秒
+- q1/q2/q4 遗传算法: 与 q1_position_ga.py / q2_cadr_design.py / q4_design.py 相同的按种群评估的适应度函数,
+  固定代数 (不提前停止), 记录 代/秒 和 评估/秒
+- q3 粒子群: 与 q3_weet_pso.py 相同的目标函数和 pyswarm.pso, 记录 评估/秒
+每个用例先运行一次预热 (numba 编译等), 再重复 repeat 次取最快的一次; 另外在 tracemalloc 下再运行一次 (准备 + 运行), 记录峰值内存
+每次运行的结果连同提交号、时间、Python / numpy 版本追加到 benchmarks/history.json, 并与上一次的结果比较
+运行方式(在 Bapmcm24212061fj 目录下): python benchmarks/bench_suite.py [用例名的子串 ...] [--repeat 3] [--no-save]
+例如 python benchmarks/bench_suite.py q1-diffusion ga
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+from functools import partial
+
+import numpy as np
+from deap import base, creator
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # 引入公共模块 apmcm
+from apmcm.solver import Grid, FieldSolver, RelaxationSource, DecaySink, ConstantSource
+from apmcm.designs import repair_ac_genes, ac_design_batch, purifier_cadr_batch, height_deviation_batch
+from apmcm.evolution import GARunner, create_type
+from apmcm.fileio import atomic_write
+
+HISTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), "history.json")
+room = (5, 8, 3)
+grids = [(20, 20, 20), (40, 40, 20), (50, 80, 30), (100, 160, 60)]  # 各问脚本中的网格及更粗、更细的网格
+cells_per_case = 3e7  # 每个扩散用例推进的 步数 × 格点数, 使各网格的计时时长相近
+ngen = 20  # 遗传算法的代数 (不提前停止)
+seed = 0
+
+
+# 扩散用例: 返回 (推进 steps 步的函数, 步数)
+def _diffusion(make_solver, shape):
+    solver = make_solver(Grid(room, shape))
+    steps = max(10, int(cells_per_case / np.prod(shape)))
+
+    def run():
+        solver.run(steps)
+    return run, steps
+
+
+# 第一问: 空调出风弛豫到出风口温度, 墙体温度固定为室外温度 (夏季)
+def q1_solver(grid):
+    influence = grid.influence((2.5, 4, 1.5), 1)
+    return FieldSolver(grid, 0.0000213, 35, boundary=35, sources=[RelaxationSource(influence, 24)], dt=0.1)
+
+
+# 第二问: 净化器按影响场衰减 PM2.5, 浓度限制在 [0, 100]
+def q2_solver(grid):
+    influence = grid.influence((2.5, 4, 0.8), 1)
+    return FieldSolver(grid, 5e-4, 100, boundary=100, sources=[DecaySink(influence, 0.8)], clamp=(0, 100), dt=0.1)
+
+
+# 第三问: 加湿器恒定增湿, 湿度限制在 [0.2, 0.6]
+def q3_solver(grid):
+    influence = grid.influence((3.10, 3.45, 2.16), 1.18)
+    return FieldSolver(grid, 2.4e-5, 0.2, boundary=0.2, sources=[ConstantSource(influence, 0.05)],
+                       clamp=(0.2, 0.6), dt=0.1)
+
+
+# 遗传算法用例: 返回 (运行 ngen 代的函数, 代数); 评估次数在运行后从 runner 读取
+def _ga(individual_class, attributes, batch_evaluate, repair=None):
+    def run():
+        random.seed(seed)
+        np.random.seed(seed)
+        runner = GARunner(individual_class, attributes, batch_evaluate=batch_evaluate, repair=repair, ngen=ngen)
+        runner.run(verbose=False)
+        return {"evaluations": runner.evaluations}
+    return run, ngen
+
+
+def q1_ga():
+    nx, ny, nz = 40, 40, 20  # 与 q1_position_ga.py 相同
+    x, y, z = (np.linspace(0, size, n) for size, n in zip(room, (nx, ny, nz)))
+    T = np.full((nx, ny, nz), 5, dtype=float)
+    create_type("BenchFitnessMin", base.Fitness, weights=(-1.0,))
+    individual = create_type("BenchMinIndividual", list, fitness=creator.BenchFitnessMin)
+    attributes = (partial(random.uniform, 0.1, 0.25), partial(random.uniform, 0.1, 2),
+                  partial(random.randint, 1, 5), partial(random.randint, 1, 5),
+                  partial(random.uniform, 0, room[0]), partial(random.uniform, 0, room[1]),
+                  partial(random.uniform, 0, room[2]))
+    return _ga(individual, attributes, partial(ac_design_batch, x=x, y=y, z=z, T=T, t_ac_out=24, t_target=24,
+                                               max_volume=0.1, max_power=1800, indexing="xy"),
+               repair=partial(repair_ac_genes, room_size=room))
+
+
+def q2_ga():
+    create_type("BenchFitnessMax", base.Fitness, weights=(1.0,))
+    individual = create_type("BenchMaxIndividual", list, fitness=creator.BenchFitnessMax)
+    attributes = (partial(random.uniform, 0.1, 0.5), partial(random.uniform, 0.5, 1.5),
+                  partial(random.randint, 1, 5), partial(random.randint, 1, 3), partial(random.randint, 1, 3))
+    return _ga(individual, attributes, partial(purifier_cadr_batch, room_volume=np.prod(room), device_volume=0.1,
+                                               max_flow=600, max_power=1800, k_filter=0.8))
+
+
+def q4_ga():
+    area = np.pi * 0.25 ** 2
+    max_heights = 0.1 / area
+    create_type("BenchFitnessMin", base.Fitness, weights=(-1.0,))
+    individual = create_type("BenchMinIndividual", list, fitness=creator.BenchFitnessMin)
+    attr_height = partial(random.uniform, 0.2 * max_heights, 0.5 * max_heights)
+    return _ga(individual, (attr_height,) * 3, partial(height_deviation_batch, cross_section=area, volume_limit=0.1,
+                                                       target_ratios=[0.6, 0.2, 0.2]))
+
+
+# 粒子群用例: 与 q3_weet_pso.py 相同的目标函数, 返回 (运行一次 pso 的函数, 迭代次数)
+# minstep = minfunc = 0 使每次都跑满 maxiter 次迭代 (与遗传算法用例不提前停止一致), 工作量固定
+def q3_pso(swarmsize=50, maxiter=50):
+    from pyswarm import pso
+    air_velocity, target_humidity_diff, max_volume = 8.0, 0.5, 0.1
+    bounds = [(0.1, 0.5), (0.1, 1.0), (0, room[0]), (0, room[1]), (0, room[2])]
+
+    def run():
+        evaluations = 0
+
+        def objective(x):
+            nonlocal evaluations
+            evaluations += 1
+            r, h = x[0], x[1]
+            if np.pi * r ** 2 * h > max_volume:
+                return 1e6
+            return -2 * np.pi * r * h * air_velocity * target_humidity_diff
+
+        np.random.seed(seed)
+        pso(objective, lb=[b[0] for b in bounds], ub=[b[1] for b in bounds], swarmsize=swarmsize, maxiter=maxiter,
+            minstep=0, minfunc=0)
+        return {"evaluations": evaluations}
+    return run, maxiter
+
+
+# 全部用例: 名称 -> (准备函数, 工作量的单位)
+cases = {}
+for shape in grids:
+    label = "x".join(map(str, shape))
+    for name, make_solver in (("q1", q1_solver), ("q2", q2_solver), ("q3", q3_solver)):
+        cases[f"{name}-diffusion-{label}"] = (partial(_diffusion, make_solver, shape), "steps")
+cases["q1-ga"] = (q1_ga, "generations")
+cases["q2-ga"] = (q2_ga, "generations")
+cases["q4-ga"] = (q4_ga, "generations")
+cases["q3-pso"] = (q3_pso, "iterations")
+
+
+def measure(setup, repeat):
+    """
+    返回结果字典: seconds (最快一次的耗时), rate (工作量/秒), 有评估次数时还有 evals_per_s,
+    peak_mb (tracemalloc 记录的准备 + 运行一次的峰值内存, MB)
+    """
+    run, _ = setup()
+    run()  # 预热
+    best, extra = None, {}
+    for _ in range(repeat):
+        run, work = setup()
+        start = time.perf_counter()
+        extra = run() or {}
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    result = {"seconds": best, "work": work, "rate": work / best}
+    if "evaluations" in extra:
+        result["evaluations"] = extra["evaluations"]
+        result["evals_per_s"] = extra["evaluations"] / best
+    tracemalloc.start()
+    try:
+        run, _ = setup()
+        run()
+        result["peak_mb"] = tracemalloc.get_traced_memory()[1] / 2 ** 20
+    finally:
+        tracemalloc.stop()
+    return result
+
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(HISTORY), check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def load_history(path=HISTORY):
+    if not os.path.exists(path):
+        return []
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_history(history, path=HISTORY):
+    atomic_write(path, lambda f: json.dump(history, f, ensure_ascii=False, indent=1), mode="w")
+
+
+# 历史记录中该用例最近一次的结果
+def previous_result(history, name):
+    for record in reversed(history):
+        if name in record["results"]:
+            return record["commit"], record["results"][name]
+    return None, None
+
+
+parser = argparse.ArgumentParser(description="各问求解器和优化器的基准测试")
+parser.add_argument("patterns", nargs="*", help="只运行名称包含这些子串的用例")
+parser.add_argument("--repeat", type=int, default=3, help="每个用例重复次数, 取最快的一次")
+parser.add_argument("--history", default=HISTORY, help="JSON 历史记录文件")
+parser.add_argument("--no-save", action="store_true", help="不写入历史记录")
+args = parser.parse_args()
+
+selected = [name for name in cases if not args.patterns or any(p in name for p in args.patterns)]
+history = load_history(args.history)
+results = {}
+print(f"{'用例':<26}{'耗时 (秒)':>10}{'速率':>20}{'评估/秒':>12}{'峰值内存 (MB)':>15}  与上次相比")
+for name in selected:
+    setup, unit = cases[name]
+    result = measure(setup, args.repeat)
+    result["unit"] = unit
+    results[name] = result
+    commit, previous = previous_result(history, name)
+    change = "" if previous is None else f"{result['rate'] / previous['rate'] - 1:+.1%} ({commit})"
+    evals = f"{result['evals_per_s']:.0f}" if "evals_per_s" in result else "-"
+    print(f"{name:<26}{result['seconds']:>10.3f}{result['rate']:>12.1f} {unit + '/s':<8}"
+          f"{evals:>12}{result['peak_mb']:>15.1f}  {change}")
+
+if not args.no_save and results:
+    history.append({"commit": _git_commit(), "date": datetime.datetime.now().isoformat(timespec="seconds"),
+                    "python": platform.python_version(), "numpy": np.__version__,
+                    "machine": platform.machine(), "cpus": os.cpu_count(), "repeat": args.repeat,
+                    "results": results})
+    save_history(history, args.history)
+    print(f"结果已追加到 {args.history}")
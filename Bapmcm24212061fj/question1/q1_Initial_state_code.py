@@ -19,16 +19,15 @@ T_ac_out = 24    # 空调出风口温度（摄氏度）
 # 网格划分参数
 nx, ny, nz = 50, 80, 30  # 网格点数 (x, y, z)
 x = np.linspace(0, r_w, nx)  # x 方向的网格点
-y = np.linspace(0, r_l, nx)  # y 方向的网格点
-z = np.linspace(0, r_h, nx)  # z 方向的网格点
-X, Y, Z = np.meshgrid(x, y, z)    # 创建三维网格
+y = np.linspace(0, r_l, ny)  # y 方向的网格点
+z = np.linspace(0, r_h, nz)  # z 方向的网格点
 
-# 初始化温度场，设置为室外温度
-T = np.full((nx, nx, nx), T_outdoor, dtype=float)
+# 初始化温度场，设置为室外温度; 第 0、1、2 维分别对应 x、y、z
+T = np.full((nx, ny, nz), T_outdoor, dtype=float)
 
-# 设置 (x=0, y=0) 整个 z 轴的温度为 20°C
-x_index = 25  # x=0 对应的索引
-y_index = 25  # y=0 对应的索引
+# 设置房间中心 (x_index, y_index) 整个 z 轴的温度为出风口温度
+x_index = nx // 2  # x 方向中心的索引
+y_index = ny // 2  # y 方向中心的索引
 T[x_index, y_index, :] = T_ac_out
 
 
@@ -37,9 +36,8 @@ fig = plt.figure(figsize=(16, 6))
 # 绘制初始温度的散点热力图
 ax1 = fig.add_subplot(121, projection='3d')
 slice_density = 5
-X_slice = X[::slice_density, ::slice_density, ::slice_density]
-Y_slice = Y[::slice_density, ::slice_density, ::slice_density]
-Z_slice = Z[::slice_density, ::slice_density, ::slice_density]
+# 只对抽稀后的一维坐标轴展开网格, 不生成完整的三维坐标网格
+X_slice, Y_slice, Z_slice = np.meshgrid(x[::slice_density], y[::slice_density], z[::slice_density], indexing="ij")
 T_slice = T[::slice_density, ::slice_density, ::slice_density]
 sc = ax1.scatter(X_slice, Y_slice, Z_slice, c=T_slice.flatten(), cmap="coolwarm", marker='o')
 cb = plt.colorbar(sc, ax=ax1, shrink=0.5, aspect=10)
@@ -1,6 +1,14 @@
+import os
+import sys
 import numpy as np
 import matplotlib.pyplot as plt
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # 引入公共模块 apmcm
+from apmcm.solver import Grid, FieldSolver, RelaxationSource
+from apmcm.modes import run_configured
+from apmcm.stream import RunningStats
+from apmcm.stopping import FractionReached, SteadyState
+
 # 房间尺寸与环境参数
 r_w = 5   # 室内宽度（米）
 r_l = 8   # 室内长度（米）
@@ -28,44 +36,50 @@ thermal_diffusivity = 0.0000213  # 空气热扩散系数（平方米/小时）
 
 # 网格划分参数
 nx, ny, nz = 40, 40, 20  # 网格点数 (x, y, z)
-x = np.linspace(0, r_w, nx)  # x 方向的网格点
-y = np.linspace(0, r_l, ny)  # y 方向的网格点
-z = np.linspace(0, r_h, nz)  # z 方向的网格点
-X, Y, Z = np.meshgrid(x, y, z)    # 创建三维网格
-
-# 初始化温度场，设置为室外温度
-T = np.full((nx, ny, nz), T_outdoor, dtype=float)
+dtype = np.float64  # 场的浮点类型: np.float64 双精度 / np.float32 单精度
+# indexing="xy" 与原来 np.meshgrid(x, y, z) 的默认网格保持一致
+grid = Grid((r_w, r_l, r_h), (nx, ny, nz), indexing="xy", dtype=dtype)
+x, y, z = grid.x, grid.y, grid.z  # x, y, z 方向的网格点
+X, Y, Z = grid.meshgrid(sparse=True)    # 可广播的一维坐标, 不生成完整的三维网格 (只在绘图时按需展开)
 
-# 空调影响区域函数
-def ac_influence(x, y, z, ac_pos, radius=1):
-    dist = np.sqrt((x - ac_pos[0]) ** 2 + (y - ac_pos[1]) ** 2 + (z - ac_pos[2]) ** 2)
-    return np.exp(-dist ** 2 / (2 * radius ** 2))
+# 空调影响区域 (位置和半径不随时间变化, 在迭代前计算一次)
+influence = grid.influence(ac_position, 1)
 
 # 设置模拟参数
 # 总模拟时间为 timesteps * dt
 timesteps, dt = 6000, 0.1  # 时间步数, 时间步长
+scheme = "explicit"  # 扩散项时间积分格式: "explicit" / "cn" / "adi" (隐式格式可用更大的 dt)
+spectral = False  # True 时用 DST 谱方法直接求出 times 时刻的温度场, 不再逐步迭代
 times = timesteps * dt
+snapshot_times = [times]  # 一次模拟依次输出多个时刻的温度场, 例如 [30, 300, 600] (秒)
+checkpoint_dir = None  # 检查点目录, 例如 "../checkpoints"; None 时不保存检查点
+checkpoint_every = 1000  # 每隔多少步写一次检查点
+resume = True  # 已有同参数的检查点时从中继续, 600 s 的模拟可以接着 300 s 的结果算
+series_every = None  # 每隔多少秒流式输出一次, 逐帧统计平均温度和达标占比 (不保存完整的场), 例如 10
+series_dir = None  # 同时把各帧温度场写入该目录的分块存储, 例如 "../series/q1"; None 时只统计
+stop_check_every = None  # 每隔多少步检查一次停止条件, 90% 的内部格点达到目标温度或温度场接近稳态即提前结束, 例如 100
+cache_dir = None  # 结果缓存目录, 例如 "../cache"; 参数和代码都没变时直接读取上次的温度场, 不再重新模拟
+fields_path = None  # 保存各输出时刻的温度场和空调影响场, 供 render_figures.py 批量出图, 例如 f"../fields/q1_{season}.npz"
 print(f"当前运行时间是{times}s")
 
-# 开始迭代模拟
-for t in range(timesteps):
-
-    influence = ac_influence(X, Y, Z, ac_position)  # 获取空调的影响值
-    T += influence * (T_ac_out - T) * dt  # 更新温度场
-
-    # 使用拉普拉斯算子计算空间方向上的温度变化
-    # x 方向的变化
-    laplacian_x = (np.roll(T, 1, axis=0) + np.roll(T, -1, axis=0) - 2 * T) / (x[1] - x[0]) ** 2
-    # y 方向的变化
-    laplacian_y = (np.roll(T, 1, axis=1) + np.roll(T, -1, axis=1) - 2 * T) / (y[1] - y[0]) ** 2
-    # z 方向的变化
-    laplacian_z = (np.roll(T, 1, axis=2) + np.roll(T, -1, axis=2) - 2 * T) / (z[1] - z[0]) ** 2
-    # 合成总的拉普拉斯项
-    laplacian = laplacian_x + laplacian_y + laplacian_z
-    # 根据热扩散系数更新温度场
-    T += thermal_diffusivity * laplacian * dt
-    # 设置边界条件（墙体为绝热边界）
-    T[0, :, :] = T[-1, :, :] = T[:, 0, :] = T[:, -1, :] = T[:, :, 0] = T[:, :, -1] = T_outdoor
+# 温度场初始为室外温度, 空调出风向出风口温度弛豫, 墙体温度固定为室外温度
+solver = FieldSolver(grid, thermal_diffusivity, T_outdoor, boundary=T_outdoor,
+                     sources=[RelaxationSource(influence, T_ac_out)], dt=dt, scheme=scheme)
+# 与目标温度相差 0.5 ℃ 以内即算达标 (夏季降温看上限, 冬季升温看下限); 墙体固定为室外温度, 只统计内部格点
+series = RunningStats(target=T_target, above=T_outdoor < T_target, tol=0.5, interior=True)
+criteria = [FractionReached(T_target, 0.9, tol=0.5, above=T_outdoor < T_target), SteadyState(1e-4)]
+# 开始迭代模拟 (运行方式由上面的开关决定, 互相冲突时报错)
+snapshots = run_configured(solver, snapshot_times, spectral=spectral, series_every=series_every, series=series,
+                           series_dir=series_dir, stop_check_every=stop_check_every, criteria=criteria,
+                           checkpoint_dir=checkpoint_dir, checkpoint_every=checkpoint_every, resume=resume,
+                           cache_dir=cache_dir, fields_path=fields_path, arrays={"influence": influence})
+if series_every:
+    reach_time = series.time_to_fraction(0.9)
+    if reach_time is None:
+        print("模拟时间内未有 90% 的内部格点达到目标温度")
+    else:
+        print(f"90% 的内部格点达到目标温度的时间: {reach_time} s")
+_, T = snapshots[-1]  # 后面的图使用最后一个时刻
 
 
 # 可视化结果
@@ -89,8 +103,8 @@ fig = plt.figure()
 # ax2 = fig.add_subplot(122, projection='3d')
 fig2 = plt.figure()
 ax2 = fig2.add_subplot(projection='3d')
-ac_influence_plot = ac_influence(X, Y, Z, ac_position)  # 获取空调影响
-ax2.scatter(X, Y, Z, c=ac_influence_plot, cmap='coolwarm_r', alpha=0.5, s=1)  # 绘制3D散点图
+ac_influence_plot = influence  # 空调影响(直接复用缓存的影响场)
+ax2.scatter(*np.broadcast_arrays(X, Y, Z), c=ac_influence_plot, cmap='coolwarm_r', alpha=0.5, s=1)  # 绘制3D散点图
 ax2.set_title('Air conditioning affects the weight distribution')
 ax2.set_xlabel('Width/m')
 ax2.set_ylabel('Length/m')
@@ -99,4 +113,18 @@ ax2.set_zlabel('Height/m')
 fig2.tight_layout()
 
 # fig2.savefig(f"../figures/q1_{times}s_scatter_{season}.png")
+
+# 三维模型的室内平均温度随时间变化 (与 q1_lines.py 的集总模型曲线对照)
+if series_every:
+    fig3 = plt.figure()
+    ax3 = fig3.add_subplot()
+    ax3.plot(series.times, series.mean, label='Mean temperature')
+    ax3.fill_between(series.times, series.min, series.max, alpha=0.2, label='Min-max range')
+    ax3.axhline(T_target, color='r', linestyle='--', label='Target temperature')
+    ax3.set_xlabel('Time/s')
+    ax3.set_ylabel('Temperature/°C')
+    ax3.set_title('Indoor temperature over time (3D model)')
+    ax3.legend()
+    fig3.tight_layout()
+    # fig3.savefig(f"../figures/q1_mean_temperature_{season}.png")
 # plt.show()
@@ -1,6 +1,11 @@
+import os
+import sys
 import numpy as np
 import matplotlib.pyplot as plt
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # 引入公共模块 apmcm
+from apmcm.lumped import coefficients, temperature, time_to_target
+
 # 房间参数（单位：米）
 r_w, r_l, r_h = 5, 8, 3  # 房间尺寸（宽，长，高）
 
@@ -31,53 +36,26 @@ thermal_diffusivity = 0.0000215
 nx, ny, nz = 50, 80, 30  # 网格大小（x, y, z）
 T = np.full((nx, ny, nz), T_outdoor, dtype=float)  # 初始温度场
 
-# 计算空气质量（kg）
-m_air = rho * r_w * r_l * r_h  # 房间空气质量（kg）
-
-# 风量（kg/s）
-m_dot_ac = rho * (V_dot_in + V_dot_out) / 2  # 平均风量
+# 温度方程系数: alpha 为质量流速系数（1/s）, beta 为热传递系数（1/s）
+alpha, beta = coefficients(V_dot_in, V_dot_out, r_w * r_l * r_h)
 
 # 时间参数
 t_total, dt = 3600, 1  # 总时间和时间步长
 time = np.arange(0, t_total + dt, dt)  # 时间数组
 
-# 初始化室内温度数组
-T_room = np.zeros(len(time))
-T_room[0] = T_outdoor  # 初始温度
-
-# 温度方程系数
-alpha = m_dot_ac / m_air  # 质量流速系数（1/s）
-beta = 1 / (m_air * c_p)  # 热传递系数（1/s）
-
-# 模拟循环
-for i in range(1, len(time)):
-    T_current = T_room[i - 1]
-    # 能量平衡方程
-    dTdt = - alpha * (T_current - T_ac_out) - beta * (T_current - T_outdoor)
-    T_next = T_current + dTdt * dt
-    # 更新温度
-    T_room[i] = T_next
-    # 检查是否达到目标温度
-    if season == 'winter':
-        if T_next >= T_target: # 冬季
-            print(f"At {time[i]} seconds, the indoor temperature reaches the target of {T_target}°C.")
-            T_room = T_room[:i+1]
-            time = time[:i+1]
-            times = time[i]
-            break
-    if season == 'summer':
-        if T_next <= T_target: # 夏季
-            print(f"At {time[i]} seconds, the indoor temperature reaches the target of {T_target}°C.")
-            T_room = T_room[:i+1]
-            time = time[:i+1]
-            times = time[i]
-            break
+# 能量平衡方程 dT/dt = -alpha (T - T_ac_out) - beta (T - T_outdoor) 的解析解,
+# 给出 dt 时与原来逐秒迭代 (显式欧拉) 的结果完全相同; 冬季升温、夏季降温都按第一次越过目标温度计时
+times = time_to_target(T_target, T_outdoor, T_ac_out, T_outdoor, alpha, beta, dt=dt)
+if times <= t_total:
+    print(f"At {times:g} seconds, the indoor temperature reaches the target of {T_target}°C.")
+    time = time[time <= times]
+T_room = temperature(time, T_outdoor, T_ac_out, T_outdoor, alpha, beta, dt=dt)  # 室内温度
 
 # 绘制温度随时间变化的图表
 plt.plot(time, T_room)
 plt.xlabel('Time/s')
 plt.ylabel('AVG Temperature/°C')
-plt.title(f"{season} enviroment(Target Temperature={T_target}°C time={times}s)")
+plt.title(f"{season} enviroment(Target Temperature={T_target}°C time={times:g}s)")
 plt.grid(True)
 plt.tight_layout()
 # plt.savefig(f"../figures/q1_avg_temperature_{season}.png")
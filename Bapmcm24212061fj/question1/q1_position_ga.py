@@ -7,11 +7,21 @@
 位置：(2.28, 4.00, 1.49)
 """
 
+import os
+import sys
+from functools import partial
 import numpy as np
 import matplotlib.pyplot as plt
-from deap import base, creator, tools, algorithms
+from deap import base, creator, tools
 import random
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # 引入公共模块 apmcm
+from apmcm.surrogate import ScreenedEvaluation, RBFSurrogate
+from apmcm.designs import repair_ac_genes, ac_design_batch
+from apmcm.evolution import GARunner, EarlyStopping, create_type
+from apmcm.parallel import Executor
+from apmcm.cache import ResultCache, code_version, cached
+
 # 房间和空调参数
 r_w, r_l, r_h = 5, 8, 3  # 房间尺寸（米）
 room_volume = r_w * r_l * r_h  # 房间体积（立方米）
@@ -26,7 +36,7 @@ nx, ny, nz = 40, 40, 20  # 网格点数 (x, y, z)
 x = np.linspace(0, r_w, nx)
 y = np.linspace(0, r_l, ny)
 z = np.linspace(0, r_h, nz)
-X, Y, Z = np.meshgrid(x, y, z)
+X, Y, Z = np.meshgrid(x, y, z, sparse=True)  # 可广播的一维坐标, ac_influence 按广播得到完整影响场
 T = np.full((nx, ny, nz), t_outdoor, dtype=float)
 
 # 空调影响函数
@@ -67,47 +77,80 @@ def ac_design_evaluation(individual):
     fitness = np.sum(temperature_deviation)  # 温度偏差之和作为适应度
     return fitness,
 
+# 适应度缓存与代理模型预筛选: 重复/几乎重复的个体直接取缓存,
+# 代理模型预测明显较差的后代不再做完整的网格评估
+# 40×40×20 网格上一次真实评估只需约 1 毫秒, 代理模型的预测开销与之相当, 因此默认关闭;
+# 网格加密后真实评估变贵时再打开
+use_surrogate = False  # 是否启用 RBF 代理模型
+quantum = (0.005, 0.01, 1, 1, 0.02, 0.02, 0.02)  # 各基因的量化容差 (半径, 高度, 进风口, 出风口, x, y, z)
+evaluation = ScreenedEvaluation(ac_design_evaluation, quantum, repair=repair_individual,
+                                surrogate=RBFSurrogate() if use_surrogate else None)
+
+# 按种群整体向量化评估: 每代把待评估个体组成矩阵, 影响场在种群维度上广播 (分块限制内存)
+# 两种方式都经过上面的缓存和代理模型, 只有未命中的个体才做真实评估
+batch_evaluation = True  # False 时逐个体评估
+
+# 并行执行后端: "serial" 串行 / "thread" 线程池 / "process" 进程池; workers 为线程或进程数 (None 取 CPU 核数)
+# seed 设为整数时结果可复现, 且与 backend 和 workers 无关
+backend = "serial"
+workers = None
+seed = None
+if seed is not None:
+    random.seed(seed)
+    np.random.seed(seed)
+executor = Executor(backend, workers, seed)
+T_shared = executor.share(T)  # 进程池时温度场放入共享内存, 子进程不必反复接收整个网格
+# 结果缓存目录, 例如 "../cache": 设置了 seed 且参数和代码都没变时直接读取上次的种群和 logbook (seed 为 None 时不缓存)
+cache_dir = None
+
+def repair_population(genes):
+    return repair_ac_genes(genes, (r_w, r_l, r_h))
+
+def ac_design_population_evaluation(genes):
+    return executor.map_rows(ac_design_batch, genes, x, y, z, T_shared,
+                             t_ac_out, t_target, max_ac_volume, max_ac_power, "xy")
+
 # DEAP设置
-creator.create("FitnessMin", base.Fitness, weights=(-1.0,))
-creator.create("Individual", list, fitness=creator.FitnessMin)
-
-toolbox = base.Toolbox()
-toolbox.register("attr_r", random.uniform, 0.1, 0.25)  # 空调半径范围
-toolbox.register("attr_h", random.uniform, 0.1, 2)  # 空调高度范围
-toolbox.register("attr_n_in", random.randint, 1, 5)  # 进风口数量
-toolbox.register("attr_n_out", random.randint, 1, 5)  # 出风口数量
-toolbox.register("attr_x", random.uniform, 0, r_w)  # 空调位置x
-toolbox.register("attr_y", random.uniform, 0, r_l)  # 空调位置y
-toolbox.register("attr_z", random.uniform, 0, r_h)  # 空调位置z
-
-toolbox.register("individual", tools.initCycle, creator.Individual,
-                 (toolbox.attr_r, toolbox.attr_h, toolbox.attr_n_in, toolbox.attr_n_out,
-                  toolbox.attr_x, toolbox.attr_y, toolbox.attr_z), n=1)
-toolbox.register("population", tools.initRepeat, list, toolbox.individual)
-
-# 遗传算法操作符
-toolbox.register("mate", tools.cxBlend, alpha=0.5)
-toolbox.register("mutate", tools.mutGaussian, mu=0, sigma=0.05, indpb=0.2)
-toolbox.register("select", tools.selTournament, tournsize=3)
-toolbox.register("evaluate", ac_design_evaluation)
-
-# 初始化种群
-population = toolbox.population(n=100)
-
-# 添加统计跟踪
-stats = tools.Statistics(lambda ind: ind.fitness.values)
-stats.register("avg", np.mean)
-stats.register("std", np.std)
-stats.register("min", np.min)
-stats.register("max", np.max)
+create_type("FitnessMin", base.Fitness, weights=(-1.0,))
+create_type("Individual", list, fitness=creator.FitnessMin)
+
+attributes = (
+    partial(random.uniform, 0.1, 0.25),  # 空调半径范围
+    partial(random.uniform, 0.1, 2),  # 空调高度范围
+    partial(random.randint, 1, 5),  # 进风口数量
+    partial(random.randint, 1, 5),  # 出风口数量
+    partial(random.uniform, 0, r_w),  # 空调位置x
+    partial(random.uniform, 0, r_l),  # 空调位置y
+    partial(random.uniform, 0, r_h),  # 空调位置z
+)
+
+# 提前停止: 最优值和平均值连续 10 代没有改进即结束, ngen 只作为上限; stopping=None 时跑满 ngen 代
+# 还可以设置 time_budget (秒) 和 max_evaluations (评估次数) 预算
+runner = GARunner(creator.Individual, attributes,
+                  evaluate=evaluation,
+                  batch_evaluate=(partial(evaluation.batch, ac_design_population_evaluation)
+                                  if batch_evaluation else None),
+                  repair=repair_population if batch_evaluation else None,
+                  pop_size=100, cxpb=0.7, mutpb=0.2,
+                  ngen=50,  # 代数上限
+                  map_function=partial(evaluation.map, executor.map),  # 缓存在主进程, 只把真实评估分给执行后端
+                  stopping=EarlyStopping(stall=10))
 
 # 遗传算法运行
-population, logbook = algorithms.eaSimple(population, toolbox,
-                                           cxpb=0.7, mutpb=0.2,
-                                           ngen=50,  # 代数
-                                           stats=stats,
-                                           halloffame=tools.HallOfFame(1),  # 存储最佳个体
-                                           verbose=True)
+def optimize():
+    population, logbook = runner.run(verbose=True)
+    return population, logbook, f"{runner.report()}\n{evaluation.report()}"
+
+cache_params = {"room": (r_w, r_l, r_h), "grid": (nx, ny, nz), "max_ac_volume": max_ac_volume,
+                "max_ac_power": max_ac_power, "t_target": t_target, "t_ac_out": t_ac_out, "t_outdoor": t_outdoor,
+                "use_surrogate": use_surrogate, "quantum": quantum, "batch_evaluation": batch_evaluation,
+                "seed": seed, "ga": runner.settings()}
+result_cache = None
+if cache_dir and seed is not None:
+    result_cache = ResultCache(cache_dir, version=code_version(ac_influence, repair_individual, ac_design_evaluation))
+population, logbook, report = cached(result_cache, cache_params, optimize)
+executor.close()
+print(report)
 
 # 提取最佳设计
 best_individual = tools.selBest(population, 1)[0]
@@ -0,0 +1,105 @@
+"""
+此段代码用于 q1_position_ga.py 空调设计的多目标版本 (NSGA-II):
+温度偏差、功耗和体积同时最小化, 体积和功耗上限用约束支配处理而不是返回 1e6, 不可行设计不再计算温度场;
+评估结果按基因缓存、跨代共享, 得到的 Pareto 存档可以保存, 下次运行时载入继续优化 (热启动)
+"""
+import os
+import sys
+from functools import partial
+import numpy as np
+import matplotlib.pyplot as plt
+from deap import creator
+import random
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # 引入公共模块 apmcm
+from apmcm.designs import repair_ac_genes, ac_design_objectives
+from apmcm.evolution import create_type
+from apmcm.multiobjective import ConstrainedFitness, ParetoArchive, NSGA2Runner
+
+# 房间和空调参数 (与 q1_position_ga.py 相同)
+r_w, r_l, r_h = 5, 8, 3  # 房间尺寸（米）
+max_ac_volume = 0.1  # 最大空调体积（立方米）
+max_ac_power = 1800  # 最大空调功耗（瓦）
+t_target = 24  # 室内目标温度（摄氏度）
+t_ac_out = 24  # 空调出风口温度（摄氏度）
+t_outdoor = 5  # 室外初始温度（摄氏度）
+
+# 初始化温度场
+nx, ny, nz = 40, 40, 20  # 网格点数 (x, y, z)
+x = np.linspace(0, r_w, nx)
+y = np.linspace(0, r_l, ny)
+z = np.linspace(0, r_h, nz)
+T = np.full((nx, ny, nz), t_outdoor, dtype=float)
+
+quantum = (0.005, 0.01, 1, 1, 0.02, 0.02, 0.02)  # 评估缓存的量化容差 (半径, 高度, 进风口, 出风口, x, y, z)
+
+# Pareto 存档文件: 存在时载入作为热启动, 运行结束后写回; None 时不保存
+archive_path = None  # 例如 "../figures/q1_pareto_archive.json"
+params = {"room": (r_w, r_l, r_h), "grid": (nx, ny, nz), "max_ac_volume": max_ac_volume,
+          "max_ac_power": max_ac_power, "t_target": t_target, "t_ac_out": t_ac_out, "t_outdoor": t_outdoor}
+
+seed = None
+if seed is not None:
+    random.seed(seed)
+    np.random.seed(seed)
+
+def repair_population(genes):
+    return repair_ac_genes(genes, (r_w, r_l, r_h))
+
+def ac_population_objectives(genes):
+    return ac_design_objectives(genes, x, y, z, T, t_ac_out, t_target, max_ac_volume, max_ac_power, "xy")
+
+# DEAP设置: 温度偏差、功耗和体积都最小化
+create_type("FitnessAC", ConstrainedFitness, weights=(-1.0, -1.0, -1.0))
+create_type("ACIndividual", list, fitness=creator.FitnessAC)
+
+attributes = (
+    partial(random.uniform, 0.1, 0.25),  # 空调半径范围
+    partial(random.uniform, 0.1, 2),  # 空调高度范围
+    partial(random.randint, 1, 5),  # 进风口数量
+    partial(random.randint, 1, 5),  # 出风口数量
+    partial(random.uniform, 0, r_w),  # 空调位置x
+    partial(random.uniform, 0, r_l),  # 空调位置y
+    partial(random.uniform, 0, r_h),  # 空调位置z
+)
+
+if archive_path is not None and os.path.exists(archive_path):
+    archive = ParetoArchive.load(archive_path, creator.ACIndividual, params=params)
+    print(f"载入 Pareto 存档 {len(archive)} 个设计" + ("" if archive.compatible else " (参数已改变, 重新评估)"))
+else:
+    archive = ParetoArchive(params=params)
+
+runner = NSGA2Runner(creator.ACIndividual, attributes,
+                     objectives=ac_population_objectives, quantum=quantum, repair=repair_population,
+                     pop_size=100, cxpb=0.7, mutpb=0.2, ngen=50, archive=archive)
+
+# 运行 NSGA-II
+population, logbook = runner.run(verbose=True)
+print(runner.report())
+if archive_path is not None:
+    archive.save(archive_path)
+
+# 温度偏差最小的设计与 Pareto 前沿的范围
+values, genes = archive.arrays()
+best = np.argmin(values[:, 0])
+print("\n温度偏差最小的空调设计：")
+print(f"半径：{genes[best, 0]:.2f} m")
+print(f"高度：{genes[best, 1]:.2f} m")
+print(f"进风口数量：{int(genes[best, 2])}")
+print(f"出风口数量：{int(genes[best, 3])}")
+print(f"位置：({genes[best, 4]:.2f}, {genes[best, 5]:.2f}, {genes[best, 6]:.2f})")
+print(f"温度偏差 {values[best, 0]:.1f}, 功耗 {values[best, 1]:.1f} W, 体积 {values[best, 2]:.4f} m³")
+print(f"Pareto 前沿: 功耗 {values[:, 1].min():.1f} ~ {values[:, 1].max():.1f} W, "
+      f"体积 {values[:, 2].min():.4f} ~ {values[:, 2].max():.4f} m³")
+
+# 绘制 Pareto 前沿: 温度偏差与功耗, 颜色表示体积
+plt.figure(figsize=(10, 6))
+points = plt.scatter(values[:, 1], values[:, 0], c=values[:, 2], cmap="viridis")
+plt.colorbar(points, label="Volume (m³)")
+plt.xlabel("Power (W)")
+plt.ylabel("Temperature Deviation")
+plt.title("NSGA-II Pareto front: temperature deviation vs power and volume")
+plt.grid(True)
+plt.tight_layout()
+# plt.savefig("../figures/q1_ac_design_pareto_nsga2.png")
+plt.show()
@@ -7,11 +7,20 @@
 出风口数量 N_out = 4
 最佳 CADR = 576.00 m³/h
 """
+import os
+import sys
+from functools import partial
 import numpy as np
 import matplotlib.pyplot as plt
-from deap import base, creator, tools, algorithms
+from deap import base, creator, tools
 import random
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # 引入公共模块 apmcm
+from apmcm.designs import purifier_cadr_batch
+from apmcm.evolution import GARunner, EarlyStopping, create_type
+from apmcm.parallel import Executor
+from apmcm.cache import ResultCache, code_version, cached
+
 # 房间和净化器参数
 r_w, r_l, r_h = 5, 8, 3  # 房间尺寸（米）
 ROOM_VOLUME = r_w * r_l * r_h  # 房间体积（立方米）
@@ -49,46 +58,59 @@ def air_purifier_design(individual):
 
     return (cadr,)  # 返回CADR作为适应度
 
+# 按种群整体向量化评估 (与 air_purifier_design 逐项对应), False 时逐个体评估
+batch_evaluation = True
+
+# 并行执行后端: "serial" 串行 / "thread" 线程池 / "process" 进程池; workers 为线程或进程数 (None 取 CPU 核数)
+# seed 设为整数时结果可复现, 且与 backend 和 workers 无关
+backend = "serial"
+workers = None
+seed = None
+if seed is not None:
+    random.seed(seed)
+    np.random.seed(seed)
+executor = Executor(backend, workers, seed)
+# 结果缓存目录, 例如 "../cache": 设置了 seed 且参数和代码都没变时直接读取上次的种群和 logbook (seed 为 None 时不缓存)
+cache_dir = None
+
+def air_purifier_population_design(genes):
+    return executor.map_rows(purifier_cadr_batch, genes, ROOM_VOLUME, DEVICE_VOLUME, MAX_FLOW, MAX_POWER, K_FILTER)
+
 # DEAP设置
-creator.create("FitnessMax", base.Fitness, weights=(1.0,))
-creator.create("Individual", list, fitness=creator.FitnessMax)
-
-toolbox = base.Toolbox()
-toolbox.register("attr_D", random.uniform, 0.1, 0.5)  # 直径
-toolbox.register("attr_H", random.uniform, 0.5, 1.5)  # 高度
-toolbox.register("attr_filter", random.randint, 1, 5)  # 滤网层数
-toolbox.register("attr_inlet", random.randint, 1, 3)  # 进风口数量
-toolbox.register("attr_outlet", random.randint, 1, 3)  # 出风口数量
-
-# 个体和种群初始化
-toolbox.register("individual", tools.initCycle, creator.Individual,
-                 (toolbox.attr_D, toolbox.attr_H, toolbox.attr_filter,
-                  toolbox.attr_inlet, toolbox.attr_outlet), n=1)
-toolbox.register("population", tools.initRepeat, list, toolbox.individual)
-
-# 遗传算法操作符
-toolbox.register("mate", tools.cxBlend, alpha=0.5)
-toolbox.register("mutate", tools.mutGaussian, mu=0, sigma=0.05, indpb=0.2)
-toolbox.register("select", tools.selTournament, tournsize=3)
-toolbox.register("evaluate", air_purifier_design)
-
-# 初始化种群
-population = toolbox.population(n=100)
-
-# 添加统计跟踪
-stats = tools.Statistics(lambda ind: ind.fitness.values)
-stats.register("avg", np.mean)
-stats.register("std", np.std)
-stats.register("min", np.min)
-stats.register("max", np.max)
+create_type("FitnessMax", base.Fitness, weights=(1.0,))
+create_type("Individual", list, fitness=creator.FitnessMax)
+
+attributes = (
+    partial(random.uniform, 0.1, 0.5),  # 直径
+    partial(random.uniform, 0.5, 1.5),  # 高度
+    partial(random.randint, 1, 5),  # 滤网层数
+    partial(random.randint, 1, 3),  # 进风口数量
+    partial(random.randint, 1, 3),  # 出风口数量
+)
+
+# 提前停止: 最优值和平均值连续 10 代没有改进即结束, ngen 只作为上限; stopping=None 时跑满 ngen 代
+runner = GARunner(creator.Individual, attributes,
+                  evaluate=air_purifier_design,
+                  batch_evaluate=air_purifier_population_design if batch_evaluation else None,
+                  pop_size=100, cxpb=0.7, mutpb=0.2,
+                  ngen=50,  # 代数上限
+                  map_function=executor.map,
+                  stopping=EarlyStopping(stall=10))
 
 # 运行遗传算法
-population, logbook = algorithms.eaSimple(population, toolbox,
-                                          cxpb=0.7, mutpb=0.2,
-                                          ngen=50,  # 代数
-                                          stats=stats,
-                                          halloffame=tools.HallOfFame(1),  # 存储最佳个体
-                                          verbose=True)
+def optimize():
+    population, logbook = runner.run(verbose=True)
+    return population, logbook, runner.report()
+
+cache_params = {"room_volume": ROOM_VOLUME, "device_volume": DEVICE_VOLUME, "max_flow": MAX_FLOW,
+                "max_power": MAX_POWER, "k_filter": K_FILTER, "batch_evaluation": batch_evaluation,
+                "seed": seed, "ga": runner.settings()}
+result_cache = None
+if cache_dir and seed is not None:
+    result_cache = ResultCache(cache_dir, version=code_version(air_purifier_design))
+population, logbook, report = cached(result_cache, cache_params, optimize)
+executor.close()
+print(report)
 
 # 提取所有个体的CADR值并计算平均值
 cadr_values = [ind.fitness.values[0] for ind in population]
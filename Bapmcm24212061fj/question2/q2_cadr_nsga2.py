@@ -0,0 +1,95 @@
+"""
+此段代码用于 q2_cadr_design.py 净化器设计的多目标版本 (NSGA-II):
+CADR (越大越好)、功耗和体积 (越小越好) 同时作为目标, 体积和功耗上限用约束支配处理而不是返回 (0,),
+评估结果按基因缓存、跨代共享, 得到的 Pareto 存档可以保存, 下次运行时载入继续优化 (热启动)
+"""
+import os
+import sys
+from functools import partial
+import numpy as np
+import matplotlib.pyplot as plt
+from deap import creator
+import random
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # 引入公共模块 apmcm
+from apmcm.designs import repair_purifier_genes, purifier_design_objectives
+from apmcm.evolution import create_type
+from apmcm.multiobjective import ConstrainedFitness, ParetoArchive, NSGA2Runner
+
+# 房间和净化器参数 (与 q2_cadr_design.py 相同)
+r_w, r_l, r_h = 5, 8, 3  # 房间尺寸（米）
+ROOM_VOLUME = r_w * r_l * r_h  # 房间体积（立方米）
+DEVICE_VOLUME = 0.1  # 净化器最大体积（立方米）
+MAX_FLOW = 600  # 最大气流量（立方米/小时）
+MAX_POWER = 1800  # 最大功耗（瓦特）
+K_FILTER = 0.8  # 过滤器效率常数
+
+# 各基因的取值范围 (直径, 高度, 滤网层数, 进风口数量, 出风口数量), 与 q2_design_space.py 的设计空间相同
+bounds = [(0.1, 0.5), (0.5, 1.5), (1, 5), (1, 3), (1, 3)]
+quantum = (1e-6, 1e-6, 1, 1, 1)  # 评估缓存的量化步长
+
+# Pareto 存档文件: 存在时载入作为热启动, 运行结束后写回; None 时不保存
+archive_path = None  # 例如 "../figures/q2_pareto_archive.json"
+params = {"room_volume": ROOM_VOLUME, "device_volume": DEVICE_VOLUME, "max_flow": MAX_FLOW,
+          "max_power": MAX_POWER, "k_filter": K_FILTER, "bounds": bounds}
+
+seed = None
+if seed is not None:
+    random.seed(seed)
+    np.random.seed(seed)
+
+def repair_population(genes):
+    return repair_purifier_genes(genes, bounds)
+
+def purifier_population_objectives(genes):
+    return purifier_design_objectives(genes, ROOM_VOLUME, DEVICE_VOLUME, MAX_FLOW, MAX_POWER, K_FILTER)
+
+# DEAP设置: 最大化 CADR, 最小化功耗和体积
+create_type("FitnessPurifier", ConstrainedFitness, weights=(1.0, -1.0, -1.0))
+create_type("PurifierIndividual", list, fitness=creator.FitnessPurifier)
+
+attributes = (
+    partial(random.uniform, 0.1, 0.5),  # 直径
+    partial(random.uniform, 0.5, 1.5),  # 高度
+    partial(random.randint, 1, 5),  # 滤网层数
+    partial(random.randint, 1, 3),  # 进风口数量
+    partial(random.randint, 1, 3),  # 出风口数量
+)
+
+if archive_path is not None and os.path.exists(archive_path):
+    archive = ParetoArchive.load(archive_path, creator.PurifierIndividual, params=params)
+    print(f"载入 Pareto 存档 {len(archive)} 个设计" + ("" if archive.compatible else " (参数已改变, 重新评估)"))
+else:
+    archive = ParetoArchive(params=params)
+
+runner = NSGA2Runner(creator.PurifierIndividual, attributes,
+                     objectives=purifier_population_objectives, quantum=quantum, repair=repair_population,
+                     pop_size=100, cxpb=0.7, mutpb=0.2, ngen=50, archive=archive)
+
+# 运行 NSGA-II
+population, logbook = runner.run(verbose=True)
+print(runner.report())
+if archive_path is not None:
+    archive.save(archive_path)
+
+# Pareto 前沿: 各功耗下 CADR 最大的设计
+values, genes = archive.arrays()
+print("\nPareto 前沿中各功耗下 CADR 最大的设计：")
+print(f"{'功耗 (W)':>8} {'D (m)':>6} {'H (m)':>6} {'滤网':>4} {'进风':>4} {'出风':>4} {'体积 (m³)':>10} {'CADR (m³/h)':>12}")
+for power in np.unique(values[:, 1]):
+    i = np.flatnonzero(values[:, 1] == power)
+    i = i[np.argmax(values[i, 0])]
+    print(f"{power:>10.0f} {genes[i, 0]:>6.3f} {genes[i, 1]:>6.3f} {int(genes[i, 2]):>6d} "
+          f"{int(genes[i, 3]):>6d} {int(genes[i, 4]):>6d} {values[i, 2]:>11.4f} {values[i, 0]:>13.2f}")
+
+# 绘制 Pareto 前沿: CADR 与体积, 颜色表示功耗
+plt.figure(figsize=(10, 6))
+points = plt.scatter(values[:, 2], values[:, 0], c=values[:, 1], cmap="plasma")
+plt.colorbar(points, label="Power (W)")
+plt.xlabel("Volume (m³)")
+plt.ylabel("CADR (m³/h)")
+plt.title("NSGA-II Pareto front: CADR vs power and volume")
+plt.grid(True)
+plt.tight_layout()
+# plt.savefig("../figures/q2_CADR_pareto_nsga2.png")
+plt.show()
@@ -0,0 +1,75 @@
+"""
+此段代码用于穷举 q2_cadr_design.py 的净化器设计空间:
+整数基因 (滤网层数、进风口数、出风口数) 逐一枚举, 直径和高度取稠密网格, 一次向量化计算全部设计,
+输出 CADR 最大的可行设计和 CADR / 功耗 / 体积的 Pareto 前沿, 并绘制 (D, H) 上的最优 CADR 热力图和前沿散点图
+"""
+import os
+import sys
+import time
+
+import numpy as np
+import matplotlib.pyplot as plt
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # 引入公共模块 apmcm
+from apmcm.design_space import PurifierDesignSpace
+
+# 房间和净化器参数 (与 q2_cadr_design.py 相同)
+r_w, r_l, r_h = 5, 8, 3  # 房间尺寸（米）
+ROOM_VOLUME = r_w * r_l * r_h  # 房间体积（立方米）
+DEVICE_VOLUME = 0.1  # 净化器最大体积（立方米）
+MAX_FLOW = 600  # 最大气流量（立方米/小时）
+MAX_POWER = 1800  # 最大功耗（瓦特）
+K_FILTER = 0.8  # 过滤器效率常数
+
+# 设计空间: 取值范围与 q2_cadr_design.py 的初始种群相同, 直径和高度的网格点数决定热力图分辨率
+D = np.linspace(0.1, 0.5, 401)  # 直径
+H = np.linspace(0.5, 1.5, 301)  # 高度
+n_filter = np.arange(1, 6)  # 滤网层数
+n_in = np.arange(1, 4)  # 进风口数量
+n_out = np.arange(1, 4)  # 出风口数量
+
+start = time.perf_counter()
+space = PurifierDesignSpace(D, H, n_filter, n_in, n_out, ROOM_VOLUME, DEVICE_VOLUME, MAX_FLOW, MAX_POWER, K_FILTER)
+best_map = space.best_cadr_map()
+front = space.pareto()
+best = space.best()
+print(f"共 {np.prod(space.shape)} 个设计, 其中可行 {np.count_nonzero(space.feasible)} 个, "
+      f"耗时 {time.perf_counter() - start:.2f} 秒")
+
+print("\n最佳净化器设计：")
+print(f"直径 D = {best['D']:.2f} m")
+print(f"高度 H = {best['H']:.2f} m")
+print(f"滤网层数 N_filter = {best['N_filter']}")
+print(f"进风口数量 N_in = {best['N_in']}")
+print(f"出风口数量 N_out = {best['N_out']}")
+print(f"最佳 CADR = {best['CADR']:.2f} m³/h (功耗 {best['power']:.0f} W, 体积 {best['volume']:.4f} m³)")
+
+print(f"\nPareto 前沿共 {len(front['CADR'])} 个设计 (CADR 越大越好, 功耗和体积越小越好), 各功耗下 CADR 最大的设计:")
+print(f"{'功耗 (W)':>8} {'D (m)':>6} {'H (m)':>6} {'滤网':>4} {'进风':>4} {'出风':>4} {'体积 (m³)':>10} {'CADR (m³/h)':>12}")
+for power in np.unique(front["power"]):
+    i = np.flatnonzero(front["power"] == power)
+    i = i[np.argmax(front["CADR"][i])]
+    print(f"{power:>10.0f} {front['D'][i]:>6.3f} {front['H'][i]:>6.3f} {front['N_filter'][i]:>6d} "
+          f"{front['N_in'][i]:>6d} {front['N_out'][i]:>6d} {front['volume'][i]:>11.4f} {front['CADR'][i]:>13.2f}")
+
+# 最优 CADR 热力图, 白色区域没有满足约束的设计
+fig, axes = plt.subplots(1, 2, figsize=(14, 6))
+image = axes[0].pcolormesh(H, D, best_map, shading="auto", cmap="viridis")
+fig.colorbar(image, ax=axes[0], label="Best CADR (m³/h)")
+axes[0].plot(best["H"], best["D"], "r*", markersize=12, label="Best design")
+axes[0].set_xlabel("Height H (m)")
+axes[0].set_ylabel("Diameter D (m)")
+axes[0].set_title("Best CADR over integer genes")
+axes[0].legend()
+
+# Pareto 前沿: CADR 与体积, 颜色表示功耗
+points = axes[1].scatter(front["volume"], front["CADR"], c=front["power"], s=8, cmap="plasma")
+fig.colorbar(points, ax=axes[1], label="Power (W)")
+axes[1].set_xlabel("Volume (m³)")
+axes[1].set_ylabel("CADR (m³/h)")
+axes[1].set_title("Pareto front: CADR vs power and volume")
+axes[1].grid(True)
+
+plt.tight_layout()
+# plt.savefig("../figures/q2_design_space.png")
+plt.show()
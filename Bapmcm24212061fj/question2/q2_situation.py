@@ -1,15 +1,33 @@
+import os
+import sys
 import numpy as np
 import matplotlib.pyplot as plt
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # 引入公共模块 apmcm
+from apmcm.solver import Grid, FieldSolver, DecaySink
+from apmcm.modes import run_configured
+from apmcm.stream import RunningStats
+
 # 房间和净化器参数
 r_w, r_l, r_h = 5, 8, 3  # 房间尺寸（米）
 ROOM_VOLUME = r_w * r_l * r_h  # 房间体积（立方米）
 D_DIFF = 5e-4  # 扩散系数（平方米/秒）
 PM_INIT = 100  # 初始污染物浓度（微克/立方米）
 T_SIM, DT = 6000, 0.1  # 总步数，步长
+SCHEME = "explicit"  # 扩散项时间积分格式: "explicit" / "cn" / "adi" (隐式格式可用更大的 DT)
+SPECTRAL = False  # True 时用 DST 谱方法直接求出 times 时刻的浓度场, 不再逐步迭代
 times = T_SIM * DT
+SNAPSHOT_TIMES = [times]  # 一次模拟依次输出多个时刻的浓度场并各自出图, 例如 [30, 300, 600] (秒)
+CHECKPOINT_DIR = None  # 检查点目录, 例如 "../checkpoints"; None 时不保存检查点
+CHECKPOINT_EVERY = 1000  # 每隔多少步写一次检查点
+RESUME = True  # 已有同参数的检查点时从中继续, 不再从 0 秒开始
+SERIES_EVERY = None  # 每隔多少秒流式输出一次, 逐帧统计平均/最小/最大浓度 (不保存完整的场), 例如 10
+SERIES_DIR = None  # 同时把各帧浓度场写入该目录的分块存储, 例如 "../series/q2"; None 时只统计
+CACHE_DIR = None  # 结果缓存目录, 例如 "../cache"; 参数和代码都没变时直接读取上次的浓度场, 不再重新模拟
+FIELDS_PATH = None  # 保存各输出时刻的浓度场和净化器影响场, 供 render_figures.py 批量出图, 例如 "../fields/q2.npz"
 print(f"当前运行时间:{times}s")
 NX, NY, NZ = 40, 40, 20  # 网格点数 (x, y, z)
+DTYPE = np.float64  # 场的浮点类型: np.float64 双精度 / np.float32 单精度
 
 # 净化器设计参数
 D_best = 0.27  # 直径 (m)
@@ -20,64 +38,53 @@ N_out = 3  # 出风口数量
 CADR_best = 576.00  # 最佳 CADR (m³/h)
 radius = 1  # 净化器影响半径
 
-# 净化器高斯影响函数
-def purifier_influence(X, Y, Z, pos, radius):
-    dist = np.sqrt((X - pos[0])**2 + (Y - pos[1])**2 + (Z - pos[2])**2)
-    return np.exp(-dist**2 / (2 * radius**2))
-
-# 初始化污染物浓度和净化器影响
-dx, dy, dz = r_w / (NX - 1), r_l / (NY - 1), r_h / (NZ - 1)
-x, y, z = np.linspace(0, r_w, NX), np.linspace(0, r_l, NY), np.linspace(0, r_h, NZ)
-X, Y, Z = np.meshgrid(x, y, z, indexing='ij')
+# 初始化网格和净化器影响
+grid = Grid((r_w, r_l, r_h), (NX, NY, NZ), dtype=DTYPE)
+x, y, z = grid.x, grid.y, grid.z
+X, Y, Z = grid.meshgrid(sparse=True)  # 可广播的一维坐标, 只在画散点图时展开
 
-C = np.ones((NX, NY, NZ)) * PM_INIT  # 初始污染物浓度
 pur_position = (r_w / 2, r_l / 2, H_best / 2)  # 净化器位置
-I = purifier_influence(X, Y, Z, pur_position, radius=radius)
+I = grid.influence(pur_position, radius)  # 净化器高斯影响场
 
-# 扩散和净化模拟
+# 扩散和净化模拟: 初始浓度 PM_INIT, 浓度限制在 [0, PM_INIT], 墙面保持 PM_INIT
 K_FILTER = 0.8  # 过滤器效率常数
-for t in range(T_SIM):
-    laplacian = (
-        (np.roll(C, 1, axis=0) - 2 * C + np.roll(C, -1, axis=0)) / dx**2 +
-        (np.roll(C, 1, axis=1) - 2 * C + np.roll(C, -1, axis=1)) / dy**2 +
-        (np.roll(C, 1, axis=2) - 2 * C + np.roll(C, -1, axis=2)) / dz**2
-    )
-    # 更新污染物浓度
-    C_new = C + D_DIFF * laplacian * DT
-    C_new *= (1 - K_FILTER * I * DT)  # 净化器影响
-    C_new = np.clip(C_new, 0, PM_INIT)  # 限制浓度范围
+solver = FieldSolver(grid, D_DIFF, PM_INIT, boundary=PM_INIT,
+                     sources=[DecaySink(I, K_FILTER)], clamp=(0, PM_INIT), dt=DT, scheme=SCHEME)
+series = RunningStats()
+snapshots = run_configured(solver, SNAPSHOT_TIMES, spectral=SPECTRAL, series_every=SERIES_EVERY, series=series,
+                           series_dir=SERIES_DIR, checkpoint_dir=CHECKPOINT_DIR, checkpoint_every=CHECKPOINT_EVERY,
+                           resume=RESUME, cache_dir=CACHE_DIR, fields_path=FIELDS_PATH, arrays={"influence": I})
+for t, mean in zip(series.times, series.mean):  # 只有流式输出时才有逐帧统计
+    print(f"t = {t}s, 平均浓度 {mean:.2f} µg/m³")
 
-    # 设置边界条件
-    C_new[0, :, :] = C_new[-1, :, :] = C_new[:, 0, :] = C_new[:, -1, :] = C_new[:, :, 0] = C_new[:, :, -1] = PM_INIT
-    C = C_new
+# 可视化污染物浓度分布 (每个输出时刻各画一组)
+for times, C in snapshots:
+    # 横截面（z=中间高度）
+    fig1, ax1 = plt.subplots(figsize=(8, 6))
+    cross_section = C[:, :, NZ // 2]  # 中间高度的横截面
+    im = ax1.contourf(x, y, cross_section.T, levels=50, cmap='coolwarm')
+    plt.colorbar(im, ax=ax1, label="PM2.5 Concentration (µg/m³)")
+    ax1.set_title(f'PM2.5 Concentration (Cross-Section, t={times}s)')
+    ax1.set_xlabel("Width/m")
+    ax1.set_ylabel("Length/m")
+    plt.tight_layout()
+    plt.savefig(f'../figures/q2_PM2.5_cross_section_{times}s.png')
 
-# 可视化污染物浓度分布
-# 横截面（z=中间高度）
-fig1, ax1 = plt.subplots(figsize=(8, 6))
-cross_section = C[:, :, NZ // 2]  # 中间高度的横截面
-im = ax1.contourf(x, y, cross_section.T, levels=50, cmap='coolwarm')
-plt.colorbar(im, ax=ax1, label="PM2.5 Concentration (µg/m³)")
-ax1.set_title(f'PM2.5 Concentration (Cross-Section, t={times}s)')
-ax1.set_xlabel("Width/m")
-ax1.set_ylabel("Length/m")
-plt.tight_layout()
-plt.savefig(f'../figures/q2_PM2.5_cross_section_{times}s.png')
-
-# 三维散点图
-fig2 = plt.figure()
-ax2 = fig2.add_subplot(projection='3d')
-sc = ax2.scatter(
-    X.ravel(), Y.ravel(), Z.ravel(),
-    c=C.ravel(), cmap="coolwarm", s=1.5, alpha=0.5
-)
-ax2.set_title("PM2.5 Distribution (3D View)")
-ax2.set_xlabel("Width/m")
-ax2.set_ylabel("Length/m")
-ax2.set_zlabel("Height/m")
-cbar = plt.colorbar(sc, ax=ax2, shrink=0.5, pad=0.1)
-cbar.set_label("PM2.5 Concentration (µg/m³)")
-plt.tight_layout()
-plt.savefig(f'../figures/q2_PM2.5_3D_{times}s.png')
+    # 三维散点图
+    fig2 = plt.figure()
+    ax2 = fig2.add_subplot(projection='3d')
+    sc = ax2.scatter(
+        *(axis.ravel() for axis in np.broadcast_arrays(X, Y, Z)),
+        c=C.ravel(), cmap="coolwarm", s=1.5, alpha=0.5
+    )
+    ax2.set_title("PM2.5 Distribution (3D View)")
+    ax2.set_xlabel("Width/m")
+    ax2.set_ylabel("Length/m")
+    ax2.set_zlabel("Height/m")
+    cbar = plt.colorbar(sc, ax=ax2, shrink=0.5, pad=0.1)
+    cbar.set_label("PM2.5 Concentration (µg/m³)")
+    plt.tight_layout()
+    plt.savefig(f'../figures/q2_PM2.5_3D_{times}s.png')
 
 plt.show()
 
@@ -99,7 +106,7 @@ plt.tight_layout()
 fig2 = plt.figure()
 ax2 = fig2.add_subplot(projection='3d')
 sc = ax2.scatter(
-    X.ravel(), Y.ravel(), Z.ravel(),
+    *(axis.ravel() for axis in np.broadcast_arrays(X, Y, Z)),
     c=I.ravel(),  # 使用污染值决定颜色
     cmap="BuGn",  # 可以选择其他颜色映射，如 'coolwarm', 'viridis' 等
     s=1.5, alpha=0.8  # 调整点的大小和透明度
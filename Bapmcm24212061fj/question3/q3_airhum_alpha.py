@@ -1,10 +1,9 @@
-# 湿度扩散系数计算
-def humidity_diffusion_coefficient(T):
-    # 基于温度计算扩散系数
-    D0 = 2.4e-5  # 参考扩散系数 (m²/s) at 25°C
-    T0 = 298.15  # 参考温度 (K) (25°C)
-    T_kelvin = T + 273.15  # 转换为开尔文
-    return D0 * (T_kelvin / T0) ** 1.75
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # 引入公共模块 apmcm
+# 湿度扩散系数计算 (函数放在 apmcm/air.py 中, 供第四问的耦合模拟按温度场逐点计算)
+from apmcm.air import humidity_diffusion_coefficient
 
 # 使用示例：室温 25°C
 current_temp = 25  # 当前温度 (°C)
@@ -1,6 +1,14 @@
+import os
+import sys
 import numpy as np
 import matplotlib.pyplot as plt
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # 引入公共模块 apmcm
+from apmcm.solver import Grid, FieldSolver, ConstantSource
+from apmcm.modes import run_configured
+from apmcm.stream import RunningStats
+from apmcm.stopping import FractionReached, SteadyState
+
 # 房间尺寸
 r_w, r_l, r_h = 5, 8, 3  # 房间的宽、长、高 (米)
 
@@ -17,52 +25,57 @@ radius = 1 # 作用半径
 
 # 网格划分
 nx, ny, nz = 40, 40, 30  # 网格分辨率 (x, y, z)
-x = np.linspace(0, r_w, nx)
-y = np.linspace(0, r_l, ny)
-z = np.linspace(0, r_h, nz)
-X, Y, Z = np.meshgrid(x, y, z, indexing="ij")
-
-# 初始化湿度场
-humidity = np.full((nx, ny, nz), initial_humidity, dtype=float)
+dtype = np.float64  # 场的浮点类型: np.float64 双精度 / np.float32 单精度
+grid = Grid((r_w, r_l, r_h), (nx, ny, nz), dtype=dtype)
+x, y, z = grid.x, grid.y, grid.z
+X, Y, Z = grid.meshgrid(sparse=True)  # 可广播的一维坐标, 不生成完整的三维网格
 
-# 加湿器影响区域函数 (基于高斯分布)
-def humidifier_influence(x, y, z, position, radius):
-    dist = np.sqrt((x - position[0])**2 + (y - position[1])**2 + (z - position[2])**2)
-    return np.exp(-dist**2 / (2 * radius**2))
+# 加湿器影响区域 (基于高斯分布, 位置和半径不随时间变化, 在迭代前计算一次)
+influence = grid.influence(humidifier_position, humidifier_radius + radius)
 
 # 设置模拟参数
 time_steps = 3000  # 模拟时间步数
 dt = 0.1  # 时间步长 (秒)
+scheme = "explicit"  # 扩散项时间积分格式: "explicit" / "cn" / "adi" (隐式格式可用更大的 dt)
+snapshot_times = [time_steps * dt]  # 一次模拟依次输出多个时刻的湿度场, 例如 [30, 300] (秒)
+checkpoint_dir = None  # 检查点目录, 例如 "../checkpoints"; None 时不保存检查点
+checkpoint_every = 1000  # 每隔多少步写一次检查点
+resume = True  # 已有同参数的检查点时从中继续, 不再从 0 秒开始
+series_every = None  # 每隔多少秒流式输出一次, 逐帧统计平均湿度和达到目标湿度的内部格点占比, 例如 10
+series_dir = None  # 同时把各帧湿度场写入该目录的分块存储, 例如 "../series/q3"; None 时只统计
+stop_check_every = None  # 每隔多少步检查一次停止条件, 90% 的内部格点达到目标湿度或湿度场接近稳态即提前结束, 例如 100
+cache_dir = None  # 结果缓存目录, 例如 "../cache"; 参数和代码都没变时直接读取上次的湿度场, 不再重新模拟
+fields_path = None  # 保存各输出时刻的湿度场和加湿器影响场, 供 render_figures.py 批量出图, 例如 "../fields/q3.npz"
 print(f"当前运行时间是{time_steps * dt}s")
 diffusion_coeff = 2.4e-5  # 湿度扩散系数 (单位: m^2/s) 标准大气压,24℃的情况下
 
-# 开始模拟湿度扩散
-for t in range(time_steps):
-    influence = humidifier_influence(X, Y, Z, humidifier_position, humidifier_radius + radius)
-    humidity += influence * humidifier_strength * dt  # 加湿器增加湿度
-    # 使用拉普拉斯算子计算湿度的扩散效应
-    laplacian_x = (np.roll(humidity, 1, axis=0) + np.roll(humidity, -1, axis=0) - 2 * humidity) / (x[1] - x[0])**2
-    laplacian_y = (np.roll(humidity, 1, axis=1) + np.roll(humidity, -1, axis=1) - 2 * humidity) / (y[1] - y[0])**2
-    laplacian_z = (np.roll(humidity, 1, axis=2) + np.roll(humidity, -1, axis=2) - 2 * humidity) / (z[1] - z[0])**2
-    laplacian = laplacian_x + laplacian_y + laplacian_z
-    humidity += diffusion_coeff * laplacian * dt  # 更新湿度分布
-    # 限制湿度在合理范围内
-    humidity = np.clip(humidity, initial_humidity, target_humidity)
-
-    # 墙壁不穿透，初始湿度，确保墙体为绝热且湿度不穿透
-    humidity[0, :, :] = humidity[-1, :, :] = humidity[:, 0, :] = humidity[:, -1, :] = humidity[:, :, 0] = humidity[:, :, -1] = initial_humidity
-
+# 开始模拟湿度扩散: 加湿器增加湿度, 湿度限制在 [初始湿度, 目标湿度],
+# 墙壁不穿透, 保持初始湿度
+solver = FieldSolver(grid, diffusion_coeff, initial_humidity, boundary=initial_humidity,
+                     sources=[ConstantSource(influence, humidifier_strength)],
+                     clamp=(initial_humidity, target_humidity), dt=dt, scheme=scheme)
+series = RunningStats(target=target_humidity, interior=True)  # 墙壁保持初始湿度, 只统计内部格点
+criteria = [FractionReached(target_humidity, 0.9), SteadyState(1e-5)]
+snapshots = run_configured(solver, snapshot_times, series_every=series_every, series=series, series_dir=series_dir,
+                           stop_check_every=stop_check_every, criteria=criteria, checkpoint_dir=checkpoint_dir,
+                           checkpoint_every=checkpoint_every, resume=resume, cache_dir=cache_dir,
+                           fields_path=fields_path, arrays={"influence": influence})
+for t, reached, mean in zip(series.times, series.reached, series.mean):  # 只有流式输出时才有逐帧统计
+    print(f"t = {t}s, 达到目标湿度的内部格点占比 {reached:.2%}, 平均湿度 {mean:.3f}")
 
-# 模拟结束后评估达到目标湿度的散点占比
-reached_target = (humidity >= target_humidity).sum()
-total_points = nx * ny * nz
-proportion_reached_target = reached_target / total_points
+for t, humidity in snapshots:
+    if len(snapshots) > 1:
+        print(f"t = {t}s:")
+    # 评估达到目标湿度的散点占比
+    reached_target = (humidity >= target_humidity).sum()
+    total_points = nx * ny * nz
+    proportion_reached_target = reached_target / total_points
 
-print(f"达到目标湿度的散点占比为: {proportion_reached_target:.2%}")
-# 模拟结束后计算平均湿度值
-average_humidity = np.mean(humidity)
+    print(f"达到目标湿度的散点占比为: {proportion_reached_target:.2%}")
+    # 计算平均湿度值
+    average_humidity = np.mean(humidity)
 
-print(f"模拟结束后房间内的平均湿度值为: {average_humidity:.2f}")
+    print(f"模拟结束后房间内的平均湿度值为: {average_humidity:.2f}")
 
 # # 可视化
 # # fig = plt.figure(figsize=(16, 8))
@@ -85,11 +98,11 @@ print(f"模拟结束后房间内的平均湿度值为: {average_humidity:.2f}")
 # fig2 = plt.figure()
 # ax2 = fig2.add_subplot(projection='3d')
 # # 计算湿度影响
-# humidifier_influence_plot = humidifier_influence(X, Y, Z, humidifier_position, humidifier_radius)
+# humidifier_influence_plot = influence_field(x, y, z, humidifier_position, humidifier_radius)
 # # 将湿度影响作为颜色映射
 # humidity_values = np.clip(humidity, initial_humidity, target_humidity)
 # # 绘制3D散点图，湿度值决定点的颜色
-# sc = ax2.scatter(X.ravel(), Y.ravel(), Z.ravel(), c=humidity_values.ravel(), cmap='Blues', alpha=0.2, s=1.5)
+# sc = ax2.scatter(*(axis.ravel() for axis in np.broadcast_arrays(X, Y, Z)), c=humidity_values.ravel(), cmap='Blues', alpha=0.2, s=1.5)
 # # 设置标题和坐标轴标签
 # ax2.set_title('Humidity Distribution and Humidifier Influence')
 # ax2.set_xlabel('Width/m')
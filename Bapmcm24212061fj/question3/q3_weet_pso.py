@@ -5,21 +5,36 @@
 位置：(3.10, 3.45, 2.16)
 增湿率：4.48
 """
+import os
+import sys
+import multiprocessing
 import numpy as np
 from pyswarm import pso
 import matplotlib.pyplot as plt
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # 引入公共模块 apmcm
+from apmcm import profiling
+from apmcm.cache import ResultCache, code_version, cached
+
 # 房间的宽、长、高
 r_w, r_l, r_h = 5, 8, 3
 max_volume = 0.1  # 最大增湿器体积
 target_humidity_diff = 0.5  # 湿度差(0.4-0.6)
 air_velocity = 8.0  # 空气流速
-# 存储优化过程的可视化数据
-iteration_data = []
 
-# PSO的目标函数
-def humidifier_objective(x):
-    global iteration_data  # 用于存储进度
+# 并行执行后端: "serial" 串行 / "process" 由 pyswarm 的进程池 (processes 参数) 评估整个粒子群
+# workers 为进程数 (None 取 CPU 核数); seed 设为整数时结果可复现 (pyswarm 的随机数都来自 np.random, 只在主进程中使用)
+backend = "serial"
+workers = None
+seed = None
+if seed is not None:
+    np.random.seed(seed)
+processes = (workers or os.cpu_count() or 1) if backend == "process" else 1
+# 结果缓存目录, 例如 "../cache": 设置了 seed 且参数和代码都没变时直接读取上次的最优解和迭代数据 (seed 为 None 时不缓存)
+cache_dir = None
+
+# PSO的目标函数; records 存储优化过程的可视化数据 (由 optimize 通过 pso 的 kwargs 传入)
+def humidifier_objective(x, records):
     r, h, x_pos, y_pos, z_pos = x
 
     # 体积限制
@@ -32,7 +47,7 @@ def humidifier_objective(x):
     humidity_effect = -surface_area * air_velocity * target_humidity_diff  # 需要最大化（负值）
 
     # 追加可视化数据
-    iteration_data.append((r, h, x_pos, y_pos, z_pos, -humidity_effect))
+    records.append((r, h, x_pos, y_pos, z_pos, -humidity_effect))
 
     return humidity_effect
 
@@ -46,8 +61,31 @@ bounds = [
 ]
 
 # 运行PSO
-best_position, best_value = pso(humidifier_objective, lb=[b[0] for b in bounds], ub=[b[1] for b in bounds],
-                                 swarmsize=50, maxiter=50)
+swarmsize, maxiter = 50, 50  # 粒子数, 最大迭代次数
+pso_options = {"processes": processes} if processes > 1 else {}
+
+# 进程池时目标函数在子进程中运行, 只在这次优化期间创建 Manager 共享列表收集可视化数据, 结束后关闭
+# (命中结果缓存时不会启动 Manager 进程)
+def optimize():
+    objective = profiling.instrument(humidifier_objective, "pso;objective", "evaluations")  # --profile 时按调用计时
+    manager = multiprocessing.Manager() if processes > 1 else None
+    try:
+        records = [] if manager is None else manager.list()
+        best_position, best_value = pso(objective, lb=[b[0] for b in bounds], ub=[b[1] for b in bounds],
+                                         kwargs={"records": records}, swarmsize=swarmsize, maxiter=maxiter,
+                                         **pso_options)
+        return best_position, best_value, list(records)
+    finally:
+        if manager is not None:
+            manager.shutdown()
+
+cache_params = {"room": (r_w, r_l, r_h), "max_volume": max_volume, "target_humidity_diff": target_humidity_diff,
+                "air_velocity": air_velocity, "bounds": bounds, "swarmsize": swarmsize, "maxiter": maxiter,
+                "seed": seed}
+result_cache = None
+if cache_dir and seed is not None:
+    result_cache = ResultCache(cache_dir, version=code_version(humidifier_objective))
+best_position, best_value, iteration_data = cached(result_cache, cache_params, optimize)
 
 # 提取迭代和性能数据
 iterations = range(1, len(iteration_data) + 1)
@@ -6,11 +6,20 @@
 设备总高度：0.4807 m
 总容积：0.0944 m³（限制：0.1000 m³）
 """
+import os
+import sys
+from functools import partial
 import numpy as np
 import matplotlib.pyplot as plt
-from deap import base, creator, tools, algorithms
+from deap import base, creator, tools
 import random
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # 引入公共模块 apmcm
+from apmcm.designs import height_deviation_batch
+from apmcm.evolution import GARunner, EarlyStopping, create_type
+from apmcm.parallel import Executor
+from apmcm.cache import ResultCache, code_version, cached
+
 # 参数设置
 V_total_limit = 0.1  # 总容积限制，单位：立方米
 D_Device = 0.5  # 设备直径（固定值），单位：米
@@ -37,36 +46,52 @@ def evaluate_heights(individual):
 
     return deviation,  # 返回适应度值（越小越好）
 
+# 按种群整体向量化评估 (与 evaluate_heights 逐项对应), False 时逐个体评估
+batch_evaluation = True
+
+# 并行执行后端: "serial" 串行 / "thread" 线程池 / "process" 进程池; workers 为线程或进程数 (None 取 CPU 核数)
+# seed 设为整数时结果可复现, 且与 backend 和 workers 无关
+backend = "serial"
+workers = None
+seed = None
+if seed is not None:
+    random.seed(seed)
+    np.random.seed(seed)
+executor = Executor(backend, workers, seed)
+# 结果缓存目录, 例如 "../cache": 设置了 seed 且参数和代码都没变时直接读取上次的种群和 logbook (seed 为 None 时不缓存)
+cache_dir = None
+
+def evaluate_population_heights(genes):
+    return executor.map_rows(height_deviation_batch, genes, A_cross_section, V_total_limit, target_ratios)
+
 # DEAP设置
-creator.create("FitnessMin", base.Fitness, weights=(-1.0,))
-creator.create("Individual", list, fitness=creator.FitnessMin)
-
-toolbox = base.Toolbox()
-toolbox.register("attr_height", random.uniform, 0.2 * max_heights, 0.5 * max_heights)  # 初始化随机高度
-toolbox.register("individual", tools.initCycle, creator.Individual,
-                 (toolbox.attr_height, toolbox.attr_height, toolbox.attr_height), n=1)
-toolbox.register("population", tools.initRepeat, list, toolbox.individual)
-
-toolbox.register("mate", tools.cxBlend, alpha=0.5)
-toolbox.register("mutate", tools.mutGaussian, mu=0, sigma=0.05, indpb=0.2)
-toolbox.register("select", tools.selTournament, tournsize=3)
-toolbox.register("evaluate", evaluate_heights)
-
-# 初始化种群
-population = toolbox.population(n=100)
-# 添加统计跟踪
-stats = tools.Statistics(lambda ind: ind.fitness.values)
-stats.register("avg", np.mean)
-stats.register("std", np.std)
-stats.register("min", np.min)
-stats.register("max", np.max)
+create_type("FitnessMin", base.Fitness, weights=(-1.0,))
+create_type("Individual", list, fitness=creator.FitnessMin)
+
+attr_height = partial(random.uniform, 0.2 * max_heights, 0.5 * max_heights)  # 初始化随机高度
+
+# 提前停止: 最优值和平均值连续 10 代没有改进即结束, ngen 只作为上限; stopping=None 时跑满 ngen 代
+runner = GARunner(creator.Individual, (attr_height, attr_height, attr_height),
+                  evaluate=evaluate_heights,
+                  batch_evaluate=evaluate_population_heights if batch_evaluation else None,
+                  pop_size=100, cxpb=0.7, mutpb=0.2,
+                  ngen=50,  # 迭代次数上限
+                  map_function=executor.map,
+                  stopping=EarlyStopping(stall=10))
+
 # 遗传算法运行
-population, logbook = algorithms.eaSimple(population, toolbox,
-                                           cxpb=0.7, mutpb=0.2,
-                                           ngen=50,  # 迭代次数
-                                           stats=stats,
-                                           halloffame=tools.HallOfFame(1),
-                                           verbose=True)
+def optimize():
+    population, logbook = runner.run(verbose=True)
+    return population, logbook, runner.report()
+
+cache_params = {"V_total_limit": V_total_limit, "D_Device": D_Device, "target_ratios": target_ratios,
+                "batch_evaluation": batch_evaluation, "seed": seed, "ga": runner.settings()}
+result_cache = None
+if cache_dir and seed is not None:
+    result_cache = ResultCache(cache_dir, version=code_version(evaluate_heights))
+population, logbook, report = cached(result_cache, cache_params, optimize)
+executor.close()
+print(report)
 
 # 提取最佳个体
 best_individual = tools.selBest(population, 1)[0]
@@ -0,0 +1,100 @@
+"""
+此段代码用于第四问三合一设备的耦合模拟:
+温度、PM2.5 浓度和湿度在同一个网格上一次推进, 湿度扩散系数随温度场逐点变化
+设备放在房间中央地面上, 自下而上依次为净化器、空调、加湿器 (高度取 q4_design.py 的最优结果)
+"""
+import os
+import sys
+import numpy as np
+import matplotlib.pyplot as plt
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # 引入公共模块 apmcm
+from apmcm.solver import Grid, RelaxationSource, DecaySink, ConstantSource
+from apmcm.coupled import Species, CoupledSolver, humidity_diffusivity_from_temperature
+from apmcm.cache import ResultCache, cached
+
+# 房间尺寸
+r_w, r_l, r_h = 5, 8, 3  # 房间的宽、长、高 (米)
+season = "winter"
+# 温度参数
+if season == "summer":
+    T_outdoor = 35   # 室外初始温度（摄氏度）
+    T_ac_out = 24    # 空调出风口温度（摄氏度）
+if season == "winter":
+    T_outdoor = 5   # 室外初始温度（摄氏度）
+    T_ac_out = 24    # 空调出风口温度（摄氏度）
+thermal_diffusivity = 0.0000213  # 空气热扩散系数（平方米/秒）
+
+# PM2.5 参数
+D_DIFF = 5e-4  # 扩散系数（平方米/秒）
+PM_INIT = 100  # 初始污染物浓度（微克/立方米）
+K_FILTER = 0.8  # 过滤器效率常数
+
+# 湿度参数
+initial_humidity = 0.2  # 初始房间湿度
+target_humidity = 0.6  # 目标湿度
+humidifier_strength = 0.05  # 加湿器的单位湿度增量
+
+# 三合一设备 (q4_design.py 的最优设计)
+D_Device = 0.5  # 设备直径（米）
+ac_h, purifier_h, humidifier_h = 0.2884, 0.0961, 0.0961  # 各部分高度（米）
+device_xy = (r_w / 2, r_l / 2)  # 设备放在房间中央
+purifier_position = (*device_xy, purifier_h / 2)
+ac_position = (*device_xy, purifier_h + ac_h / 2)
+humidifier_position = (*device_xy, purifier_h + ac_h + humidifier_h / 2)
+radius = 1  # 作用半径
+
+# 网格划分
+nx, ny, nz = 40, 40, 20
+dtype = np.float64  # 场的浮点类型: np.float64 双精度 / np.float32 单精度
+grid = Grid((r_w, r_l, r_h), (nx, ny, nz), dtype=dtype)
+x, y, z = grid.x, grid.y, grid.z
+
+# 设置模拟参数
+timesteps, dt = 6000, 0.1  # 时间步数, 时间步长
+times = timesteps * dt
+cache_dir = None  # 结果缓存目录, 例如 "../cache"; 参数和代码都没变时直接读取上次的三个场, 不再重新模拟
+print(f"当前运行时间是{times}s")
+
+species = [
+    Species("temperature", thermal_diffusivity, T_outdoor, boundary=T_outdoor,
+            sources=[RelaxationSource(grid.influence(ac_position, radius), T_ac_out)]),
+    Species("pm25", D_DIFF, PM_INIT, boundary=PM_INIT,
+            sources=[DecaySink(grid.influence(purifier_position, radius), K_FILTER)], clamp=(0, PM_INIT)),
+    Species("humidity", humidity_diffusivity_from_temperature, initial_humidity, boundary=initial_humidity,
+            sources=[ConstantSource(grid.influence(humidifier_position, D_Device / 2 + radius), humidifier_strength)],
+            clamp=(initial_humidity, target_humidity)),
+]
+solver = CoupledSolver(grid, species, dt=dt)
+
+def simulate():
+    solver.run(timesteps)
+    return solver["temperature"], solver["pm25"], solver["humidity"]
+
+# 决定模拟结果的全部参数
+cache_params = {
+    "room": (r_w, r_l, r_h), "grid": (nx, ny, nz), "dtype": np.dtype(dtype).str, "timesteps": timesteps, "dt": dt,
+    "T_outdoor": T_outdoor, "T_ac_out": T_ac_out, "thermal_diffusivity": thermal_diffusivity,
+    "D_DIFF": D_DIFF, "PM_INIT": PM_INIT, "K_FILTER": K_FILTER, "initial_humidity": initial_humidity,
+    "target_humidity": target_humidity, "humidifier_strength": humidifier_strength, "D_Device": D_Device,
+    "positions": (ac_position, purifier_position, humidifier_position), "radius": radius,
+}
+result_cache = ResultCache(cache_dir) if cache_dir else None
+T, C, humidity = cached(result_cache, cache_params, simulate)
+
+print(f"平均温度: {np.mean(T):.2f}°C")
+print(f"平均 PM2.5 浓度: {np.mean(C):.2f} µg/m³")
+print(f"达到目标湿度的散点占比为: {(humidity >= target_humidity).mean():.2%}")
+
+# 中间高度的三个物理量横截面
+fig, axes = plt.subplots(1, 3, figsize=(15, 5))
+for ax, field, cmap, title in zip(axes, (T, C, humidity), ('coolwarm', 'BuGn_r', 'Blues'),
+                                  ('Temperature/°C', 'PM2.5 Concentration (µg/m³)', 'Humidity')):
+    im = ax.contourf(x, y, field[:, :, nz // 2].T, levels=20, cmap=cmap)
+    fig.colorbar(im, ax=ax)
+    ax.set_title(f'{title} (t={times}s)')
+    ax.set_xlabel('Width/m')
+    ax.set_ylabel('Length/m')
+plt.tight_layout()
+# plt.savefig(f'../figures/q4_coupled_{times}s_{season}.png')
+plt.show()
@@ -0,0 +1,50 @@
+"""
+此段代码用于批量比较不同季节、空调位置、净化器位置和加湿器强度下的室内环境:
+所有场景作为批量维度一次推进 (超过内存上限时自动分块), 不必逐个修改脚本开关重新运行,
+最后输出每个场景的平均温度 / PM2.5 浓度 / 湿度、达标格点占比和达标时间
+"""
+import os
+import sys
+from itertools import product
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # 引入公共模块 apmcm
+from apmcm.solver import Grid
+from apmcm.sweep import run_sweep, format_table, write_csv
+from apmcm.cache import ResultCache, cached
+
+# 房间尺寸和网格
+r_w, r_l, r_h = 5, 8, 3  # 房间的宽、长、高 (米)
+nx, ny, nz = 40, 40, 20
+dtype = np.float64  # 场的浮点类型; np.float32 时内存减半, 每块可容纳的场景数翻倍
+grid = Grid((r_w, r_l, r_h), (nx, ny, nz), dtype=dtype)
+
+# 场景表: 各参数取值的全部组合, 未列出的参数取 apmcm.sweep.DEFAULTS (与各问脚本一致)
+seasons = ["summer", "winter"]
+ac_positions = [(2.5, 4, 1.5), (2.28, 4.00, 1.49), (1.0, 1.0, 2.5)]  # 房间中央 / q1_position_ga.py 最优位置 / 墙角
+purifier_positions = [(2.5, 4, 0.8), (1.0, 7.0, 0.8)]
+humidifier_strengths = [0.05, 0.1]
+scenarios = [
+    {"season": season, "ac_position": ac, "purifier_position": purifier, "humidifier_strength": strength}
+    for season, ac, purifier, strength in product(seasons, ac_positions, purifier_positions, humidifier_strengths)
+]
+
+seconds, dt = 600, 0.1  # 模拟时长 (秒), 时间步长
+check_every = 100  # 每隔多少步统计一次达标占比
+goal = 0.9  # 达标的内部格点占比不低于 goal 的第一个时刻记为达标时间 (与第一、三问相同)
+memory_limit = 512 * 2 ** 20  # 一次推进的场景所占内存上限 (字节)
+csv_path = None  # 结果表另存为 CSV, 例如 "../figures/q4_sweep.csv"
+cache_dir = None  # 结果缓存目录, 例如 "../cache"; 场景表和参数都没变时直接读取上次的结果表
+
+print(f"共 {len(scenarios)} 个场景, 模拟 {seconds} 秒")
+# memory_limit 只影响分块方式, 不影响结果, 不参与缓存键
+cache_params = {"scenarios": scenarios, "room": grid.size, "grid": grid.shape, "dtype": np.dtype(dtype).str,
+                "seconds": seconds, "dt": dt, "check_every": check_every, "goal": goal}
+result_cache = ResultCache(cache_dir) if cache_dir else None
+rows = cached(result_cache, cache_params,
+              lambda: run_sweep(scenarios, grid, seconds, dt=dt, check_every=check_every, goal=goal,
+                                memory_limit=memory_limit))
+print(format_table(rows))
+if csv_path is not None:
+    write_csv(rows, csv_path)
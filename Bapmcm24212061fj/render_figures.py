@@ -0,0 +1,48 @@
+"""
+此段代码用于根据各问脚本保存的场批量生成论文插图, 输出到 APMCM LaTeX 模板/figures:
+使用 Agg 后端 (不弹出窗口、不阻塞), 三维散点图按点数上限自动抽稀, 同一组图的各时刻复用 figure 和 colorbar,
+各组图在多个进程中并行渲染
+先在 q1_diffusion_times.py (summer / winter)、q2_situation.py、q3_hum_situation.py 中设置 fields_path (FIELDS_PATH)
+和输出时刻 (如 [30, 300, 600]) 各运行一次, 再运行本脚本; 没有保存的场对应的图会跳过
+运行方式(在 Bapmcm24212061fj 目录下): python render_figures.py
+"""
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))  # 引入公共模块 apmcm
+from apmcm.render import render
+
+fields_dir = "fields"  # 各问脚本保存场的目录 (相对 Bapmcm24212061fj)
+output_dir = os.path.join("..", "APMCM LaTeX 模板", "figures")
+workers = None  # 渲染进程数, None 取 CPU 核数, 1 时串行
+max_points = 8000  # 每张三维散点图最多画的格点数
+dpi = None  # 图片分辨率, None 时使用 matplotlib 默认值
+
+# 各组图: 文件名和标题中的 {t} 为输出时刻 (秒), 样式与各问脚本中的出图代码一致
+jobs = []
+for season in ("summer", "winter"):
+    jobs += [
+        {"fields": f"{fields_dir}/q1_{season}.npz", "kind": "slice", "name": f"q1_{{t}}s_diff_{season}.png",
+         "title": "Temperature distribution (middle cross-section, t={t}s)", "levels": 50, "cmap": "coolwarm"},
+        {"fields": f"{fields_dir}/q1_{season}.npz", "kind": "scatter", "name": f"q1_{{t}}s_scatter_{season}.png",
+         "array": "influence", "title": "Air conditioning affects the weight distribution", "cmap": "coolwarm_r",
+         "alpha": 0.5, "s": 1, "max_points": max_points},
+    ]
+jobs += [
+    {"fields": f"{fields_dir}/q2.npz", "kind": "slice", "name": "q2_PM2.5_diff_{t}s.png",
+     "title": "PM2.5 Concentration (Mid Height)", "levels": 20, "cmap": "BuGn_r", "vmin": 0, "vmax": 100,
+     "label": "Concentration (µg/m³)"},
+    {"fields": f"{fields_dir}/q2.npz", "kind": "scatter", "name": "q2_PM2.5_3-scatter_{t}s.png",
+     "array": "influence", "title": "Purifier Influence Distribution", "cmap": "BuGn", "alpha": 0.8, "s": 1.5,
+     "max_points": max_points},
+    {"fields": f"{fields_dir}/q3.npz", "kind": "slice", "name": "q3_humidity_diff_{t}s.png",
+     "title": "Humidity Distribution (Middle Cross-section)", "levels": 20, "cmap": "Blues"},
+    {"fields": f"{fields_dir}/q3.npz", "kind": "scatter", "name": "q3_humidity_scatter_{t}s.png",
+     "title": "Humidity Distribution and Humidifier Influence", "clip": (0.2, 0.6), "cmap": "Blues",
+     "alpha": 0.2, "s": 1.5, "max_points": max_points},
+]
+
+start = time.perf_counter()
+written = render(jobs, output_dir, workers=workers, dpi=dpi)
+print(f"共生成 {len(written)} 张图, 耗时 {time.perf_counter() - start:.2f} 秒, 输出目录: {output_dir}")
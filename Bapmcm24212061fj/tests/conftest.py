@@ -0,0 +1,8 @@
+"""
+apmcm 公共模块的测试: 各加速实现与原脚本写法的结果对照
+运行方式(在 Bapmcm24212061fj 目录下): python -m pytest tests
+"""
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # 引入公共模块 apmcm
@@ -0,0 +1,30 @@
+"""pareto_mask 与逐对比较的暴力解法的对照"""
+import numpy as np
+import pytest
+
+from apmcm.design_space import pareto_mask
+
+
+# CADR 越大越好, 功耗和体积越小越好; 返回非支配点的集合 (完全相同的点算一个)
+def brute_force_front(cadr, power, volume):
+    points = set(zip(cadr.tolist(), power.tolist(), volume.tolist()))
+    front = set()
+    for c, p, v in points:
+        dominated = any(c2 >= c and p2 <= p and v2 <= v and (c2, p2, v2) != (c, p, v) for c2, p2, v2 in points)
+        if not dominated:
+            front.add((c, p, v))
+    return front
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_matches_brute_force(seed):
+    rng = np.random.default_rng(seed)
+    n = 400
+    # 功耗只取少数几个离散值 (与第二问相同), CADR 和体积取整制造大量并列和重复的点
+    power = rng.choice([450.0, 550.0, 650.0, 750.0], n)
+    cadr = np.round(rng.uniform(0, 600, n), -1)
+    volume = np.round(rng.uniform(0, 0.1, n), 2)
+    mask = pareto_mask(cadr, power, volume)
+    front = set(zip(cadr[mask].tolist(), power[mask].tolist(), volume[mask].tolist()))
+    assert front == brute_force_front(cadr, power, volume)
+    assert mask.sum() == len(front)  # 完全相同的点只保留一个
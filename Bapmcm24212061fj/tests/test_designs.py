@@ -0,0 +1,93 @@
+"""按种群向量化的适应度函数与各脚本逐个体适应度函数的对照"""
+from functools import partial
+
+import numpy as np
+
+from apmcm.designs import repair_ac_genes, ac_design_batch, purifier_cadr_batch, height_deviation_batch
+from apmcm.surrogate import ScreenedEvaluation
+
+room = (5, 8, 3)
+rng = np.random.default_rng(0)
+
+
+# 第一问 q1_position_ga.py 的 ac_design_evaluation (np.meshgrid 默认的 "xy" 网格, 基因已修复)
+def ac_design_evaluation(individual, X, Y, Z, T, t_ac_out=24, t_target=24, max_volume=0.1, max_power=1800):
+    r, h, n_in, n_out, x, y, z = individual
+    if np.pi * r ** 2 * h > max_volume:
+        return 1e6,
+    if 50 * h + 30 * r + 10 * n_in + 10 * n_out > max_power:
+        return 1e6,
+    influence = np.exp(-((X - x) ** 2 + (Y - y) ** 2 + (Z - z) ** 2) / (2 * r ** 2))
+    return np.sum(np.abs(T + influence * (t_ac_out - T) - t_target)),
+
+
+def ac_genes(n):
+    genes = np.column_stack([rng.uniform(0.05, 0.6, n), rng.uniform(0.1, 2, n), rng.integers(0, 7, n),
+                             rng.integers(0, 7, n), rng.uniform(-1, 6, n), rng.uniform(-1, 9, n),
+                             rng.uniform(-1, 4, n)]).astype(float)
+    return repair_ac_genes(genes, room)
+
+
+def test_ac_design_batch():
+    x, y, z = (np.linspace(0, size, n) for size, n in zip(room, (20, 20, 10)))
+    X, Y, Z = np.meshgrid(x, y, z)
+    T = np.full((20, 20, 10), 5.0)
+    genes = ac_genes(60)
+    expected = [ac_design_evaluation(row, X, Y, Z, T)[0] for row in genes]
+    # chunk_bytes 很小时逐个体分块, 结果应与一次计算整个种群相同
+    for chunk_bytes in (16 * 2 ** 20, 1):
+        batch = ac_design_batch(genes, x, y, z, T, 24, 24, 0.1, 1800, indexing="xy", chunk_bytes=chunk_bytes)
+        np.testing.assert_allclose(batch, expected, rtol=1e-12)
+    assert (batch == 1e6).any() and (batch < 1e6).any()  # 可行和不可行的设计都覆盖到
+
+
+# 第二问 q2_cadr_design.py 的 air_purifier_design
+def air_purifier_design(individual, room_volume=120, device_volume=0.1, max_flow=600, max_power=1800, k_filter=0.8):
+    D, H = individual[0], individual[1]
+    N_filter, N_in, N_out = int(individual[2]), int(individual[3]), int(individual[4])
+    if np.pi * (D / 2) ** 2 * H > device_volume:
+        return (0,)
+    filter_area = np.pi * D * H * N_filter
+    Q_in = min(N_in * (max_flow / 2), max_flow)
+    Q_out = min(N_out * (max_flow / 2), max_flow)
+    eta = 1 - np.exp(-k_filter * filter_area * Q_in / room_volume)
+    if 50 + 100 * N_filter + 100 * N_in + 100 * N_out > max_power:
+        return (0,)
+    return (Q_out * eta,)
+
+
+def test_purifier_cadr_batch():
+    genes = np.column_stack([rng.uniform(0.1, 0.5, 200), rng.uniform(0.5, 1.5, 200), rng.integers(1, 15, 200),
+                             rng.integers(1, 4, 200), rng.integers(1, 4, 200)]).astype(float)
+    expected = [air_purifier_design(row)[0] for row in genes]
+    np.testing.assert_allclose(purifier_cadr_batch(genes, 120, 0.1, 600, 1800, 0.8), expected, rtol=1e-12)
+
+
+# 第四问 q4_design.py 的 evaluate_heights
+def evaluate_heights(individual, cross_section, volume_limit=0.1, target_ratios=(0.6, 0.2, 0.2)):
+    total_height = sum(individual)
+    if cross_section * total_height > volume_limit:
+        return 1e6,
+    ratios = np.array(individual) / total_height
+    return np.sum((ratios - np.array(target_ratios)) ** 2),
+
+
+def test_height_deviation_batch():
+    area = np.pi * 0.25 ** 2
+    genes = rng.uniform(0.05, 0.4, (200, 3))
+    expected = [evaluate_heights(row, area)[0] for row in genes]
+    np.testing.assert_allclose(height_deviation_batch(genes, area, 0.1, [0.6, 0.2, 0.2]), expected, rtol=1e-12)
+
+
+# 同一组个体经 ScreenedEvaluation 逐个评估和按种群评估, 适应度、真实评估次数和缓存命中次数都相同
+def test_screened_batch_matches_scalar():
+    cross_section = np.pi * 0.25 ** 2
+    genes = rng.uniform(0.05, 0.4, (100, 3))
+    genes[50:] = genes[:50]  # 后一半与前一半重复
+    scalar = ScreenedEvaluation(partial(evaluate_heights, cross_section=cross_section), 1e-6)
+    batch = ScreenedEvaluation(None, 1e-6)
+    expected = [scalar(list(row))[0] for row in genes]
+    population = partial(height_deviation_batch, cross_section=cross_section, volume_limit=0.1,
+                         target_ratios=[0.6, 0.2, 0.2])
+    np.testing.assert_allclose(batch.batch(population, genes)[:, 0], expected, rtol=1e-12)
+    assert (batch.evaluations, batch.cache.hits) == (scalar.evaluations, scalar.cache.hits) == (50, 50)
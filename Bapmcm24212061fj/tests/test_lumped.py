@@ -0,0 +1,40 @@
+"""第一问集总模型: 解析解与原脚本逐秒迭代的达标时间 (夏季 938 s, 冬季 1245 s)"""
+import numpy as np
+import pytest
+
+from apmcm.lumped import coefficients, temperature, time_to_target
+
+alpha, beta = coefficients(0.03 * 3.0, 0.05 * 5.0, 5 * 8 * 3)
+
+
+# q1_lines.py 原来的逐秒迭代: 返回第一次越过目标温度的时刻
+def iterate(T_target, T_outdoor, T_ac_out, t_total=3600, dt=1):
+    T = T_outdoor
+    for t in np.arange(dt, t_total + dt, dt):
+        T += (-alpha * (T - T_ac_out) - beta * (T - T_outdoor)) * dt
+        if (T_outdoor < T_target) == (T >= T_target):
+            return t
+    return np.inf
+
+
+# (目标温度, 室外温度, 出风口温度, 达标时间)
+@pytest.mark.parametrize("T_target, T_outdoor, T_ac_out, expected", [(24, 35, 20, 938), (24, 5, 28, 1245)])
+def test_time_to_target(T_target, T_outdoor, T_ac_out, expected):
+    t = time_to_target(T_target, T_outdoor, T_ac_out, T_outdoor, alpha, beta, dt=1)
+    assert t == expected == iterate(T_target, T_outdoor, T_ac_out)
+    # 连续时间的解析解与显式欧拉相差不到一步
+    assert abs(time_to_target(T_target, T_outdoor, T_ac_out, T_outdoor, alpha, beta) - expected) < 1
+
+
+def test_unreachable():
+    # 出风口温度不足以把室温降到目标值以下时永远达不到
+    assert time_to_target(24, 35, 30, 35, alpha, beta, dt=1) == np.inf
+
+
+def test_temperature_matches_recursion():
+    T_room = temperature(np.arange(0, 101), 5, 28, 5, alpha, beta, dt=1)
+    T, expected = 5.0, [5.0]
+    for _ in range(100):
+        T += -alpha * (T - 28) - beta * (T - 5)
+        expected.append(T)
+    np.testing.assert_allclose(T_room, expected, rtol=1e-12)
@@ -0,0 +1,54 @@
+"""run_configured 的运行方式分派与冲突检查"""
+import numpy as np
+import pytest
+
+from apmcm.modes import run_configured
+from apmcm.solver import Grid, FieldSolver, DecaySink
+from apmcm.stream import RunningStats, SnapshotStore
+
+
+def make_solver():
+    grid = Grid((5, 8, 3), (12, 12, 8))
+    return FieldSolver(grid, 5e-4, 100, boundary=100, sources=[DecaySink(grid.influence((2.5, 4, 0.8), 1), 0.8)],
+                       clamp=(0, 100), dt=0.1)
+
+
+@pytest.mark.parametrize("flags", [dict(series_every=1, stop_check_every=10), dict(spectral=True, series_every=1),
+                                   dict(spectral=True, stop_check_every=10)])
+def test_conflicting_modes(flags):
+    with pytest.raises(ValueError, match="不能同时设置"):
+        run_configured(make_solver(), [2.0], **flags)
+
+
+@pytest.mark.parametrize("flags", [dict(spectral=True, checkpoint_dir="checkpoints"),
+                                   dict(stop_check_every=10, cache_dir="cache"), dict(series_dir="series")])
+def test_unused_options(flags):
+    with pytest.raises(ValueError, match="不起作用"):
+        run_configured(make_solver(), [2.0], **flags)
+
+
+# 逐步推进和流式输出得到相同的场, 流式输出同时更新统计量
+def test_series_matches_steps():
+    (t, steps), = run_configured(make_solver(), [2.0])
+    series = RunningStats()
+    (t_series, streamed), = run_configured(make_solver(), [2.0], series_every=0.5, series=series)
+    assert t == t_series == 2.0
+    np.testing.assert_array_equal(streamed, steps)
+    assert series.times == [0.5, 1.0, 1.5, 2.0]
+
+
+# 0.7 的整数倍不能精确表示 (0.7 * 3 = 2.0999999999999996), 与请求的 2.1 s 落在同一步时只输出一帧
+def test_series_inexact_interval(tmp_path):
+    series = RunningStats()
+    snapshots = run_configured(make_solver(), [2.1], series_every=0.7, series=series, series_dir=str(tmp_path))
+    assert series.times == [0.7, 1.4, 2.1]
+    assert [t for t, _ in snapshots] == [2.1]
+    store = SnapshotStore.open(str(tmp_path))
+    assert store.times == [0.7, 1.4, 2.1]
+
+
+def test_series_store_dtype(tmp_path):
+    grid = Grid((5, 8, 3), (12, 12, 8), dtype=np.float32)
+    solver = FieldSolver(grid, 5e-4, 100, boundary=100, dt=0.1)
+    run_configured(solver, [1.0], series_every=0.5, series_dir=str(tmp_path))
+    assert SnapshotStore.open(str(tmp_path))[0].dtype == np.float32
@@ -0,0 +1,53 @@
+"""FieldSolver 与第二问原脚本 (np.roll 逐步迭代) 的对照"""
+import numpy as np
+import pytest
+
+from apmcm.solver import Grid, FieldSolver, DecaySink
+
+room = (5, 8, 3)
+shape = (40, 40, 20)
+D_DIFF, PM_INIT, K_FILTER, DT = 5e-4, 100, 0.8, 0.1
+position = (room[0] / 2, room[1] / 2, 1.60 / 2)
+
+
+# 第二问原脚本的模拟循环
+def baseline_q2(steps):
+    nx, ny, nz = shape
+    dx, dy, dz = room[0] / (nx - 1), room[1] / (ny - 1), room[2] / (nz - 1)
+    x, y, z = (np.linspace(0, size, n) for size, n in zip(room, shape))
+    X, Y, Z = np.meshgrid(x, y, z, indexing="ij")
+    I = np.exp(-((X - position[0]) ** 2 + (Y - position[1]) ** 2 + (Z - position[2]) ** 2) / 2)
+    C = np.ones(shape) * PM_INIT
+    for _ in range(steps):
+        laplacian = (
+            (np.roll(C, 1, axis=0) - 2 * C + np.roll(C, -1, axis=0)) / dx ** 2 +
+            (np.roll(C, 1, axis=1) - 2 * C + np.roll(C, -1, axis=1)) / dy ** 2 +
+            (np.roll(C, 1, axis=2) - 2 * C + np.roll(C, -1, axis=2)) / dz ** 2
+        )
+        C_new = C + D_DIFF * laplacian * DT
+        C_new *= (1 - K_FILTER * I * DT)
+        C_new = np.clip(C_new, 0, PM_INIT)
+        C_new[0, :, :] = C_new[-1, :, :] = C_new[:, 0, :] = C_new[:, -1, :] = C_new[:, :, 0] = C_new[:, :, -1] = PM_INIT
+        C = C_new
+    return C
+
+
+def q2_solver(dtype=float):
+    grid = Grid(room, shape, dtype=dtype)
+    sink = DecaySink(grid.influence(position, 1), K_FILTER)
+    return FieldSolver(grid, D_DIFF, PM_INIT, boundary=PM_INIT, sources=[sink], clamp=(0, PM_INIT), dt=DT)
+
+
+@pytest.fixture(scope="module")
+def baseline():
+    return baseline_q2(300)
+
+
+def test_matches_baseline(baseline):
+    np.testing.assert_allclose(q2_solver().run(300), baseline, rtol=1e-10, atol=1e-10)
+
+
+def test_float32_close_to_baseline(baseline):
+    field = q2_solver(np.float32).run(300)
+    assert field.dtype == np.float32
+    np.testing.assert_allclose(field, baseline, atol=1e-3)
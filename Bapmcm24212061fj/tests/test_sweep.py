@@ -0,0 +1,16 @@
+"""场景扫描的达标占比只统计内部格点"""
+import numpy as np
+
+from apmcm.solver import Grid
+from apmcm.sweep import _Batch, resolve
+
+
+def test_coverage_excludes_walls():
+    grid = Grid((5, 8, 3), (10, 10, 8))
+    batch = _Batch(grid, [resolve({"season": "summer"}), resolve({"season": "winter"})])
+    # 墙面固定为室外温度, 内部格点全部达到目标温度
+    field = batch.value("t_outdoor") * np.ones((2,) + grid.shape)
+    field[..., 1:-1, 1:-1, 1:-1] = 24
+    np.testing.assert_array_equal(batch.coverage("temperature", field), [1.0, 1.0])
+    field[0, 1, 1, 1] = 35  # 夏季场景中一个内部格点未达标
+    assert batch.coverage("temperature", field)[0] == 1 - 1 / (8 * 8 * 6)